@@ -1,17 +1,22 @@
-from decimal import Decimal, ROUND_CEILING
+from source.SimulationConfig import SimulationConfig
 
-from source.utils.Rounding import round_btc
+# Default simulation config, its values are also exposed as module constants
+# for code that runs with the defaults. Pass a SimulationConfig to run with other values.
+DEFAULT_CONFIG = SimulationConfig()
 
-BTC_PRICE = Decimal("91000")
+# numeric backend for BTC amounts
+NUMERIC = DEFAULT_CONFIG.numeric
+
+BTC_PRICE = DEFAULT_CONFIG.btc_price
 
 # licence
-PRIME_LICENCE_COST = round_btc(Decimal("1200") / BTC_PRICE)
-PLATINUM_LICENCE_COST = round_btc(Decimal("1000") / BTC_PRICE)
-PRIME_MAX_NUM_CARDS = 50
-PLATINUM_MAX_NUM_CARDS = 30
+PRIME_LICENCE_COST = DEFAULT_CONFIG.prime_licence_cost
+PLATINUM_LICENCE_COST = DEFAULT_CONFIG.platinum_licence_cost
+PRIME_MAX_NUM_CARDS = DEFAULT_CONFIG.prime_max_num_cards
+PLATINUM_MAX_NUM_CARDS = DEFAULT_CONFIG.platinum_max_num_cards
 
 # card
-CARD_COST: Decimal = round_btc(Decimal("378") / BTC_PRICE)
-CARD_MINES_BTC_PER_DAY = Decimal("0.0000245")
-CARD_PROFIT_THRESHOLD = Decimal("14")
-CARD_NUM_MINING_DAYS = (CARD_COST / CARD_MINES_BTC_PER_DAY).to_integral_value(rounding=ROUND_CEILING)
\ No newline at end of file
+CARD_COST = DEFAULT_CONFIG.card_cost
+CARD_MINES_BTC_PER_DAY = DEFAULT_CONFIG.card_mines_btc_per_day
+CARD_PROFIT_THRESHOLD = DEFAULT_CONFIG.card_profit_threshold
+CARD_NUM_MINING_DAYS = DEFAULT_CONFIG.card_num_mining_days
@@ -0,0 +1,64 @@
+from dataclasses import dataclass, field, fields
+from decimal import Decimal, ROUND_CEILING
+
+from source.mining_unit.YieldSchedule import YieldSchedule, YieldTable, yield_table
+from source.utils.NumericBackend import NumericBackend, DecimalBackend, BtcAmount, BTC_QUANTUM_PLACES
+from source.utils.Rounding import round_btc
+
+
+# Market and product parameters of a simulation.
+# BTC amounts derived from them are computed once when the config is created,
+# so a process can run several configs side by side.
+@dataclass(frozen=True)
+class SimulationConfig:
+    btc_price: Decimal = Decimal("91000")
+    # numeric backend for BTC amounts, use FixedPointBackend() to run on integer units of 1e-10 BTC
+    numeric: NumericBackend = field(default_factory=DecimalBackend)
+    # licence prices in USD
+    prime_licence_price: Decimal = Decimal("1200")
+    platinum_licence_price: Decimal = Decimal("1000")
+    prime_max_num_cards: int = 50
+    platinum_max_num_cards: int = 30
+    # card price in USD and daily yield in BTC
+    card_price: Decimal = Decimal("378")
+    card_daily_yield: Decimal = Decimal("0.0000245")
+    card_profit_threshold: Decimal = Decimal("14")
+    # card yield by simulation day, replaces card_daily_yield in Simulator when set
+    yield_schedule: YieldSchedule | None = None
+    # derived BTC amounts in the numeric backend's representation
+    prime_licence_cost: BtcAmount = field(init=False, repr=False, compare=False)
+    platinum_licence_cost: BtcAmount = field(init=False, repr=False, compare=False)
+    card_cost: BtcAmount = field(init=False, repr=False, compare=False)
+    card_mines_btc_per_day: BtcAmount = field(init=False, repr=False, compare=False)
+    card_num_mining_days: int = field(init=False, repr=False, compare=False)
+    card_yield_table: YieldTable | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.btc_price <= 0:
+            raise ValueError(f"BTC price must be positive, got {self.btc_price}")
+        numeric = self.numeric
+        card_cost = round_btc(self.card_price / self.btc_price)
+        derived = dict(
+            prime_licence_cost=numeric.from_decimal(round_btc(self.prime_licence_price / self.btc_price)),
+            platinum_licence_cost=numeric.from_decimal(round_btc(self.platinum_licence_price / self.btc_price)),
+            card_cost=numeric.from_decimal(card_cost),
+            card_mines_btc_per_day=numeric.from_decimal(self.card_daily_yield),
+            # days a card needs to mine back its cost
+            card_num_mining_days=int((card_cost / self.card_daily_yield).to_integral_value(rounding=ROUND_CEILING)),
+            card_yield_table=yield_table(self.yield_schedule, numeric) if self.yield_schedule is not None else None,
+        )
+        # frozen dataclass -> set derived fields directly
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
+
+    def cache_key(self) -> str:
+        # every parameter the results depend on, derived values follow from them
+        parts = [f"numeric={type(self.numeric).__name__}/{BTC_QUANTUM_PLACES}"]
+        for config_field in fields(self):
+            if not config_field.init or config_field.name == "numeric":
+                continue
+            value = getattr(self, config_field.name)
+            if isinstance(value, YieldSchedule):
+                value = ",".join(str(daily_yield) for daily_yield in value.daily_yield)
+            parts.append(f"{config_field.name}={value}")
+        return ";".join(parts)
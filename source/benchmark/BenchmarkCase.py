@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+from enum import Enum
+from itertools import product
+from typing import Iterable
+
+
+class BenchmarkTarget(Enum):
+    # whole simulation
+    SIMULATE = "Simulator.simulate"
+    # time spent in one method while the simulation runs
+    MINE_FOR_DAY = "User.mine_for_day"
+    ADD_NEW_CARDS = "User.add_new_cards"
+    LICENCE_MINING = "Licence.get_daily_mining_amount"
+
+
+# One point of the scale matrix: a user starting with num_licences PRIME licences holding
+# cards_per_licence cards each, simulated over days with the default daily policy.
+@dataclass(frozen=True)
+class BenchmarkCase:
+    target: BenchmarkTarget
+    num_licences: int
+    cards_per_licence: int
+    days: int
+
+    @property
+    def name(self) -> str:
+        return f"{self.target.value}[{self.num_licences}x{self.cards_per_licence}x{self.days}]"
+
+
+def scale_matrix(
+        num_licences: Iterable[int] = (1, 10, 100),
+        cards_per_licence: Iterable[int] = (14, 50),
+        days: Iterable[int] = (365, 1500),
+        targets: Iterable[BenchmarkTarget] = tuple(BenchmarkTarget),
+) -> list[BenchmarkCase]:
+    # every target at every combination of licences x cards x horizon
+    return [
+        BenchmarkCase(target=target, num_licences=licences, cards_per_licence=cards, days=horizon)
+        for licences, cards, horizon, target in product(num_licences, cards_per_licence, days, targets)
+    ]
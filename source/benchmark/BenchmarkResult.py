@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    # BenchmarkCase.name
+    case: str
+    # simulated days per second of time spent in the target, best of the repeats
+    days_per_second: float
+    seconds: float
+    # peak memory allocated by Python while the case's simulation runs
+    peak_memory_bytes: int
+
+    def as_dict(self) -> dict:
+        return dict(
+            case=self.case,
+            days_per_second=self.days_per_second,
+            seconds=self.seconds,
+            peak_memory_bytes=self.peak_memory_bytes,
+        )
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "BenchmarkResult":
+        return cls(
+            case=values["case"],
+            days_per_second=float(values["days_per_second"]),
+            seconds=float(values["seconds"]),
+            peak_memory_bytes=int(values["peak_memory_bytes"]),
+        )
+
+
+@dataclass(frozen=True)
+class BenchmarkRegression:
+    case: str
+    # "days_per_second" or "peak_memory_bytes"
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        # relative change, negative when the value dropped
+        return self.current / self.baseline - 1
+
+    def __str__(self) -> str:
+        return f"{self.case}: {self.metric} {self.baseline:.6g} -> {self.current:.6g} ({self.change:+.1%})"
@@ -0,0 +1,181 @@
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter
+from typing import Iterable, Iterator
+
+from source.Constants import DEFAULT_CONFIG
+from source.SimulationConfig import SimulationConfig
+from source.benchmark.BenchmarkCase import BenchmarkCase, BenchmarkTarget, scale_matrix
+from source.benchmark.BenchmarkResult import BenchmarkResult, BenchmarkRegression
+from source.licence.Licence import Licence
+from source.licence.LicenceBuilder import LicenceBuilder, LicenceType
+from source.simulator.Simulator import Simulator
+from source.user.User import User
+
+# methods timed inside a running simulation
+_TIMED_METHODS = {
+    BenchmarkTarget.MINE_FOR_DAY: (User, "mine_for_day"),
+    BenchmarkTarget.ADD_NEW_CARDS: (User, "add_new_cards"),
+    BenchmarkTarget.LICENCE_MINING: (Licence, "get_daily_mining_amount"),
+}
+
+
+@contextmanager
+def _timed_method(owner: type, name: str, elapsed: list[float]) -> Iterator[None]:
+    # add the time spent in every call of the method to elapsed[0] while the context is open
+    method = owner.__dict__[name]
+
+    def timed(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            elapsed[0] += perf_counter() - start
+
+    setattr(owner, name, timed)
+    try:
+        yield
+    finally:
+        setattr(owner, name, method)
+
+
+# Measures days per second and peak memory of the simulation hot paths over a scale matrix.
+# Each case runs the full daily policy; for a method target only the time spent in that method counts.
+# Timings are the best of `repeat` runs, peak memory comes from a separate traced run, since tracing
+# slows the simulation down.
+class BenchmarkRunner:
+
+    def __init__(self, repeat: int = 3, config: SimulationConfig = DEFAULT_CONFIG):
+        if repeat < 1:
+            raise ValueError(f"repeat must be at least 1, got {repeat}")
+        self.repeat = repeat
+        self.config = config
+
+    def run(self, cases: Iterable[BenchmarkCase]) -> list[BenchmarkResult]:
+        # peak memory depends on the workload only, targets of the same workload share it
+        peak_memory: dict[(int, int, int), int] = {}
+        results = []
+        for case in cases:
+            workload = (case.num_licences, case.cards_per_licence, case.days)
+            if workload not in peak_memory:
+                peak_memory[workload] = self._peak_memory(case=case)
+            seconds = min(self._time(case=case) for _ in range(self.repeat))
+            results.append(BenchmarkResult(
+                case=case.name,
+                days_per_second=case.days / seconds if seconds > 0 else float("inf"),
+                seconds=seconds,
+                peak_memory_bytes=peak_memory[workload],
+            ))
+        return results
+
+    def _user(self, case: BenchmarkCase) -> User:
+        builder = LicenceBuilder(licence_type=LicenceType.PRIME, config=self.config) \
+            .set_num_cards(num_cards=case.cards_per_licence)
+        licences, _ = builder.build_batch(num_packages=case.num_licences)
+        return User(licences=set(licences), config=self.config)
+
+    def _simulate(self, case: BenchmarkCase) -> None:
+        Simulator(config=self.config).simulate(user=self._user(case=case), days=case.days)
+
+    def _time(self, case: BenchmarkCase) -> float:
+        # seconds spent in the case's target, building the user does not count
+        if case.target is BenchmarkTarget.SIMULATE:
+            user = self._user(case=case)
+            simulator = Simulator(config=self.config)
+            start = perf_counter()
+            simulator.simulate(user=user, days=case.days)
+            return perf_counter() - start
+        owner, name = _TIMED_METHODS[case.target]
+        elapsed = [0.0]
+        with _timed_method(owner=owner, name=name, elapsed=elapsed):
+            self._simulate(case=case)
+        return elapsed[0]
+
+    def _peak_memory(self, case: BenchmarkCase) -> int:
+        tracemalloc.start()
+        try:
+            self._simulate(case=case)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return peak
+
+    @staticmethod
+    def save(results: Iterable[BenchmarkResult], path: Path) -> None:
+        document = dict(
+            python=platform.python_version(),
+            machine=platform.machine(),
+            results=[result.as_dict() for result in results],
+        )
+        path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+    @staticmethod
+    def load(path: Path) -> dict[str, BenchmarkResult]:
+        # baseline results by case name
+        document = json.loads(path.read_text(encoding="utf-8"))
+        results = [BenchmarkResult.from_dict(values) for values in document["results"]]
+        return {result.case: result for result in results}
+
+    @staticmethod
+    def find_regressions(
+            baseline: dict[str, BenchmarkResult],
+            results: Iterable[BenchmarkResult],
+            threshold: float = 0.2,
+    ) -> list[BenchmarkRegression]:
+        # cases that got slower or use more memory than the threshold allows, cases without a baseline are skipped
+        regressions = []
+        for result in results:
+            before = baseline.get(result.case)
+            if before is None:
+                continue
+            if result.days_per_second < before.days_per_second * (1 - threshold):
+                regressions.append(BenchmarkRegression(
+                    case=result.case, metric="days_per_second",
+                    baseline=before.days_per_second, current=result.days_per_second,
+                ))
+            if result.peak_memory_bytes > before.peak_memory_bytes * (1 + threshold):
+                regressions.append(BenchmarkRegression(
+                    case=result.case, metric="peak_memory_bytes",
+                    baseline=before.peak_memory_bytes, current=result.peak_memory_bytes,
+                ))
+        return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the simulation hot paths.")
+    parser.add_argument("--baseline", type=Path, default=Path("benchmark_baseline.json"))
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown or memory growth")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--quick", action="store_true", help="run a small part of the scale matrix")
+    args = parser.parse_args(argv)
+    if args.quick:
+        cases = scale_matrix(num_licences=(1, 10), cards_per_licence=(14,), days=(365,))
+    else:
+        cases = scale_matrix()
+    results = BenchmarkRunner(repeat=args.repeat).run(cases=cases)
+    for result in results:
+        peak_memory_mib = result.peak_memory_bytes / 2 ** 20
+        print(f"{result.case:<60} {result.days_per_second:>12.1f} days/s {peak_memory_mib:>9.2f} MiB")
+    if args.save:
+        BenchmarkRunner.save(results=results, path=args.baseline)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}, run with --save to create one")
+        return 0
+    regressions = BenchmarkRunner.find_regressions(
+        baseline=BenchmarkRunner.load(path=args.baseline), results=results, threshold=args.threshold,
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
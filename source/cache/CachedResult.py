@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+from source.output.DayRecord import DayRecord
+
+
+@dataclass(frozen=True)
+class CachedResult:
+    # final BTC amount of the simulation
+    btc_amount: Decimal
+    # state of every simulated day, only stored when somebody listened to the run
+    series: tuple[DayRecord, ...] | None = None
+    # checkpoint of the user at the end of the simulation
+    state: bytes | None = None
@@ -0,0 +1,137 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+from decimal import Decimal
+from functools import cache
+
+from source.cache.CachedResult import CachedResult
+from source.output.DayRecord import DayRecord
+
+# package whose code computes the cached results
+_SOURCE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@cache
+def engine_version() -> str:
+    # Hash of the simulation code, part of every key: results of other code are never served.
+    # Any change to a source file starts a fresh set of keys.
+    digest = hashlib.sha256()
+    for directory, directory_names, file_names in os.walk(_SOURCE_DIRECTORY):
+        directory_names[:] = sorted(name for name in directory_names if name != "__pycache__")
+        for name in sorted(file_names):
+            if not name.endswith(".py"):
+                continue
+            path = os.path.join(directory, name)
+            digest.update(os.path.relpath(path, _SOURCE_DIRECTORY).encode("utf-8"))
+            with open(path, "rb") as file:
+                digest.update(hashlib.sha256(file.read()).digest())
+    return digest.hexdigest()
+
+
+# Simulation results stored in a local directory, one file per result named by the hash of its key.
+# Reading a result refreshes its modification time, the least recently used results are evicted
+# once the directory grows beyond max_bytes. The size is kept as a running total and the directory
+# is only scanned when the total exceeds max_bytes. Several processes can share a directory: files are
+# written to a temporary name and renamed, so readers never see partial results, and each scan picks up
+# the other processes' results.
+class ResultCache:
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        if max_bytes <= 0:
+            raise ValueError(f"cache size must be positive, got {max_bytes}")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        # bytes stored as of the last scan, plus the results written since
+        _, self._total_bytes = self._scan()
+
+    @staticmethod
+    def key(*parts: str | bytes) -> str:
+        # stable hash of everything that determines a result
+        digest = hashlib.sha256(engine_version().encode("ascii"))
+        for part in parts:
+            data = part.encode("utf-8") if isinstance(part, str) else part
+            # length prefix keeps ("ab", "c") and ("a", "bc") apart
+            digest.update(len(data).to_bytes(8, "little"))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> CachedResult | None:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as file:
+                entry = json.load(file)
+            # mark as recently used
+            os.utime(path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        series = entry["series"]
+        state = entry["state"]
+        return CachedResult(
+            btc_amount=Decimal(entry["btc_amount"]),
+            series=None if series is None else tuple(
+                DayRecord(day=day, btc_amount=Decimal(btc_amount), num_cards_added=num_cards_added)
+                for day, btc_amount, num_cards_added in series
+            ),
+            state=None if state is None else base64.b64decode(state),
+        )
+
+    def put(self, key: str, result: CachedResult) -> None:
+        entry = {
+            "btc_amount": str(result.btc_amount),
+            "series": None if result.series is None else [
+                [record.day, str(record.btc_amount), record.num_cards_added] for record in result.series
+            ],
+            "state": None if result.state is None else base64.b64encode(result.state).decode("ascii"),
+        }
+        path = self._path(key)
+        try:
+            replaced_bytes = os.path.getsize(path)
+        except FileNotFoundError:
+            replaced_bytes = 0
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            json.dump(entry, file, separators=(",", ":"))
+        num_bytes = os.path.getsize(temporary_path)
+        os.replace(temporary_path, path)
+        self._total_bytes += num_bytes - replaced_bytes
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _scan(self) -> (list[(int, str, int)], int):
+        # stored results as (modification time, file name, size), least recently used first, and their total size
+        entries = []
+        total_bytes = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                # evicted by another process
+                continue
+            entries.append((stat.st_mtime_ns, name, stat.st_size))
+            total_bytes += stat.st_size
+        entries.sort()
+        return entries, total_bytes
+
+    def _evict(self) -> None:
+        # drop least recently used results until the cache fits into max_bytes
+        entries, total_bytes = self._scan()
+        for _, name, size in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+        self._total_bytes = total_bytes
+
+    def __len__(self) -> int:
+        return sum(1 for name in os.listdir(self.directory) if name.endswith(".json"))
@@ -0,0 +1,348 @@
+import struct
+from decimal import Decimal, InvalidOperation
+from enum import IntEnum
+
+from source.SimulationConfig import SimulationConfig
+from source.licence.Licence import Licence
+from source.licence.LicenceState import Valid, Expired
+from source.mining_unit.CardLifecycle import CardLifecycle, card_lifecycle, scheduled_card_lifecycle
+from source.mining_unit.MiningCard import MiningCard
+from source.mining_unit.MiningCardCohort import MiningCardCohort
+from source.mining_unit.MiningCardState import MiningCardState, Reserved, Active, Deactivated
+from source.mining_unit.ScheduledCardCohort import ScheduledCardCohort
+from source.mining_unit.YieldSchedule import YieldSchedule
+from source.user.User import User
+from source.utils.NumericBackend import NumericBackend, DecimalBackend, FixedPointBackend, BtcAmount
+
+# Binary checkpoint of a simulation: the user's config, balance, licences and card cohorts.
+# Layout (little endian):
+#   magic, version
+#   config with its yield schedule, simulation day, days the user mined, balance
+#   card lifecycles shared by scheduled cohorts, by purchase day when their yield follows the schedule
+#   licences: cost, capacity, state, cohorts
+# Decimals are stored as their exact string form after its length, BTC amounts in the config's numeric backend.
+MAGIC = b"MRCP"
+VERSION = 3
+
+_BACKENDS: list[type[NumericBackend]] = [DecimalBackend, FixedPointBackend]
+
+
+class _LicenceTag(IntEnum):
+    VALID = 0
+    EXPIRED = 1
+
+
+class _LifecycleTag(IntEnum):
+    CONSTANT = 0
+    SCHEDULED = 1
+
+
+class _CohortTag(IntEnum):
+    SCHEDULED = 0
+    CARD = 1
+
+
+class _CardTag(IntEnum):
+    RESERVED = 0
+    ACTIVE = 1
+    DEACTIVATED = 2
+
+
+class _Writer:
+
+    def __init__(self, numeric: NumericBackend):
+        self.numeric = numeric
+        self._parts: list[bytes] = []
+
+    def raw(self, value: bytes) -> None:
+        self._parts.append(value)
+
+    def uint(self, value: int) -> None:
+        self._parts.append(struct.pack("<I", value))
+
+    def byte(self, value: int) -> None:
+        self._parts.append(struct.pack("<B", value))
+
+    def decimal(self, value: Decimal) -> None:
+        text = str(value).encode("ascii")
+        self.uint(len(text))
+        self._parts.append(text)
+
+    def amount(self, value: BtcAmount) -> None:
+        self.decimal(self.numeric.to_decimal(value))
+
+    def to_bytes(self) -> bytes:
+        return b"".join(self._parts)
+
+
+class _Reader:
+
+    def __init__(self, data: bytes):
+        self._view = memoryview(data)
+        self._offset = 0
+        self.numeric: NumericBackend = DecimalBackend()
+
+    def raw(self, size: int) -> bytes:
+        return bytes(self._take(size))
+
+    def _take(self, size: int) -> memoryview:
+        if self._offset + size > len(self._view):
+            raise ValueError("checkpoint is truncated")
+        chunk = self._view[self._offset:self._offset + size]
+        self._offset += size
+        return chunk
+
+    def uint(self) -> int:
+        return struct.unpack("<I", self._take(4))[0]
+
+    def byte(self) -> int:
+        return self._take(1)[0]
+
+    def decimal(self) -> Decimal:
+        text = bytes(self._take(self.uint())).decode("ascii")
+        try:
+            return Decimal(text)
+        except InvalidOperation:
+            raise ValueError(f"checkpoint holds an invalid decimal {text!r}") from None
+
+    def amount(self) -> BtcAmount:
+        return self.numeric.from_decimal(self.decimal())
+
+    def at_end(self) -> bool:
+        return self._offset == len(self._view)
+
+
+def dump_checkpoint(user: User, day: int) -> bytes:
+    # snapshot of the user at the end of the given simulation day
+    config = user.config
+    writer = _Writer(numeric=config.numeric)
+    writer.raw(MAGIC)
+    writer.uint(VERSION)
+    _write_config(writer=writer, config=config)
+    writer.uint(day)
+    writer.uint(user.num_days_mined)
+    writer.amount(user.btc_amount)
+    # licences in index order, so restored licences break ties like the originals
+    licences = user.ordered_licences()
+    lifecycles: dict[CardLifecycle, int] = {}
+    for licence in licences:
+        for cohort in licence.cards.cohorts:
+            if isinstance(cohort, ScheduledCardCohort):
+                lifecycles.setdefault(cohort.lifecycle, len(lifecycles))
+    writer.uint(len(lifecycles))
+    for lifecycle in lifecycles:
+        _write_lifecycle(writer=writer, lifecycle=lifecycle, config=config)
+    writer.uint(len(licences))
+    for licence in licences:
+        _write_licence(writer=writer, licence=licence, lifecycles=lifecycles, config=config)
+    return writer.to_bytes()
+
+
+def load_checkpoint(data: bytes) -> (User, int):
+    # restore the user and the simulation day the checkpoint was taken on
+    reader = _Reader(data=data)
+    if reader.raw(len(MAGIC)) != MAGIC:
+        raise ValueError("not a simulation checkpoint")
+    version = reader.uint()
+    if version != VERSION:
+        raise ValueError(f"unsupported checkpoint version {version}, expected {VERSION}")
+    config = _read_config(reader=reader)
+    reader.numeric = config.numeric
+    day = reader.uint()
+    num_days_mined = reader.uint()
+    btc_amount = reader.amount()
+    lifecycles = [_read_lifecycle(reader=reader, config=config) for _ in range(reader.uint())]
+    licences = [_read_licence(reader=reader, lifecycles=lifecycles) for _ in range(reader.uint())]
+    if not reader.at_end():
+        raise ValueError("unexpected data after checkpoint")
+    user = User.resume(licences=licences, btc_amount=btc_amount, num_days_mined=num_days_mined, config=config)
+    return user, day
+
+
+def _write_config(writer: _Writer, config: SimulationConfig) -> None:
+    writer.decimal(config.btc_price)
+    writer.byte(_BACKENDS.index(type(config.numeric)))
+    writer.decimal(config.prime_licence_price)
+    writer.decimal(config.platinum_licence_price)
+    writer.uint(config.prime_max_num_cards)
+    writer.uint(config.platinum_max_num_cards)
+    writer.decimal(config.card_price)
+    writer.decimal(config.card_daily_yield)
+    writer.decimal(config.card_profit_threshold)
+    schedule = config.yield_schedule
+    writer.uint(len(schedule.daily_yield) if schedule is not None else 0)
+    if schedule is not None:
+        for daily_yield in schedule.daily_yield:
+            writer.decimal(daily_yield)
+
+
+def _read_config(reader: _Reader) -> SimulationConfig:
+    btc_price = reader.decimal()
+    backend = reader.byte()
+    if backend >= len(_BACKENDS):
+        raise ValueError(f"unknown numeric backend {backend}")
+    return SimulationConfig(
+        btc_price=btc_price,
+        numeric=_BACKENDS[backend](),
+        prime_licence_price=reader.decimal(),
+        platinum_licence_price=reader.decimal(),
+        prime_max_num_cards=reader.uint(),
+        platinum_max_num_cards=reader.uint(),
+        card_price=reader.decimal(),
+        card_daily_yield=reader.decimal(),
+        card_profit_threshold=reader.decimal(),
+        yield_schedule=_read_yield_schedule(reader=reader),
+    )
+
+
+def _read_yield_schedule(reader: _Reader) -> YieldSchedule | None:
+    num_days = reader.uint()
+    if num_days == 0:
+        return None
+    return YieldSchedule(daily_yield=tuple(reader.decimal() for _ in range(num_days)))
+
+
+def _write_lifecycle(writer: _Writer, lifecycle: CardLifecycle, config: SimulationConfig) -> None:
+    _check_numeric(numeric=lifecycle.numeric, config=config)
+    if lifecycle.purchase_day is None:
+        writer.byte(_LifecycleTag.CONSTANT)
+        writer.amount(lifecycle.cost)
+        writer.amount(lifecycle.mines_btc_per_day)
+        writer.decimal(lifecycle.profit_threshold)
+        writer.uint(lifecycle.reserved_days)
+    else:
+        # the yields are the config's schedule from the purchase day on
+        writer.byte(_LifecycleTag.SCHEDULED)
+        writer.amount(lifecycle.cost)
+        writer.decimal(lifecycle.profit_threshold)
+        writer.uint(lifecycle.reserved_days)
+        writer.uint(lifecycle.purchase_day)
+
+
+def _read_lifecycle(reader: _Reader, config: SimulationConfig) -> CardLifecycle:
+    match reader.byte():
+        case _LifecycleTag.CONSTANT:
+            return card_lifecycle(
+                cost=reader.amount(),
+                mines_btc_per_day=reader.amount(),
+                profit_threshold=reader.decimal(),
+                reserved_days=reader.uint(),
+                numeric=config.numeric,
+            )
+        case _LifecycleTag.SCHEDULED:
+            if config.card_yield_table is None:
+                raise ValueError("checkpoint has cards on a yield schedule, its config has none")
+            return scheduled_card_lifecycle(
+                cost=reader.amount(),
+                profit_threshold=reader.decimal(),
+                reserved_days=reader.uint(),
+                table=config.card_yield_table,
+                purchase_day=reader.uint(),
+            )
+        case kind:
+            raise ValueError(f"unknown lifecycle kind {kind}")
+
+
+def _check_numeric(numeric: NumericBackend, config: SimulationConfig) -> None:
+    if numeric != config.numeric:
+        raise ValueError(f"card uses {numeric}, the user's config uses {config.numeric}")
+
+
+def _write_licence(
+        writer: _Writer,
+        licence: Licence,
+        lifecycles: dict[CardLifecycle, int],
+        config: SimulationConfig,
+) -> None:
+    writer.amount(licence.cost)
+    writer.uint(licence.max_num_cards)
+    writer.uint(int(licence.card_num_mining_days))
+    match licence.state:
+        case Valid(days_left=days):
+            writer.byte(_LicenceTag.VALID)
+            writer.uint(days)
+        case Expired():
+            writer.byte(_LicenceTag.EXPIRED)
+        case _:
+            raise ValueError(f"unknown licence state: {licence.state}")
+    writer.uint(len(licence.cards.cohorts))
+    for cohort in licence.cards.cohorts:
+        match cohort:
+            case ScheduledCardCohort(lifecycle=lifecycle, count=count, age=age):
+                writer.byte(_CohortTag.SCHEDULED)
+                writer.uint(lifecycles[lifecycle])
+                writer.uint(count)
+                writer.uint(age)
+            case MiningCardCohort(card=card, count=count):
+                _check_numeric(numeric=card.numeric, config=config)
+                writer.byte(_CohortTag.CARD)
+                writer.amount(card.cost)
+                writer.amount(card.mines_btc_per_day)
+                writer.decimal(card.profit_threshold)
+                _write_card_state(writer=writer, card=card)
+                writer.uint(count)
+
+
+def _write_card_state(writer: _Writer, card: MiningCard) -> None:
+    match card.state:
+        case Reserved(days_left=days):
+            writer.byte(_CardTag.RESERVED)
+            writer.uint(days)
+        case Active(mined_btc=btc):
+            writer.byte(_CardTag.ACTIVE)
+            writer.amount(btc)
+        case Deactivated():
+            writer.byte(_CardTag.DEACTIVATED)
+        case _:
+            raise ValueError(f"unknown card state: {card.state}")
+
+
+def _read_licence(reader: _Reader, lifecycles: list[CardLifecycle]) -> Licence:
+    cost = reader.amount()
+    max_num_cards = reader.uint()
+    card_num_mining_days = reader.uint()
+    match reader.byte():
+        case _LicenceTag.VALID:
+            state = Valid(days_left=reader.uint())
+        case _LicenceTag.EXPIRED:
+            state = Expired()
+        case kind:
+            raise ValueError(f"unknown licence state {kind}")
+    licence = Licence(
+        cost=cost,
+        max_num_cards=max_num_cards,
+        state=state,
+        card_num_mining_days=card_num_mining_days,
+        numeric=reader.numeric,
+    )
+    # cohorts are restored directly, capacity was checked when the cards were added
+    for _ in range(reader.uint()):
+        match reader.byte():
+            case _CohortTag.SCHEDULED:
+                lifecycle = lifecycles[reader.uint()]
+                count = reader.uint()
+                licence.cards.add_scheduled(lifecycle, num_cards=count, age=reader.uint())
+            case _CohortTag.CARD:
+                card = MiningCard(
+                    cost=reader.amount(),
+                    mines_btc_per_day=reader.amount(),
+                    profit_threshold=reader.decimal(),
+                    numeric=reader.numeric,
+                )
+                card.state = _read_card_state(reader=reader)
+                licence.cards.add(card, num_cards=reader.uint())
+            case kind:
+                raise ValueError(f"unknown cohort kind {kind}")
+    return licence
+
+
+def _read_card_state(reader: _Reader) -> MiningCardState:
+    match reader.byte():
+        case _CardTag.RESERVED:
+            return Reserved(days_left=reader.uint())
+        case _CardTag.ACTIVE:
+            return Active(mined_btc=reader.amount())
+        case _CardTag.DEACTIVATED:
+            return Deactivated()
+        case kind:
+            raise ValueError(f"unknown card state {kind}")
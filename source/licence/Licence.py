@@ -1,54 +1,95 @@
+from copy import copy
 from dataclasses import dataclass, field
-from decimal import Decimal
 
-from source.Constants import CARD_NUM_MINING_DAYS
+from source.Constants import CARD_NUM_MINING_DAYS, NUMERIC
 from source.licence.LicenceState import LicenceState, Valid, Expired
+from source.mining_unit.CardLifecycle import CardLifecycle
 from source.mining_unit.MiningCard import MiningCard
-from source.mining_unit.MiningCardState import Deactivated
+from source.mining_unit.MiningCardFleet import MiningCardFleet
+from source.utils.NumericBackend import BtcAmount, NumericBackend
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class Licence:
-    cost: Decimal
+    cost: BtcAmount
     max_num_cards: int
     state: LicenceState = field(default_factory=lambda: Valid(days_left=365))
-    cards: set[MiningCard] = field(default_factory=set)
+    cards: MiningCardFleet = field(default_factory=MiningCardFleet)
     card_num_mining_days: int = CARD_NUM_MINING_DAYS
+    numeric: NumericBackend = NUMERIC
 
-    def can_add_mining_card(self) -> bool:
-        # can the licence accept another card
-        max_num_cards_reached = len(self.cards) >= self.max_num_cards
+    def __post_init__(self) -> None:
+        # group cards passed in as a plain collection into cohorts
+        if not isinstance(self.cards, MiningCardFleet):
+            self.cards = MiningCardFleet(cards=self.cards)
+
+    def fork(self) -> "Licence":
+        # independent copy that continues from the same state
+        return Licence(
+            cost=self.cost,
+            max_num_cards=self.max_num_cards,
+            # states are updated in place, the copy gets its own
+            state=copy(self.state),
+            cards=self.cards.fork(),
+            card_num_mining_days=self.card_num_mining_days,
+            numeric=self.numeric,
+        )
+
+    def can_add_mining_card(self, num_cards: int = 1) -> bool:
+        # can the licence accept more cards
+        max_num_cards_reached = len(self.cards) + num_cards > self.max_num_cards
         # will a new card be able to mine a profit until the licence expires
         enough_days_left = isinstance(self.state, Valid) and self.state.days_left > self.card_num_mining_days
         return not max_num_cards_reached and enough_days_left
 
-    def add_mining_card(self, mining_card: MiningCard) -> None:
-        if self.can_add_mining_card():
-            self.cards.add(mining_card)
+    def add_mining_card(self, mining_card: MiningCard, num_cards: int = 1) -> None:
+        # num_cards > 1 adds a cohort of cards sharing the given card's state
+        if self.can_add_mining_card(num_cards=num_cards):
+            self.cards.add(mining_card, num_cards=num_cards)
+        else:
+            raise RuntimeError(f"Should not add a new card")
+
+    def add_new_mining_cards(self, lifecycle: CardLifecycle, num_cards: int = 1) -> None:
+        # newly bought cards follow a precomputed lifecycle instead of stepping their own state
+        if self.can_add_mining_card(num_cards=num_cards):
+            self.cards.add_scheduled(lifecycle, num_cards=num_cards)
         else:
             raise RuntimeError(f"Should not add a new card")
 
+    @property
+    def num_active_cards(self) -> int:
+        # cards that mine on the next day
+        return self.cards.num_active_cards if isinstance(self.state, Valid) else 0
+
+    @property
+    def daily_mining_rate(self) -> BtcAmount:
+        # amount the licence's cards mine on the next day, kept up to date by the fleet
+        return self.cards.daily_mining_rate if isinstance(self.state, Valid) else self.numeric.zero
+
+    @property
+    def days_until_change(self) -> int | None:
+        # mining days before the licence's cards change state or the licence expires, None if it expired
+        if not isinstance(self.state, Valid):
+            return None
+        days = self.cards.days_until_change
+        return self.state.days_left if days is None else min(days, self.state.days_left)
+
     def _remove_deactivated_mining_cards(self) -> None:
-        # collect deactivated cards
-        deactivated_cards = {card for card in self.cards if isinstance(card.state, Deactivated)}
-        # remove deactivated cards
-        self.cards -= deactivated_cards
+        # remove cohorts whose cards were deactivated
+        self.cards.remove_deactivated()
 
-    def _collect_btc_from_cards(self) -> Decimal:
-        # collect mined BTC from all cards in the licence
-        mined_today = Decimal("0")
-        for card in self.cards:
-            mined_today += card.get_daily_mining_amount()
-        return mined_today
+    def _collect_btc_from_cards(self) -> BtcAmount:
+        # collect mined BTC from all card cohorts in the licence
+        return self.cards.get_daily_mining_amount()
 
     def _acknowledge_mining_day(self, state: Valid) -> None:
         valid_for_days = state.days_left - 1
         if valid_for_days > 0:
-            self.state = Valid(days_left=valid_for_days)
+            state.days_left = valid_for_days
         else:
             self.state = Expired()
 
-    def get_daily_mining_amount(self) -> Decimal:
+    def get_daily_mining_amount(self) -> BtcAmount:
         state = self.state
         # should not be called on expired licence
         if not isinstance(state, Valid):
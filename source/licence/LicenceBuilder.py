@@ -1,10 +1,10 @@
-from decimal import Decimal
 from enum import Enum
 
-from source.Constants import PRIME_LICENCE_COST, PRIME_MAX_NUM_CARDS, PLATINUM_LICENCE_COST, PLATINUM_MAX_NUM_CARDS, \
-    CARD_COST
+from source.Constants import DEFAULT_CONFIG
+from source.SimulationConfig import SimulationConfig
 from source.licence.Licence import Licence
-from source.mining_unit.MiningCard import MiningCard
+from source.mining_unit.CardLifecycle import bought_card_lifecycle
+from source.utils.NumericBackend import BtcAmount
 
 
 class LicenceType(Enum):
@@ -14,23 +14,26 @@ class LicenceType(Enum):
 
 class LicenceBuilder:
 
-    def __init__(self, licence_type: LicenceType):
+    def __init__(self, licence_type: LicenceType, config: SimulationConfig = DEFAULT_CONFIG, day: int = 0):
         self.licence_type = licence_type
+        self.config = config
+        # day the licences are bought on, cards' yields depend on it when they follow a schedule
+        self.day = day
         self.num_cards = 0
-        self.licence_cost = Decimal("0")
+        self.licence_cost = config.numeric.zero
         self.max_cards = 0
-        self.cards_cost = Decimal("0")
+        self.cards_cost = config.numeric.zero
         self._set_licence_config()
 
     def _set_licence_config(self) -> None:
         # set licence cost and max number of cards the licence can accept based on licence type
         match self.licence_type:
             case LicenceType.PRIME:
-                self.licence_cost = PRIME_LICENCE_COST
-                self.max_cards = PRIME_MAX_NUM_CARDS
+                self.licence_cost = self.config.prime_licence_cost
+                self.max_cards = self.config.prime_max_num_cards
             case LicenceType.PLATINUM:
-                self.licence_cost = PLATINUM_LICENCE_COST
-                self.max_cards = PLATINUM_MAX_NUM_CARDS
+                self.licence_cost = self.config.platinum_licence_cost
+                self.max_cards = self.config.platinum_max_num_cards
             case _:
                 raise ValueError("unknown licence type")
 
@@ -41,22 +44,55 @@ class LicenceBuilder:
         # set num cards
         self.num_cards = num_cards
         # set cost for all cards
-        self.cards_cost = num_cards * CARD_COST
+        self.cards_cost = num_cards * self.config.card_cost
         return self
 
+    def _new_licence(self) -> Licence:
+        return Licence(
+            cost=self.licence_cost,
+            max_num_cards=self.max_cards,
+            card_num_mining_days=self._card_num_mining_days(),
+            numeric=self.config.numeric,
+        )
+
+    def _card_num_mining_days(self) -> int:
+        # days left below which the licence stops accepting cards
+        table = self.config.card_yield_table
+        if table is None:
+            return self.config.card_num_mining_days
+        # a new licence is valid for 365 days
+        return table.min_days_left(expiry_day=self.day + 365, card_cost=self.config.card_cost)
+
     def _add_initial_cards(self, licence: Licence) -> None:
-        # build cards
-        mining_cards = [MiningCard() for _ in range(self.num_cards)]
-        # add cards to licence
-        for mining_card in mining_cards:
-            licence.add_mining_card(mining_card=mining_card)
+        # initial cards are bought together and follow the same trajectory -> add them as one cohort
+        if self.num_cards > 0:
+            lifecycle = bought_card_lifecycle(self.config, day=self.day)
+            licence.add_new_mining_cards(lifecycle=lifecycle, num_cards=self.num_cards)
+
+    @property
+    def cards_fit(self) -> bool:
+        # can a new licence accept the package's cards, they need to pay off before it expires
+        return self.num_cards == 0 or 365 > self._card_num_mining_days()
+
+    @property
+    def package_cost(self) -> BtcAmount:
+        # cost of licence including initial cards
+        return self.licence_cost + self.cards_cost
+
+    def build_batch(self, num_packages: int) -> (list[Licence], BtcAmount):
+        # build licences with initial cards, capacity is checked once per licence
+        licences = []
+        for _ in range(num_packages):
+            licence = self._new_licence()
+            self._add_initial_cards(licence=licence)
+            licences.append(licence)
+        # return licences and cost of all licences including initial cards
+        return licences, num_packages * self.package_cost
 
-    def build(self) -> (Licence, Decimal):
+    def build(self) -> (Licence, BtcAmount):
         # create a licence
-        licence = Licence(cost=self.licence_cost, max_num_cards=self.max_cards)
+        licence = self._new_licence()
         # add  cards
         self._add_initial_cards(licence=licence)
-        # calculate package cost
-        package_cost = self.licence_cost + self.cards_cost
         # return licence and cost of licence including initial cards
-        return licence, package_cost
+        return licence, self.package_cost
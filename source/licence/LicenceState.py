@@ -1,15 +1,29 @@
 from dataclasses import dataclass
 
 
+# States are slotted and owned by one licence: days left are counted down in place instead of
+# allocating a new state every day. Expired carries no data and is a shared singleton.
 class LicenceState:
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class Valid(LicenceState):
     # track how many days are left until the licence expires
     days_left: int
 
 
 class Expired(LicenceState):
-    pass
+    __slots__ = ()
+    _instance: "Expired | None" = None
+
+    def __new__(cls) -> "Expired":
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __repr__(self) -> str:
+        return "Expired()"
+
+    def __reduce__(self):
+        return Expired, ()
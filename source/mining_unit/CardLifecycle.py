@@ -0,0 +1,258 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import cache
+from itertools import accumulate
+
+from source.SimulationConfig import SimulationConfig
+from source.mining_unit.MiningCard import MiningCard
+from source.mining_unit.MiningCardState import MiningCardState, Reserved, Active, Deactivated
+from source.mining_unit.YieldSchedule import YieldTable
+from source.utils.NumericBackend import NumericBackend, BtcAmount
+
+
+# Every card with the same parameters follows the same deterministic path, so the path is computed once:
+# reserved days mining nothing, then full days of mining up to the target with a partial last day.
+@dataclass(frozen=True, eq=False)
+class CardLifecycle:
+    cost: BtcAmount
+    mines_btc_per_day: BtcAmount
+    profit_threshold: Decimal
+    reserved_days: int
+    numeric: NumericBackend
+    # amount a card mines on each day of its life (index = age in days), it is deactivated after the last day
+    daily_yield: Sequence[BtcAmount]
+    # amount a card mined during its first `age` days (index = age in days)
+    cumulative_yield: Sequence[BtcAmount]
+    # day the cards were bought when their yield follows a schedule, the yields then depend on it
+    purchase_day: int | None = None
+    # schedule a card mines at between its reserved days and its last day, None for a constant yield
+    yield_table: YieldTable | None = None
+
+    @property
+    def num_days(self) -> int:
+        return len(self.daily_yield)
+
+    def __reduce__(self):
+        # lifecycles are cached by their parameters, unpickling returns the receiving process's own
+        # lifecycle, so cards sent to another process still share it and merge into cohorts
+        if self.yield_table is None:
+            return _cached_card_lifecycle, (
+                self.cost, self.mines_btc_per_day, self.profit_threshold, self.reserved_days, self.numeric,
+            )
+        return _cached_scheduled_card_lifecycle, (
+            self.cost, self.profit_threshold, self.reserved_days, self.yield_table, self.purchase_day,
+        )
+
+    def mined_between(self, from_age: int, to_age: int) -> BtcAmount:
+        # amount a card mines from day from_age up to, but not including, day to_age of its life
+        last_age = self.num_days
+        return self.cumulative_yield[min(to_age, last_age)] - self.cumulative_yield[min(from_age, last_age)]
+
+    def state_at(self, age: int) -> MiningCardState:
+        # state of a card that has lived for age days
+        if age < self.reserved_days:
+            return Reserved(days_left=self.reserved_days - age)
+        if age < self.num_days:
+            return Active(mined_btc=self.cumulative_yield[age])
+        return Deactivated()
+
+    def card_at(self, age: int) -> MiningCard:
+        return MiningCard(
+            cost=self.cost,
+            mines_btc_per_day=self.mines_btc_per_day,
+            state=self.state_at(age=age),
+            profit_threshold=self.profit_threshold,
+            numeric=self.numeric,
+        )
+
+
+@cache
+def card_lifecycle(
+        cost: BtcAmount,
+        mines_btc_per_day: BtcAmount,
+        profit_threshold: Decimal,
+        reserved_days: int,
+        numeric: NumericBackend,
+) -> CardLifecycle:
+    # run a card through its life once, so the table uses the card's own arithmetic
+    card = MiningCard(
+        cost=cost,
+        mines_btc_per_day=mines_btc_per_day,
+        state=Reserved(days_left=reserved_days),
+        profit_threshold=profit_threshold,
+        numeric=numeric,
+    )
+    daily_yield = []
+    while not isinstance(card.state, Deactivated):
+        daily_yield.append(card.get_daily_mining_amount())
+    return CardLifecycle(
+        cost=cost,
+        mines_btc_per_day=mines_btc_per_day,
+        profit_threshold=profit_threshold,
+        reserved_days=reserved_days,
+        numeric=numeric,
+        daily_yield=tuple(daily_yield),
+        cumulative_yield=tuple(accumulate(daily_yield, initial=numeric.zero)),
+    )
+
+
+def _cached_card_lifecycle(
+        cost: BtcAmount,
+        mines_btc_per_day: BtcAmount,
+        profit_threshold: Decimal,
+        reserved_days: int,
+        numeric: NumericBackend,
+) -> CardLifecycle:
+    # the cache tells keyword from positional calls, unpickling calls the factory like the rest of the code
+    return card_lifecycle(
+        cost=cost,
+        mines_btc_per_day=mines_btc_per_day,
+        profit_threshold=profit_threshold,
+        reserved_days=reserved_days,
+        numeric=numeric,
+    )
+
+
+def new_card_lifecycle(mining_card: MiningCard) -> CardLifecycle:
+    # lifecycle of a card that was just bought
+    if not isinstance(mining_card.state, Reserved):
+        raise ValueError(f"Lifecycle starts in reserved state, card is in state: {mining_card.state}")
+    return card_lifecycle(
+        cost=mining_card.cost,
+        mines_btc_per_day=mining_card.mines_btc_per_day,
+        profit_threshold=mining_card.profit_threshold,
+        reserved_days=max(1, mining_card.state.days_left),
+        numeric=mining_card.numeric,
+    )
+
+
+@cache
+def scheduled_card_lifecycle(
+        cost: BtcAmount,
+        profit_threshold: Decimal,
+        reserved_days: int,
+        table: YieldTable,
+        purchase_day: int,
+) -> CardLifecycle:
+    # The yield changes from day to day, so the path depends on the day the card is bought.
+    # It is read from the schedule's tables instead of stepping a card: the last mining day is found
+    # by bisection, the yields on the days before it are the schedule's own.
+    numeric = table.numeric
+    first_mining_day = purchase_day + 1 + reserved_days
+    target = numeric.mining_target(cost=cost, profit_threshold=profit_threshold)
+    if first_mining_day > table.last_day:
+        # the schedule ends before the card starts mining, its lifecycle ends after the reserved days
+        last_mining_day = purchase_day + reserved_days
+        last_day_amount = numeric.zero
+    else:
+        last_mining_day = table.reach_day(first_day=first_mining_day, amount=target)
+        if last_mining_day > table.last_day:
+            # the schedule ends before the card reaches its target, the card mines until then
+            last_mining_day = table.last_day
+            last_day_amount = table.daily_yield[last_mining_day]
+        else:
+            last_day_amount = target - table.mined_between(first_day=first_mining_day, last_day=last_mining_day - 1)
+    first_yield = table.daily_yield[first_mining_day] if first_mining_day <= table.last_day else numeric.zero
+    return CardLifecycle(
+        cost=cost,
+        mines_btc_per_day=first_yield,
+        profit_threshold=profit_threshold,
+        reserved_days=reserved_days,
+        numeric=numeric,
+        daily_yield=_ScheduledDailyYield(
+            table=table, purchase_day=purchase_day, reserved_days=reserved_days,
+            last_mining_day=last_mining_day, last_day_amount=last_day_amount,
+        ),
+        cumulative_yield=_ScheduledCumulativeYield(
+            table=table, purchase_day=purchase_day, reserved_days=reserved_days,
+            last_mining_day=last_mining_day, last_day_amount=last_day_amount,
+        ),
+        purchase_day=purchase_day,
+        yield_table=table,
+    )
+
+
+def _cached_scheduled_card_lifecycle(
+        cost: BtcAmount,
+        profit_threshold: Decimal,
+        reserved_days: int,
+        table: YieldTable,
+        purchase_day: int,
+) -> CardLifecycle:
+    return scheduled_card_lifecycle(
+        cost=cost,
+        profit_threshold=profit_threshold,
+        reserved_days=reserved_days,
+        table=table,
+        purchase_day=purchase_day,
+    )
+
+
+def bought_card_lifecycle(config: SimulationConfig, day: int) -> CardLifecycle:
+    # lifecycle of the config's card bought on the given day
+    card = MiningCard.from_config(config)
+    if config.card_yield_table is None:
+        return new_card_lifecycle(card)
+    return scheduled_card_lifecycle(
+        cost=card.cost,
+        profit_threshold=card.profit_threshold,
+        reserved_days=card.state.days_left,
+        table=config.card_yield_table,
+        purchase_day=day,
+    )
+
+
+# Yields of a scheduled lifecycle by age, read from the schedule's tables on access.
+class _ScheduledYields(Sequence):
+
+    def __init__(
+            self,
+            table: YieldTable,
+            purchase_day: int,
+            reserved_days: int,
+            last_mining_day: int,
+            last_day_amount: BtcAmount,
+    ):
+        self._table = table
+        self._purchase_day = purchase_day
+        self._reserved_days = reserved_days
+        self._last_mining_day = last_mining_day
+        self._last_day_amount = last_day_amount
+
+    @property
+    def _num_days(self) -> int:
+        return self._last_mining_day - self._purchase_day
+
+
+class _ScheduledDailyYield(_ScheduledYields):
+
+    def __len__(self) -> int:
+        return self._num_days
+
+    def __getitem__(self, age: int) -> BtcAmount:
+        if not 0 <= age < self._num_days:
+            raise IndexError(f"card lives {self._num_days} days, no yield at age {age}")
+        if age < self._reserved_days:
+            return self._table.numeric.zero
+        # a card mines on day purchase_day + 1 + age
+        day = self._purchase_day + 1 + age
+        return self._last_day_amount if day == self._last_mining_day else self._table.daily_yield[day]
+
+
+class _ScheduledCumulativeYield(_ScheduledYields):
+
+    def __len__(self) -> int:
+        return self._num_days + 1
+
+    def __getitem__(self, age: int) -> BtcAmount:
+        if not 0 <= age <= self._num_days:
+            raise IndexError(f"card lives {self._num_days} days, no cumulative yield at age {age}")
+        if age <= self._reserved_days:
+            return self._table.numeric.zero
+        # mined from the first mining day through day purchase_day + age
+        first_mining_day = self._purchase_day + 1 + self._reserved_days
+        last_day = self._purchase_day + age
+        if last_day < self._last_mining_day:
+            return self._table.mined_between(first_day=first_mining_day, last_day=last_day)
+        return self._table.mined_between(first_day=first_mining_day, last_day=last_day - 1) + self._last_day_amount
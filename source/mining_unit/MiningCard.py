@@ -1,48 +1,73 @@
 from dataclasses import dataclass, field
 from decimal import Decimal
 
-from source.Constants import CARD_COST, CARD_MINES_BTC_PER_DAY, CARD_PROFIT_THRESHOLD
+from source.Constants import CARD_COST, CARD_MINES_BTC_PER_DAY, CARD_PROFIT_THRESHOLD, NUMERIC
+from source.SimulationConfig import SimulationConfig
 from source.mining_unit.MiningCardState import MiningCardState, Reserved, Active, Deactivated
+from source.utils.NumericBackend import NumericBackend, BtcAmount
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class MiningCard:
-    cost: Decimal = CARD_COST
-    mines_btc_per_day: Decimal = CARD_MINES_BTC_PER_DAY
+    cost: BtcAmount = CARD_COST
+    mines_btc_per_day: BtcAmount = CARD_MINES_BTC_PER_DAY
     state: MiningCardState = field(default_factory=lambda: Reserved(days_left=1))
     profit_threshold: Decimal = CARD_PROFIT_THRESHOLD
+    numeric: NumericBackend = NUMERIC
+
+    @classmethod
+    def from_config(cls, config: SimulationConfig) -> "MiningCard":
+        # newly bought card with the config's card parameters
+        return cls(
+            cost=config.card_cost,
+            mines_btc_per_day=config.card_mines_btc_per_day,
+            profit_threshold=config.card_profit_threshold,
+            numeric=config.numeric,
+        )
 
     def _handle_reserved_state(self, state: Reserved) -> None:
         # calculate number of days the card still needs to be in reserved state
         days_left = state.days_left - 1
         if days_left > 0:
             # still in reserved state period, but decrement amount of days
-            self.state = Reserved(days_left=days_left)
+            state.days_left = days_left
         else:
             # change state into active, mining starts next day
-            self.state = Active(mined_btc=Decimal("0"))
+            self.state = Active(mined_btc=self.numeric.zero)
 
-    def _handle_active_state(self, state: Active) -> Decimal:
-        # card's mining target -> when the target is reached the card will be deactivated
-        mined_btc_target = (Decimal("1") + (self.profit_threshold / Decimal("100"))) * self.cost
+    @property
+    def next_daily_mining_amount(self) -> BtcAmount:
+        # amount the card mines on its next day, without mining
+        if not isinstance(self.state, Active):
+            return self.numeric.zero
+        mined_btc_target = self.numeric.mining_target(cost=self.cost, profit_threshold=self.profit_threshold)
+        return self._amount_to_mine(state=self.state, mined_btc_target=mined_btc_target)
+
+    def _amount_to_mine(self, state: Active, mined_btc_target: BtcAmount) -> BtcAmount:
         # amount card can still mine
-        diff_to_mining_target = max(Decimal("0"), mined_btc_target - state.mined_btc)
+        diff_to_mining_target = max(self.numeric.zero, mined_btc_target - state.mined_btc)
+        # how much to mine today
+        return min(self.mines_btc_per_day, diff_to_mining_target)
+
+    def _handle_active_state(self, state: Active) -> BtcAmount:
+        # card's mining target -> when the target is reached the card will be deactivated
+        mined_btc_target = self.numeric.mining_target(cost=self.cost, profit_threshold=self.profit_threshold)
         # calculate how much to mine today
-        mined_today = min(self.mines_btc_per_day, diff_to_mining_target)
+        mined_today = self._amount_to_mine(state=state, mined_btc_target=mined_btc_target)
         # add today's mining to accumulated mining
         mined_btc = state.mined_btc + mined_today
         # update state
         if mined_btc < mined_btc_target:
-            self.state = Active(mined_btc=mined_btc)
+            state.mined_btc = mined_btc
         else:
             self.state = Deactivated()
         return mined_today
 
-    def get_daily_mining_amount(self) -> Decimal:
+    def get_daily_mining_amount(self) -> BtcAmount:
         match self.state:
             case Reserved(days_left=days) as reserved:
                 self._handle_reserved_state(state=reserved)
-                return Decimal("0")
+                return self.numeric.zero
             case Active(mined_btc=btc) as active:
                 mined_today = self._handle_active_state(state=active)
                 return mined_today
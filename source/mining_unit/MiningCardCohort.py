@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+
+from source.mining_unit.MiningCard import MiningCard
+from source.mining_unit.MiningCardState import Deactivated
+from source.utils.NumericBackend import BtcAmount
+
+
+@dataclass(eq=False, slots=True)
+class MiningCardCohort:
+    # card whose parameters and state are shared by every card in the cohort
+    card: MiningCard
+    # number of identical cards the cohort stands for
+    count: int = 1
+
+    @property
+    def is_deactivated(self) -> bool:
+        return isinstance(self.card.state, Deactivated)
+
+    def can_merge(self, mining_card: MiningCard) -> bool:
+        # cards with the same parameters and state follow the same trajectory from now on
+        card = self.card
+        return (
+                mining_card.cost == card.cost
+                and mining_card.mines_btc_per_day == card.mines_btc_per_day
+                and mining_card.profit_threshold == card.profit_threshold
+                and mining_card.numeric is card.numeric
+                and type(mining_card.state) is type(card.state)
+                and mining_card.state == card.state
+        )
+
+    def get_daily_mining_amount(self) -> BtcAmount:
+        # mine once with the shared card and scale by the number of cards in the cohort
+        return self.card.get_daily_mining_amount() * self.count
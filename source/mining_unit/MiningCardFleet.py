@@ -0,0 +1,257 @@
+from copy import copy
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from source.mining_unit.CardLifecycle import CardLifecycle
+from source.mining_unit.MiningCard import MiningCard
+from source.mining_unit.MiningCardCohort import MiningCardCohort
+from source.mining_unit.MiningCardState import Reserved, Active
+from source.mining_unit.ScheduledCardCohort import ScheduledCardCohort
+from source.mining_unit.YieldSchedule import YieldTable
+from source.utils.DayCalendar import DayCalendar
+from source.utils.NumericBackend import BtcAmount
+
+
+# Change of the fleet's running aggregates on a day scheduled cards activate, start their last day
+# or are deactivated.
+@dataclass(frozen=True, slots=True)
+class _RateChange:
+    # change of the amount mined per day at a constant yield (and on last days)
+    flat_rate: BtcAmount = 0
+    # change of the number of cards mining at a schedule's yield,
+    # keyed by the schedule and the offset of its days to the fleet's days
+    schedule: tuple[YieldTable, int] | None = None
+    scheduled_cards: int = 0
+    # change of the number of active cards
+    active_cards: int = 0
+
+
+# Cards with the same parameters and state are stored as a single cohort (shared card + count),
+# so mining, deactivation and capacity checks cost O(cohorts) instead of O(cards).
+# Newly bought cards are stored as scheduled cohorts (lifecycle + age). Their whole path is known when
+# they are added, so the days they activate, start their last day and are deactivated go into calendars,
+# and the fleet keeps running aggregates of the active cards and their daily rate that only change
+# on those days: a day without changes mines in O(1), however many cohorts the fleet holds.
+# The fleet still behaves like a collection of cards: len() counts cards,
+# iteration yields each cohort's card once per card it stands for.
+class MiningCardFleet:
+    def __init__(self, cards: Iterable[MiningCard] = ()):
+        # cohorts in the order they were added (dict keys as an ordered set)
+        self._cohorts: dict[MiningCardCohort | ScheduledCardCohort, None] = {}
+        self._last_cohort: MiningCardCohort | ScheduledCardCohort | None = None
+        self._num_cards = 0
+        # number of days the fleet has mined
+        self._day = 0
+        # ages of scheduled cohorts are brought up to date when the cohorts are looked at,
+        # until then they lag behind by the days mined since this day
+        self._ages_day = 0
+        # scheduled cohorts by the day after which they are deactivated
+        self._deactivation_calendar: DayCalendar[ScheduledCardCohort] = DayCalendar()
+        # aggregates of the scheduled cohorts for the next mining day and the days they change,
+        # int zero takes on the numeric type of the cards' amounts
+        self._flat_rate: BtcAmount = 0
+        self._scheduled_cards: dict[tuple[YieldTable, int], int] = {}
+        self._num_active_cards = 0
+        self._rate_changes: DayCalendar[_RateChange] = DayCalendar()
+        # number of aggregate changes applied so far
+        self.num_rate_changes = 0
+        # cohorts of cards that step their own state, checked every day
+        self._unscheduled: dict[MiningCardCohort, None] = {}
+        for card in cards:
+            self.add(card)
+
+    @property
+    def cohorts(self) -> dict[MiningCardCohort | ScheduledCardCohort, None]:
+        self._sync_ages()
+        return self._cohorts
+
+    def add(self, mining_card: MiningCard, num_cards: int = 1) -> None:
+        if num_cards <= 0:
+            return
+        # fold the card into the latest cohort if it follows the same trajectory,
+        # the cohort's card then represents it
+        last = self._last_cohort
+        if isinstance(last, MiningCardCohort) and last.can_merge(mining_card):
+            last.count += num_cards
+        else:
+            cohort = MiningCardCohort(card=mining_card, count=num_cards)
+            self._add_cohort(cohort=cohort)
+            self._unscheduled[cohort] = None
+        self._num_cards += num_cards
+
+    def add_scheduled(self, lifecycle: CardLifecycle, num_cards: int = 1, age: int = 0) -> None:
+        # add cards that follow the lifecycle, age is the number of days they already lived (0 when just bought)
+        if num_cards <= 0:
+            return
+        if age >= lifecycle.num_days:
+            raise ValueError(f"cards aged {age} days outlived their {lifecycle.num_days} day lifecycle")
+        # stored ages lag behind like the other cohorts' ages
+        lag = self._day - self._ages_day
+        last = self._last_cohort
+        if age == 0 and isinstance(last, ScheduledCardCohort) and last.can_merge(lifecycle, age=-lag):
+            last.count += num_cards
+        else:
+            cohort = ScheduledCardCohort(lifecycle=lifecycle, count=num_cards, age=age - lag)
+            self._add_cohort(cohort=cohort)
+            self._deactivation_calendar.schedule(self._day + lifecycle.num_days - age, cohort)
+        self._schedule_rate_changes(lifecycle=lifecycle, num_cards=num_cards, age=age)
+        self._num_cards += num_cards
+
+    def _schedule_rate_changes(self, lifecycle: CardLifecycle, num_cards: int, age: int) -> None:
+        # The cards mine nothing while reserved, then the lifecycle's yield up to their last day, which
+        # may mine less. Age x of the cards falls on fleet day first_day + x.
+        first_day = self._day - age
+        last_age = lifecycle.num_days - 1
+        if last_age < lifecycle.reserved_days:
+            # the lifecycle ends before the cards start mining
+            return
+        start = first_day + max(age, lifecycle.reserved_days)
+        end = first_day + last_age
+        table = lifecycle.yield_table
+        steady_rate, schedule, steady_cards = 0, None, 0
+        if start < end:
+            if table is None:
+                steady_rate = lifecycle.mines_btc_per_day * num_cards
+            else:
+                # on fleet day d the cards mine the schedule's yield of day purchase_day + 1 + (d - first_day)
+                schedule, steady_cards = (table, lifecycle.purchase_day + 1 - first_day), num_cards
+        last_day_amount = lifecycle.daily_yield[last_age] * num_cards
+        self._change_rate(day=start, change=_RateChange(
+            flat_rate=steady_rate, schedule=schedule, scheduled_cards=steady_cards, active_cards=num_cards,
+        ))
+        self._change_rate(day=end, change=_RateChange(
+            flat_rate=last_day_amount - steady_rate, schedule=schedule, scheduled_cards=-steady_cards,
+        ))
+        self._change_rate(day=end + 1, change=_RateChange(flat_rate=-last_day_amount, active_cards=-num_cards))
+
+    def _change_rate(self, day: int, change: _RateChange) -> None:
+        # changes due on the next mining day apply right away
+        if day == self._day:
+            self._apply_rate_change(change=change)
+        else:
+            self._rate_changes.schedule(day, change)
+
+    def _apply_rate_change(self, change: _RateChange) -> None:
+        self._flat_rate += change.flat_rate
+        if change.scheduled_cards:
+            num_cards = self._scheduled_cards.get(change.schedule, 0) + change.scheduled_cards
+            if num_cards:
+                self._scheduled_cards[change.schedule] = num_cards
+            else:
+                del self._scheduled_cards[change.schedule]
+        self._num_active_cards += change.active_cards
+        self.num_rate_changes += 1
+
+    def _sync_ages(self) -> None:
+        lag = self._day - self._ages_day
+        if lag:
+            for cohort in self._cohorts:
+                if isinstance(cohort, ScheduledCardCohort):
+                    cohort.age += lag
+            self._ages_day = self._day
+
+    def fork(self) -> "MiningCardFleet":
+        # independent copy, lifecycles are immutable and shared with the copy
+        fleet = MiningCardFleet()
+        for cohort in self.cohorts:
+            match cohort:
+                case ScheduledCardCohort(lifecycle=lifecycle, count=count, age=age):
+                    fleet.add_scheduled(lifecycle, num_cards=count, age=age)
+                case MiningCardCohort(card=card, count=count):
+                    # card states are updated in place, the copy gets its own
+                    card = copy(card)
+                    card.state = copy(card.state)
+                    fleet.add(card, num_cards=count)
+        return fleet
+
+    def _add_cohort(self, cohort: MiningCardCohort | ScheduledCardCohort) -> None:
+        self._cohorts[cohort] = None
+        self._last_cohort = cohort
+
+    def get_daily_mining_amount(self) -> BtcAmount:
+        # scheduled cohorts mine the running rate, stepped cohorts are mined one by one
+        day = self._day
+        mined_today = self._flat_rate
+        for (table, offset), num_cards in self._scheduled_cards.items():
+            mined_today += table.daily_yield[offset + day] * num_cards
+        for cohort in self._unscheduled:
+            mined_today += cohort.get_daily_mining_amount()
+        self._day = day = day + 1
+        # bring the aggregates to the next mining day
+        for change in self._rate_changes.pop(day):
+            self._apply_rate_change(change=change)
+        return mined_today
+
+    def remove_deactivated(self) -> None:
+        # scheduled cohorts due today and unscheduled cohorts whose card was deactivated
+        deactivated = self._deactivation_calendar.pop(self._day)
+        if self._unscheduled:
+            deactivated += [cohort for cohort in self._unscheduled if cohort.is_deactivated]
+        for cohort in deactivated:
+            del self._cohorts[cohort]
+            self._unscheduled.pop(cohort, None)
+            self._num_cards -= cohort.count
+            if cohort is self._last_cohort:
+                self._last_cohort = None
+
+    @property
+    def num_activating_cohorts(self) -> int:
+        # stepped cohorts whose card becomes active with the next mining day, the only state change
+        # that allocates a state: the others update the state in place or move to a shared singleton
+        return sum(
+            1 for cohort in self._unscheduled
+            if isinstance(cohort.card.state, Reserved) and cohort.card.state.days_left <= 1
+        )
+
+    @property
+    def num_cohorts(self) -> int:
+        return len(self._cohorts)
+
+    @property
+    def num_stepped_cohorts(self) -> int:
+        # cohorts mined one by one every day
+        return len(self._unscheduled)
+
+    @property
+    def num_stepped_cards(self) -> int:
+        # cards of the cohorts mined one by one
+        return sum(cohort.count for cohort in self._unscheduled)
+
+    @property
+    def num_active_cards(self) -> int:
+        # cards that mine on the next mining day
+        return self._num_active_cards + sum(
+            cohort.count for cohort in self._unscheduled if isinstance(cohort.card.state, Active)
+        )
+
+    @property
+    def daily_mining_rate(self) -> BtcAmount:
+        # amount the fleet mines on the next mining day
+        rate = self._flat_rate
+        for (table, offset), num_cards in self._scheduled_cards.items():
+            rate += table.daily_yield[offset + self._day] * num_cards
+        for cohort in self._unscheduled:
+            rate += cohort.card.next_daily_mining_amount * cohort.count
+        return rate
+
+    @property
+    def days_until_change(self) -> int | None:
+        # Mining days before cards activate, start their last day or are deactivated, None if none will.
+        # Stepped cohorts are only known a day ahead. Cards following a yield schedule mine
+        # a different amount every day, but change state on these days only.
+        if self._unscheduled:
+            return 1
+        day = self._rate_changes.next_day()
+        return None if day is None else day - self._day
+
+    def __len__(self) -> int:
+        return self._num_cards
+
+    def __contains__(self, mining_card: object) -> bool:
+        return any(cohort.card is mining_card for cohort in self._unscheduled)
+
+    def __iter__(self) -> Iterator[MiningCard]:
+        for cohort in self.cohorts:
+            card = cohort.card
+            for _ in range(cohort.count):
+                yield card
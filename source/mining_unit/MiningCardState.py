@@ -1,22 +1,37 @@
 from dataclasses import dataclass
-from decimal import Decimal
 
+from source.utils.NumericBackend import BtcAmount
 
+
+# States are slotted and owned by one card: counters are updated in place instead of allocating
+# a new state every day. Deactivated carries no data and is a shared singleton.
 class MiningCardState:
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class Reserved(MiningCardState):
     # track days to stay in reserved state
     days_left: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Active(MiningCardState):
     # track accumulated BTC the card has mined over its lifetime
-    mined_btc: Decimal
+    mined_btc: BtcAmount
 
 
 class Deactivated(MiningCardState):
-    pass
\ No newline at end of file
+    __slots__ = ()
+    _instance: "Deactivated | None" = None
+
+    def __new__(cls) -> "Deactivated":
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __repr__(self) -> str:
+        return "Deactivated()"
+
+    def __reduce__(self):
+        return Deactivated, ()
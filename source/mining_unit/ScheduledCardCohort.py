@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+
+from source.mining_unit.CardLifecycle import CardLifecycle
+from source.mining_unit.MiningCard import MiningCard
+from source.utils.NumericBackend import BtcAmount
+
+
+@dataclass(eq=False, slots=True)
+class ScheduledCardCohort:
+    # path shared by every card in the cohort
+    lifecycle: CardLifecycle
+    # number of identical cards the cohort stands for
+    count: int = 1
+    # days the cards have lived since they were bought
+    age: int = 0
+
+    @property
+    def card(self) -> MiningCard:
+        # snapshot of a card in the cohort, changing it does not affect the cohort
+        return self.lifecycle.card_at(age=self.age)
+
+    @property
+    def is_deactivated(self) -> bool:
+        return self.age >= self.lifecycle.num_days
+
+    def can_merge(self, lifecycle: CardLifecycle, age: int = 0) -> bool:
+        # cards on the same path and day of their life follow the same trajectory from now on
+        return lifecycle is self.lifecycle and self.age == age
+
+    def get_daily_mining_amount(self) -> BtcAmount:
+        if self.is_deactivated:
+            raise RuntimeError(f"Mine called on a card in state: {self.lifecycle.state_at(age=self.age)}")
+        # look up today's yield instead of stepping the card's state
+        mined_today = self.lifecycle.daily_yield[self.age] * self.count
+        self.age += 1
+        return mined_today
@@ -0,0 +1,114 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from decimal import Decimal
+from functools import cache
+from itertools import accumulate
+from typing import Iterable
+
+from source.utils.NumericBackend import NumericBackend, BtcAmount
+from source.utils.Rounding import round_btc
+
+
+# BTC a card mines on each simulation day (index = day), for yields that change with network difficulty
+# and halvings. Day 0 is the day the initial package is bought, no card mines on it.
+@dataclass(frozen=True)
+class YieldSchedule:
+    daily_yield: tuple[Decimal, ...]
+    # hash of the yields, computed once since configs holding a schedule are hashed by caches
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if len(self.daily_yield) < 2:
+            raise ValueError("yield schedule needs at least one mining day")
+        for day, daily_yield in enumerate(self.daily_yield):
+            if daily_yield <= 0:
+                raise ValueError(f"card yield must be positive, day {day} has {daily_yield}")
+        object.__setattr__(self, "_hash", hash(self.daily_yield))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    @classmethod
+    def of(cls, daily_yield: Iterable[Decimal]) -> "YieldSchedule":
+        return cls(daily_yield=tuple(Decimal(value) for value in daily_yield))
+
+    @classmethod
+    def decaying(
+            cls,
+            initial_yield: Decimal,
+            days: int,
+            daily_decay: Decimal = Decimal("0"),
+            halving_days: Iterable[int] = (),
+    ) -> "YieldSchedule":
+        # difficulty growth lowers the yield by daily_decay (a fraction) every day,
+        # each halving day halves it from that day on; yields are rounded to 1e-10 BTC
+        halving_days = sorted(halving_days)
+        factor = Decimal("1") - daily_decay
+        daily_yield = []
+        num_halvings = 0
+        for day in range(days + 1):
+            while num_halvings < len(halving_days) and halving_days[num_halvings] <= day:
+                num_halvings += 1
+            daily_yield.append(round_btc(initial_yield * factor ** day / 2 ** num_halvings))
+        return cls(daily_yield=tuple(daily_yield))
+
+    @property
+    def last_day(self) -> int:
+        return len(self.daily_yield) - 1
+
+
+# Daily and cumulative yields of a schedule in a numeric backend's representation.
+# Cumulative sums turn the amount mined over any range of days into one subtraction,
+# and since they never decrease, the day a card reaches an amount is found by bisection.
+@dataclass(frozen=True, eq=False)
+class YieldTable:
+    schedule: YieldSchedule
+    numeric: NumericBackend
+    # amount a card mines on each day (index = day)
+    daily_yield: tuple[BtcAmount, ...]
+    # amount a card mines from day 1 through each day (index = day)
+    cumulative_yield: tuple[BtcAmount, ...]
+
+    @property
+    def last_day(self) -> int:
+        return len(self.daily_yield) - 1
+
+    def __reduce__(self):
+        # tables are cached per schedule, unpickling returns the receiving process's own table
+        return yield_table, (self.schedule, self.numeric)
+
+    def mined_between(self, first_day: int, last_day: int) -> BtcAmount:
+        # amount a card mines from first_day through last_day
+        return self.cumulative_yield[last_day] - self.cumulative_yield[first_day - 1]
+
+    def reach_day(self, first_day: int, amount: BtcAmount) -> int:
+        # day on which a card mining from first_day has mined the amount, last_day + 1 if the schedule ends before
+        if first_day > self.last_day:
+            return self.last_day + 1
+        return bisect_left(self.cumulative_yield, self.cumulative_yield[first_day - 1] + amount, lo=first_day)
+
+    def num_mining_days(self, day: int, amount: BtcAmount) -> int:
+        # days a card mining from the next day needs to mine the amount,
+        # with a constant yield ceil(amount / yield) like SimulationConfig.card_num_mining_days
+        return self.reach_day(first_day=day + 1, amount=amount) - day
+
+    def min_days_left(self, expiry_day: int, card_cost: BtcAmount) -> int:
+        # A licence accepts a card bought on day t if days_left = expiry_day - t is above the days the card
+        # needs to mine its cost. The day the cost is reached never moves back for a later purchase,
+        # so the licence accepts cards up to some day and none after it. Find the first day it stops
+        # and express it as the days_left threshold Licence.can_add_mining_card compares against.
+        first_refused = bisect_left(
+            range(expiry_day), expiry_day,
+            key=lambda day: self.reach_day(first_day=day + 1, amount=card_cost),
+        )
+        return expiry_day - first_refused
+
+
+@cache
+def yield_table(schedule: YieldSchedule, numeric: NumericBackend) -> YieldTable:
+    daily_yield = tuple(numeric.from_decimal(value) for value in schedule.daily_yield)
+    # no card mines on day 0
+    cumulative_yield = tuple(accumulate(daily_yield[1:], initial=numeric.zero))
+    return YieldTable(
+        schedule=schedule, numeric=numeric, daily_yield=daily_yield, cumulative_yield=cumulative_yield,
+    )
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True, eq=False)
+class MonteCarloResult:
+    # one entry per price path
+    invested_btc: np.ndarray
+    final_btc: np.ndarray
+    # final BTC valued at the path's last price
+    final_usd: np.ndarray
+    # compound annual growth rate of the BTC amount
+    cagr: np.ndarray
+
+    def percentiles(self, q: tuple[float, ...] = (5, 25, 50, 75, 95)) -> dict[str, dict[float, float]]:
+        # summary of the distribution over paths
+        return {
+            name: dict(zip(q, np.percentile(values, q).tolist()))
+            for name, values in (("final_btc", self.final_btc), ("final_usd", self.final_usd), ("cagr", self.cagr))
+        }
@@ -0,0 +1,399 @@
+from decimal import Decimal
+
+import numpy as np
+
+from source.Constants import DEFAULT_CONFIG
+from source.SimulationConfig import SimulationConfig
+from source.licence.LicenceBuilder import LicenceType
+from source.montecarlo.MonteCarloResult import MonteCarloResult
+from source.series.DailySeries import DailySeries
+from source.utils.NumericBackend import BTC_QUANTUM_PLACES, DecimalBackend, FixedPointBackend
+from source.utils.Rounding import round_btc
+
+# days a licence bought today mines
+_LICENCE_DAYS = 365
+# events are scheduled at most a licence lifetime ahead, ring buffers cover that many days
+_HORIZON = 512
+# days between dropping expired licences from the arrays
+_COMPACT_EVERY = 32
+
+
+# Simulates many BTC price paths at once, pricing each day's purchases at the path's price of the day.
+# Cards all mine the same daily yield, so cohorts are scheduled at purchase and a path keeps only counts.
+class MonteCarloSimulator:
+
+    def __init__(
+            self,
+            package_type: LicenceType = LicenceType.PLATINUM,
+            package_num_cards: int = 10,
+            config: SimulationConfig = DEFAULT_CONFIG,
+    ):
+        # licence package bought every day while there is enough time for it to pay off
+        self.package_type = package_type
+        self.package_num_cards = package_num_cards
+        # USD prices and card parameters, the BTC price comes from the price paths
+        self.config = config
+        if not isinstance(config.numeric, (DecimalBackend, FixedPointBackend)):
+            raise ValueError(
+                f"{type(config.numeric).__name__} is not supported, use DecimalBackend or FixedPointBackend"
+            )
+        # the fixed-point backend keeps every amount in 1e-10 BTC and rounds mining targets to it
+        self._fixed_point = isinstance(config.numeric, FixedPointBackend)
+        # mining target = cost * target_numerator / target_denominator
+        self.target_numerator, self.target_denominator = (
+                (Decimal("100") + config.card_profit_threshold) / Decimal("100")
+        ).as_integer_ratio()
+        # smallest scale that keeps rounded costs, the daily yield and mining targets exact
+        extra_places = 0
+        while not self._fixed_point and (10 ** extra_places * self.target_numerator) % self.target_denominator:
+            extra_places += 1
+        places = BTC_QUANTUM_PLACES + extra_places
+        yield_places = max(0, -config.card_daily_yield.normalize().as_tuple().exponent)
+        self.places = max(places, yield_places)
+        # scale of the current simulation, a yield series can need more places
+        self._places = self.places
+
+    def _licence_terms(self, licence_type: LicenceType) -> (Decimal, int):
+        # USD price and max number of cards
+        match licence_type:
+            case LicenceType.PRIME:
+                return self.config.prime_licence_price, self.config.prime_max_num_cards
+            case LicenceType.PLATINUM:
+                return self.config.platinum_licence_price, self.config.platinum_max_num_cards
+            case _:
+                raise ValueError("unknown licence type")
+
+    def _to_units(self, usd: Decimal, prices: np.ndarray) -> np.ndarray:
+        # USD price in BTC rounded to 1e-10 BTC (half even), in units of 10^-places BTC
+        quotient = float(usd) / prices * 10.0 ** BTC_QUANTUM_PLACES
+        quanta = np.rint(quotient)
+        # the float quotient is off by a few ulps, which only matters next to a tie: round those like round_btc
+        near_tie = np.abs(np.abs(quotient - np.trunc(quotient)) - 0.5) <= 1e-12 * quotient
+        for index in np.flatnonzero(near_tie):
+            quanta[index] = round_btc(usd / Decimal(prices[index])).scaleb(BTC_QUANTUM_PLACES)
+        return quanta.astype(np.int64) * 10 ** (self._places - BTC_QUANTUM_PLACES)
+
+    def _mining_target(self, card_cost: np.ndarray) -> np.ndarray:
+        # cost * target_numerator / target_denominator, exact at the simulation's scale
+        # or rounded to 1e-10 BTC (half even) like the fixed-point backend does
+        target, remainder = np.divmod(card_cost * self.target_numerator, self.target_denominator)
+        if self._fixed_point:
+            twice = 2 * remainder
+            target += (twice > self.target_denominator) | ((twice == self.target_denominator) & (target % 2 == 1))
+        return target
+
+    def _to_btc(self, units: np.ndarray) -> np.ndarray:
+        # amounts in BTC, correctly rounded to float like float(Decimal) of the exact amount
+        return units / 10.0 ** self._places
+
+    def _card_num_mining_days(self, card_cost: np.ndarray, day: int) -> np.ndarray:
+        # days a card mining from the next day needs to mine back its cost,
+        # the yield table's number for a card bought on the day (ceil(cost / yield) for a constant yield)
+        cumulative = self._cumulative_yields
+        return np.searchsorted(cumulative, cumulative[day] + card_cost, side="left") - day
+
+    def _set_yields(self, yields: DailySeries | None, days: int) -> None:
+        # Daily yield per card in units of 10^-places BTC, from day 0 through the simulation's last day and
+        # as far after it as known, up to a licence lifetime: cards bought near the end are judged on it.
+        # A series passed in comes first, then the config's yield schedule, then its constant yield.
+        known_days = days + _HORIZON
+        if yields is not None:
+            if len(yields) < days + 1:
+                raise ValueError(f"yield series has {len(yields)} days, {days + 1} are needed")
+            self._places = max(self.places, yields.places)
+            daily = yields.to_numpy()[:known_days] * 10 ** (self._places - yields.places)
+        elif self.config.yield_schedule is not None:
+            schedule = self.config.yield_schedule.daily_yield
+            if len(schedule) < days + 1:
+                raise ValueError(f"yield schedule ends on day {len(schedule) - 1}, the simulation runs {days} days")
+            schedule = schedule[:known_days]
+            self._places = max(
+                self.places, max(-daily_yield.normalize().as_tuple().exponent for daily_yield in schedule)
+            )
+            daily = np.array([int(daily_yield.scaleb(self._places)) for daily_yield in schedule], dtype=np.int64)
+        else:
+            self._places = self.places
+            daily = np.full(known_days, int(self.config.card_daily_yield.scaleb(self._places)), dtype=np.int64)
+        if np.any(daily <= 0):
+            raise ValueError("yields must be positive")
+        if self._fixed_point and self._places > BTC_QUANTUM_PLACES:
+            raise ValueError(f"FixedPointBackend needs yields in multiples of 1e-{BTC_QUANTUM_PLACES} BTC")
+        self._yields = daily
+        # cumulative yield mined from day 1 through day d, then a day without yield after the known days,
+        # so cards bought on the last day have a mining start, and an entry any target reaches
+        cumulative = np.cumsum(daily[1:])
+        self._cumulative_yields = np.concatenate(
+            (np.zeros(1, dtype=np.int64), cumulative, cumulative[-1:], np.full(1, np.iinfo(np.int64).max // 2))
+        )
+
+    def simulate(
+            self,
+            prices: np.ndarray,
+            licence_type: LicenceType = LicenceType.PRIME,
+            num_cards: int = 14,
+            yields: DailySeries | None = None,
+    ) -> MonteCarloResult:
+        # prices has one row per path and one column per day, column 0 prices the initial package,
+        # yields gives every card's yield in BTC by day, otherwise the config's yield schedule or daily yield is used
+        prices = np.asarray(prices, dtype=float)
+        if prices.ndim != 2 or prices.shape[1] < 2:
+            raise ValueError("prices need one row per path and at least two days")
+        if np.any(prices <= 0):
+            raise ValueError("prices must be positive")
+        num_paths, days = prices.shape[0], prices.shape[1] - 1
+        self._set_yields(yields=yields, days=days)
+        self._reset(num_paths=num_paths)
+        # initial package bought on day 0
+        licence_price, max_num_cards = self._licence_terms(licence_type=licence_type)
+        if num_cards > max_num_cards:
+            raise ValueError(f"{licence_type.name} licence can only have {max_num_cards} cards")
+        card_cost = self._to_units(self.config.card_price, prices[:, 0])
+        if num_cards > 0 and np.any(self._card_num_mining_days(card_cost, day=0) >= _LICENCE_DAYS):
+            raise ValueError("initial cards can not pay off before the licence expires on some paths")
+        invested = self._to_units(licence_price, prices[:, 0]) + num_cards * card_cost
+        self._add_packages(
+            num_packages=np.ones(num_paths, dtype=np.int64), max_num_cards=max_num_cards,
+            num_cards=num_cards, card_cost=card_cost, day=0,
+        )
+        balance = self._run(prices=prices, balance=np.zeros(num_paths, dtype=np.int64))
+        invested_btc = self._to_btc(invested)
+        final_btc = self._to_btc(balance)
+        with np.errstate(divide="ignore"):
+            cagr = (final_btc / invested_btc) ** (365 / days) - 1
+        return MonteCarloResult(
+            invested_btc=invested_btc,
+            final_btc=final_btc,
+            final_usd=final_btc * prices[:, days],
+            cagr=cagr,
+        )
+
+    def _run(self, prices: np.ndarray, balance: np.ndarray) -> np.ndarray:
+        # daily policy from day 1 through the last day of the prices, starting from the licences added on day 0,
+        # return the final balance of every path
+        days = prices.shape[1] - 1
+        package_price, package_max_num_cards = self._licence_terms(licence_type=self.package_type)
+        num_mining_cards = np.zeros_like(balance)
+        for day in range(1, days + 1):
+            # mine
+            slot = day % _HORIZON
+            num_mining_cards += self._count_delta[:, slot]
+            balance += num_mining_cards * self._yields[day] + self._one_off[:, slot]
+            self._count_delta[:, slot] = 0
+            self._one_off[:, slot] = 0
+            # deactivated cards leave their licences
+            for paths, licence_ids, counts in self._frees.pop(day, []):
+                np.subtract.at(self._licence_num_cards, (paths, licence_ids - self._num_dropped[paths]), counts)
+            if day % _COMPACT_EVERY == 0:
+                self._compact(day=day)
+            price = prices[:, day]
+            card_cost = self._to_units(self.config.card_price, price)
+            card_num_mining_days = self._card_num_mining_days(card_cost, day=day)
+            # add new licences with cards if there is enough days left for licences to expire
+            if day <= days - _LICENCE_DAYS:
+                package_cost = self._to_units(package_price, price) + self.package_num_cards * card_cost
+                num_packages = balance // package_cost
+                if self.package_num_cards > 0:
+                    # package cards could not be added to the licence
+                    num_packages[card_num_mining_days >= _LICENCE_DAYS] = 0
+                if num_packages.any():
+                    balance -= num_packages * package_cost
+                    self._add_packages(
+                        num_packages=num_packages, max_num_cards=package_max_num_cards,
+                        num_cards=self.package_num_cards, card_cost=card_cost, day=day,
+                    )
+            # add new cards
+            balance -= self._add_new_cards(
+                num_cards=balance // card_cost, card_cost=card_cost, card_num_mining_days=card_num_mining_days, day=day,
+            ) * card_cost
+        return balance
+
+    def _reset(self, num_paths: int) -> None:
+        # licences of each path in purchase order, unused columns have last mining day -1
+        self._licence_last_day = np.full((num_paths, 8), -1, dtype=np.int64)
+        self._licence_max_num_cards = np.zeros((num_paths, 8), dtype=np.int64)
+        self._licence_num_cards = np.zeros((num_paths, 8), dtype=np.int64)
+        self._num_licences = np.zeros(num_paths, dtype=np.int64)
+        # expired licences dropped from the front of each path's columns, a licence's id is its column plus
+        # the number of licences dropped when the id was taken
+        self._num_dropped = np.zeros(num_paths, dtype=np.int64)
+        # changes to the number of mining cards and one-off amounts by day modulo _HORIZON
+        self._count_delta = np.zeros((num_paths, _HORIZON), dtype=np.int64)
+        self._one_off = np.zeros((num_paths, _HORIZON), dtype=np.int64)
+        # cards leaving licences by day: (paths, licence ids, counts)
+        self._frees: dict[int, list[(np.ndarray, np.ndarray, np.ndarray)]] = {}
+
+    def _add_packages(
+            self,
+            num_packages: np.ndarray,
+            max_num_cards: int,
+            num_cards: int,
+            card_cost: np.ndarray,
+            day: int,
+    ) -> None:
+        # append num_packages[path] licences to each path, every licence gets num_cards new cards
+        paths = np.repeat(np.arange(len(num_packages)), num_packages)
+        first = np.cumsum(num_packages) - num_packages
+        self._ensure_columns(needed=int((self._num_licences + num_packages).max()), day=day)
+        # new licences follow the path's existing licences
+        columns = self._num_licences[paths] + np.arange(len(paths)) - np.repeat(first, num_packages)
+        self._licence_last_day[paths, columns] = day + _LICENCE_DAYS
+        self._licence_max_num_cards[paths, columns] = max_num_cards
+        self._licence_num_cards[paths, columns] = 0
+        self._num_licences += num_packages
+        if num_cards > 0:
+            self._add_cohorts(
+                paths=paths, columns=columns, counts=np.full(len(paths), num_cards, dtype=np.int64),
+                card_cost=card_cost, day=day,
+            )
+
+    def _ensure_columns(self, needed: int, day: int) -> None:
+        if needed <= self._licence_last_day.shape[1]:
+            return
+        # drop expired licences first, they hold no pending events
+        self._compact(day=day)
+        width = self._licence_last_day.shape[1]
+        if needed <= width:
+            return
+        new_width = max(needed, 2 * width)
+        grow = new_width - width
+        num_paths = self._licence_last_day.shape[0]
+        self._licence_last_day = np.hstack((self._licence_last_day, np.full((num_paths, grow), -1, dtype=np.int64)))
+        self._licence_max_num_cards = np.hstack((self._licence_max_num_cards, np.zeros((num_paths, grow), np.int64)))
+        self._licence_num_cards = np.hstack((self._licence_num_cards, np.zeros((num_paths, grow), np.int64)))
+
+    def _compact(self, day: int) -> None:
+        # Licences expire in purchase order, so each path's expired licences are the first columns.
+        # Shift the live licences to the front, expired licences hold no pending events.
+        # Pending events refer to licences by id, which stays valid.
+        num_paths, width = self._licence_last_day.shape
+        in_use = np.arange(width) < self._num_licences[:, None]
+        num_expired = np.count_nonzero(in_use & (self._licence_last_day <= day), axis=1)
+        if not num_expired.any():
+            return
+        source = np.minimum(np.arange(width) + num_expired[:, None], width - 1)
+        moved = np.arange(width) < (self._num_licences - num_expired)[:, None]
+        self._licence_last_day = np.where(moved, np.take_along_axis(self._licence_last_day, source, axis=1), -1)
+        self._licence_max_num_cards = np.take_along_axis(self._licence_max_num_cards, source, axis=1)
+        self._licence_num_cards = np.where(moved, np.take_along_axis(self._licence_num_cards, source, axis=1), 0)
+        self._num_licences -= num_expired
+        self._num_dropped += num_expired
+
+    def _add_cohorts(
+            self,
+            paths: np.ndarray,
+            columns: np.ndarray,
+            counts: np.ndarray,
+            card_cost: np.ndarray,
+            day: int,
+    ) -> None:
+        # schedule the whole life of cards bought today, one cohort per (path, licence)
+        self._licence_num_cards[paths, columns] += counts
+        target = self._mining_target(card_cost[paths])
+        first_mining_day = day + 2
+        # a card reaches its target on the first day its cumulative yield covers it, the amount mined
+        # on that day is partial unless the day's yield is needed in full
+        mined_before = self._cumulative_yields[first_mining_day - 1]
+        last_mining_day = np.searchsorted(self._cumulative_yields, mined_before + target, side="left")
+        last_day_amount = mined_before + target - self._cumulative_yields[last_mining_day - 1]
+        last_day_amount[self._cumulative_yields[last_mining_day] == mined_before + target] = 0
+        licence_last_day = self._licence_last_day[paths, columns]
+        # cards of licences that expire before they start mining never mine
+        mining = first_mining_day <= licence_last_day
+        paths, columns, counts = paths[mining], columns[mining], counts[mining]
+        last_mining_day, last_day_amount = last_mining_day[mining], last_day_amount[mining]
+        licence_last_day = licence_last_day[mining]
+        np.add.at(self._count_delta, (paths, np.full(len(paths), first_mining_day % _HORIZON)), counts)
+        # licence expiry stops cards that have not reached their target
+        stopped = last_mining_day > licence_last_day
+        partial = ~stopped & (last_day_amount > 0)
+        stop_day = np.where(stopped, licence_last_day + 1, np.where(partial, last_mining_day, last_mining_day + 1))
+        np.add.at(self._count_delta, (paths, stop_day % _HORIZON), -counts)
+        np.add.at(self._one_off, (paths[partial], last_mining_day[partial] % _HORIZON),
+                  (counts * last_day_amount)[partial])
+        # deactivated cards leave the licence after mining on their last day
+        deactivated = ~stopped
+        for free_day in np.unique(last_mining_day[deactivated]):
+            due = deactivated & (last_mining_day == free_day)
+            self._frees.setdefault(int(free_day), []).append(
+                (paths[due], columns[due] + self._num_dropped[paths[due]], counts[due])
+            )
+
+    def _add_new_cards(
+            self,
+            num_cards: np.ndarray,
+            card_cost: np.ndarray,
+            card_num_mining_days: np.ndarray,
+            day: int,
+    ) -> np.ndarray:
+        # distribute cards like User.add_new_cards, return number of cards added per path
+        num_cards_added = np.zeros_like(num_cards)
+        # only paths that can afford a card, grouped by how many licences they have,
+        # so a few paths with many licences do not widen the arrays of all others
+        buying = np.flatnonzero(num_cards > 0)
+        width_class = np.ceil(np.log2(np.maximum(self._num_licences[buying], 1))).astype(np.int64)
+        for group in np.unique(width_class):
+            paths = buying[width_class == group]
+            num_cards_added[paths] = self._add_new_cards_to(
+                paths=paths, num_cards=num_cards[paths], card_cost=card_cost,
+                card_num_mining_days=card_num_mining_days, day=day,
+            )
+        return num_cards_added
+
+    def _add_new_cards_to(
+            self,
+            paths: np.ndarray,
+            num_cards: np.ndarray,
+            card_cost: np.ndarray,
+            card_num_mining_days: np.ndarray,
+            day: int,
+    ) -> np.ndarray:
+        # distribute cards on paths that have a similar number of licences, return number of cards added per path
+        width = int(self._num_licences[paths].max())
+        licence_last_day = self._licence_last_day[paths, :width]
+        accepting = (
+                (np.arange(width) < self._num_licences[paths, None])
+                & (licence_last_day - day > card_num_mining_days[paths, None])
+        )
+        capacity = np.where(
+            accepting, self._licence_max_num_cards[paths, :width] - self._licence_num_cards[paths, :width], 0
+        )
+        num_cards = np.minimum(num_cards, capacity.sum(axis=1))
+        if not num_cards.any():
+            return num_cards
+        allocation = self._fill(capacity=capacity, num_cards=num_cards, licence_last_day=licence_last_day)
+        rows, columns = np.nonzero(allocation)
+        self._add_cohorts(
+            paths=paths[rows], columns=columns, counts=allocation[rows, columns], card_cost=card_cost, day=day,
+        )
+        return num_cards
+
+    @staticmethod
+    def _fill(capacity: np.ndarray, num_cards: np.ndarray, licence_last_day: np.ndarray) -> np.ndarray:
+        # Adding cards one by one to the licence with the largest remaining capacity lowers the
+        # largest capacities to a common level: the smallest level the cards can reach on each path.
+        # Capacities are small, so count licences per capacity and evaluate every level at once:
+        # cards needed for level L = sum over capacities c > L of (c - L) * count[c]
+        num_paths = len(num_cards)
+        num_levels = int(capacity.max()) + 1
+        counts = np.bincount(
+            (np.arange(num_paths)[:, None] * num_levels + capacity).ravel(), minlength=num_paths * num_levels
+        ).reshape(num_paths, num_levels)
+        levels = np.arange(num_levels)
+        # licences and their total capacity above each level
+        above = np.cumsum(counts[:, ::-1], axis=1)[:, ::-1] - counts
+        capacity_above = np.cumsum((counts * levels)[:, ::-1], axis=1)[:, ::-1] - counts * levels
+        needed = capacity_above - levels * above
+        level = np.argmax(needed <= num_cards[:, None], axis=1)[:, None]
+        allocation = np.maximum(capacity - level, 0)
+        # leftover cards go one each to licences at the level with the most days left, then bought first
+        leftover = num_cards - allocation.sum(axis=1)
+        rows = np.flatnonzero(leftover > 0)
+        if len(rows) == 0:
+            return allocation
+        width = capacity.shape[1]
+        at_level = (capacity[rows] >= level[rows]) & (level[rows] > 0)
+        key = np.where(at_level, -licence_last_day[rows] * width + np.arange(width), np.iinfo(np.int64).max)
+        order = np.argsort(key, axis=1, kind="stable")
+        chosen = np.arange(width) < leftover[rows, None]
+        allocation[rows[:, None], order] += chosen
+        return allocation
@@ -0,0 +1,64 @@
+import numpy as np
+
+from source.series.DailySeries import DailySeries
+
+# Seeded BTC price paths in USD, shape (num_paths, days + 1): column 0 is the price on the day the
+# initial package is bought, column d the price on simulation day d.
+
+
+def constant_price_paths(price: float, days: int, num_paths: int = 1) -> np.ndarray:
+    return np.full((num_paths, days + 1), float(price))
+
+
+def gbm_price_paths(
+        initial_price: float,
+        drift: float,
+        volatility: float,
+        days: int,
+        num_paths: int,
+        seed: int,
+) -> np.ndarray:
+    # geometric Brownian motion, drift and volatility are annual
+    rng = np.random.default_rng(seed)
+    dt = 1 / 365
+    log_returns = rng.normal(
+        loc=(drift - volatility ** 2 / 2) * dt, scale=volatility * np.sqrt(dt), size=(num_paths, days)
+    )
+    return _from_log_returns(initial_price=initial_price, log_returns=log_returns)
+
+
+def bootstrap_price_paths(
+        history: np.ndarray,
+        initial_price: float,
+        days: int,
+        num_paths: int,
+        seed: int,
+) -> np.ndarray:
+    # daily returns drawn with replacement from a historical daily price series
+    history = np.asarray(history, dtype=float)
+    if len(history) < 2 or np.any(history <= 0):
+        raise ValueError("price history needs at least two positive prices")
+    rng = np.random.default_rng(seed)
+    historical_log_returns = np.diff(np.log(history))
+    log_returns = rng.choice(historical_log_returns, size=(num_paths, days), replace=True)
+    return _from_log_returns(initial_price=initial_price, log_returns=log_returns)
+
+
+def historical_price_paths(series: DailySeries, days: int, start_days) -> np.ndarray:
+    # one path per start day, each replaying the series from that day on
+    start_days = np.asarray(start_days, dtype=np.int64)
+    if np.any(start_days < 0) or np.any(start_days + days >= len(series)):
+        raise ValueError(f"price series has {len(series)} days, windows of {days + 1} days do not fit")
+    prices = series.to_numpy()
+    windows = prices[start_days[:, None] + np.arange(days + 1)]
+    if np.any(windows <= 0):
+        raise ValueError("prices must be positive")
+    return windows * 10.0 ** -series.places
+
+
+def _from_log_returns(initial_price: float, log_returns: np.ndarray) -> np.ndarray:
+    if initial_price <= 0:
+        raise ValueError(f"initial price must be positive, got {initial_price}")
+    num_paths = log_returns.shape[0]
+    cumulative = np.concatenate((np.zeros((num_paths, 1)), np.cumsum(log_returns, axis=1)), axis=1)
+    return initial_price * np.exp(cumulative)
@@ -0,0 +1,24 @@
+from decimal import Decimal
+
+from source.output.DayRecord import DayRecord
+from source.output.OutputSink import OutputSink
+
+
+# Keeps every record in memory, one list per field.
+class ColumnarRecorder(OutputSink):
+
+    def __init__(self):
+        self.days: list[int] = []
+        self.btc_amounts: list[Decimal] = []
+        self.num_cards_added: list[int] = []
+
+    def record(self, day_record: DayRecord) -> None:
+        self.days.append(day_record.day)
+        self.btc_amounts.append(day_record.btc_amount)
+        self.num_cards_added.append(day_record.num_cards_added)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def columns(self) -> dict[str, list]:
+        return {"day": self.days, "btc_amount": self.btc_amounts, "num_cards_added": self.num_cards_added}
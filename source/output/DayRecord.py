@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+
+@dataclass(frozen=True)
+class DayRecord:
+    day: int
+    # user's BTC balance at the end of the day
+    btc_amount: Decimal
+    # number of cards bought that day
+    num_cards_added: int
@@ -0,0 +1,62 @@
+import csv
+import json
+from abc import abstractmethod
+from typing import TextIO
+
+from source.output.DayRecord import DayRecord
+from source.output.OutputSink import OutputSink
+
+_FIELDS = ["day", "btc_amount", "num_cards_added"]
+
+
+# Collects records and writes them to a text file in batches.
+# The file is owned by the caller, close() flushes the sink but leaves the file open.
+class BufferedFileSink(OutputSink):
+
+    def __init__(self, file: TextIO, batch_size: int = 1024):
+        if batch_size < 1:
+            raise ValueError(f"batch size must be at least 1, got {batch_size}")
+        self.file = file
+        self.batch_size = batch_size
+        self._records: list[DayRecord] = []
+
+    def record(self, day_record: DayRecord) -> None:
+        self._records.append(day_record)
+        if len(self._records) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._records:
+            return
+        self._write(records=self._records)
+        self._records.clear()
+
+    @abstractmethod
+    def _write(self, records: list[DayRecord]) -> None:
+        ...
+
+
+class CsvSink(BufferedFileSink):
+
+    def __init__(self, file: TextIO, batch_size: int = 1024):
+        super().__init__(file=file, batch_size=batch_size)
+        self._writer = csv.writer(file)
+        self._header_written = False
+
+    def _write(self, records: list[DayRecord]) -> None:
+        if not self._header_written:
+            self._writer.writerow(_FIELDS)
+            self._header_written = True
+        self._writer.writerows((record.day, record.btc_amount, record.num_cards_added) for record in records)
+
+
+class NdjsonSink(BufferedFileSink):
+    # one JSON object per line, BTC amounts are strings to keep them exact
+
+    def _write(self, records: list[DayRecord]) -> None:
+        self.file.write("".join(
+            json.dumps({
+                "day": record.day, "btc_amount": str(record.btc_amount), "num_cards_added": record.num_cards_added,
+            }) + "\n"
+            for record in records
+        ))
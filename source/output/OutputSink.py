@@ -0,0 +1,52 @@
+from abc import ABC, abstractmethod
+from decimal import Decimal
+
+from source.output.DayRecord import DayRecord
+
+
+# Receives a record for every simulated day.
+# Simulators only build records for sinks that are listening, so a NullSink costs nothing per day.
+class OutputSink(ABC):
+    listening = True
+
+    @abstractmethod
+    def record(self, day_record: DayRecord) -> None:
+        ...
+
+    def flush(self) -> None:
+        # write out buffered records, called at the end of every simulation
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+
+class NullSink(OutputSink):
+    listening = False
+
+    def record(self, day_record: DayRecord) -> None:
+        pass
+
+
+class PrintSink(OutputSink):
+    # prints the daily progress, BTC amounts are shown in USD
+
+    def __init__(self, btc_price: Decimal, batch_size: int = 1024):
+        self.btc_price = btc_price
+        self.batch_size = batch_size
+        self._records: list[DayRecord] = []
+
+    def record(self, day_record: DayRecord) -> None:
+        self._records.append(day_record)
+        if len(self._records) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._records:
+            return
+        print("\n".join(
+            f"day: {record.day}, BTC value: ${(record.btc_amount * self.btc_price):.2f}, "
+            f"number of cards added: {record.num_cards_added}"
+            for record in self._records
+        ))
+        self._records.clear()
@@ -0,0 +1,71 @@
+from dataclasses import dataclass, field
+from enum import Enum
+
+
+class Phase(Enum):
+    MINING = "mining"
+    EXPIRED_LICENCE_REMOVAL = "expired licence removal"
+    LICENCE_PURCHASE = "licence purchase"
+    CARD_PURCHASE = "card purchase"
+
+
+# Time per phase of the daily loop and counters of the work done, collected while a Simulator
+# (or a User) has stats attached. Nothing is recorded, or checked beyond once per day, without them.
+@dataclass(eq=False)
+class SimulationStats:
+    # cumulative seconds per phase
+    phase_seconds: dict[Phase, float] = field(default_factory=lambda: dict.fromkeys(Phase, 0.0))
+    # days mined
+    days: int = 0
+    # licences that mined, summed over days
+    licences_mined: int = 0
+    # card cohorts mined one by one and their cards, summed over days
+    cohorts_touched: int = 0
+    cards_touched: int = 0
+    # changes of the licences' running mining rates, a day without one mines in O(1) per licence
+    rate_changes: int = 0
+    # state objects created by mining, only stepped cards that become active allocate one
+    states_allocated: int = 0
+    # licences looked at to find the one with the largest remaining capacity when adding cards
+    licences_scanned: int = 0
+    cards_deactivated: int = 0
+    licences_expired: int = 0
+
+    def add_time(self, phase: Phase, seconds: float) -> None:
+        self.phase_seconds[phase] += seconds
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.phase_seconds.values())
+
+    def as_dict(self) -> dict:
+        values = {f"{phase.name.lower()}_seconds": seconds for phase, seconds in self.phase_seconds.items()}
+        values.update(
+            days=self.days,
+            licences_mined=self.licences_mined,
+            cohorts_touched=self.cohorts_touched,
+            cards_touched=self.cards_touched,
+            rate_changes=self.rate_changes,
+            states_allocated=self.states_allocated,
+            licences_scanned=self.licences_scanned,
+            cards_deactivated=self.cards_deactivated,
+            licences_expired=self.licences_expired,
+        )
+        return values
+
+    def report(self) -> str:
+        total = self.total_seconds
+        days = max(self.days, 1)
+        lines = [f"{'phase':<26}{'seconds':>10}{'share':>8}{'us/day':>10}"]
+        for phase, seconds in self.phase_seconds.items():
+            share = seconds / total if total > 0 else 0.0
+            lines.append(f"{phase.value:<26}{seconds:>10.4f}{share:>8.1%}{seconds / days * 1e6:>10.1f}")
+        lines.append(f"{'total':<26}{total:>10.4f}")
+        lines.append("")
+        lines.append(f"{'counter':<26}{'total':>14}{'per day':>12}")
+        for name, value in self.as_dict().items():
+            if name.endswith("_seconds") or name == "days":
+                continue
+            lines.append(f"{name.replace('_', ' '):<26}{value:>14}{value / days:>12.1f}")
+        lines.append(f"{'days':<26}{self.days:>14}")
+        return "\n".join(lines)
@@ -0,0 +1,87 @@
+import csv
+import mmap
+import struct
+from decimal import Decimal
+from typing import Iterable
+
+try:
+    import numpy as np
+except ImportError:
+    # to_numpy needs numpy, the series itself does not
+    np = None
+
+# Daily values stored as fixed point integers in a binary file that is memory-mapped, not loaded:
+# values are read by day index, and processes that open the same file share its pages.
+# Layout (little endian): magic, version, decimal places, number of days, then one int64 per day.
+MAGIC = b"MRDS"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHQ")
+
+
+class DailySeries:
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"{path} is not a daily series")
+        magic, version, self.places, self._num_days = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a daily series")
+        if version != VERSION:
+            raise ValueError(f"unsupported daily series version {version}, expected {VERSION}")
+        if len(self._mmap) != _HEADER.size + 8 * self._num_days:
+            raise ValueError(f"{path} is truncated")
+        # int64 view of the values, no copy
+        self.raw = memoryview(self._mmap)[_HEADER.size:].cast("q")
+
+    @staticmethod
+    def write(path: str, values: Iterable[Decimal], places: int) -> "DailySeries":
+        # store values with the given number of decimal places, values with more places are rejected
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(MAGIC, VERSION, places, 0))
+            num_days = 0
+            chunk = []
+            for value in values:
+                units = Decimal(value).scaleb(places)
+                if units != units.to_integral_value():
+                    raise ValueError(f"{value} has more than {places} decimal places")
+                chunk.append(int(units))
+                if len(chunk) == 4096:
+                    file.write(struct.pack(f"<{len(chunk)}q", *chunk))
+                    num_days += len(chunk)
+                    chunk.clear()
+            file.write(struct.pack(f"<{len(chunk)}q", *chunk))
+            num_days += len(chunk)
+            # number of days is known once every value is written
+            file.seek(0)
+            file.write(_HEADER.pack(MAGIC, VERSION, places, num_days))
+        return DailySeries(path)
+
+    @staticmethod
+    def from_csv(csv_path: str, path: str, column: str, places: int) -> "DailySeries":
+        # convert one column of a CSV file with a header row, one row per day, streaming row by row
+        with open(csv_path, newline="", encoding="utf-8") as file:
+            return DailySeries.write(path=path, values=(row[column] for row in csv.DictReader(file)), places=places)
+
+    def __len__(self) -> int:
+        return self._num_days
+
+    def __getitem__(self, day: int) -> Decimal:
+        return Decimal(self.raw[day]).scaleb(-self.places)
+
+    def to_numpy(self) -> "np.ndarray":
+        # read-only int64 array backed by the mapped file, it keeps the mapping open while it is alive
+        if np is None:
+            raise ImportError("DailySeries.to_numpy needs numpy")
+        return np.frombuffer(self._mmap, dtype="<i8", count=self._num_days, offset=_HEADER.size)
+
+    def close(self) -> None:
+        # raises BufferError while arrays from to_numpy are alive, copy them to keep values past close
+        self.raw.release()
+        self._mmap.close()
+
+    def __reduce__(self):
+        # processes receive the path and map the file themselves
+        return DailySeries, (self.path,)
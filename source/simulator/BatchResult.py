@@ -0,0 +1,47 @@
+import csv
+from dataclasses import dataclass
+from typing import TextIO
+
+import numpy as np
+
+from source.licence.LicenceBuilder import LicenceType
+
+
+@dataclass(frozen=True, eq=False)
+class BatchResult:
+    # one entry per user, in the order of the initial packages
+    licence_type: tuple[LicenceType, ...]
+    num_cards: np.ndarray
+    invested_btc: np.ndarray
+    final_btc: np.ndarray
+    # compound annual growth rate of the BTC amount
+    cagr: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.licence_type)
+
+    def as_rows(self) -> list[dict]:
+        # flat rows: user index and initial package followed by results
+        return [
+            dict(
+                user=user,
+                licence_type=licence_type.name,
+                num_cards=num_cards,
+                invested_btc=invested_btc,
+                final_btc=final_btc,
+                cagr=cagr,
+            )
+            for user, (licence_type, num_cards, invested_btc, final_btc, cagr) in enumerate(zip(
+                self.licence_type, self.num_cards.tolist(), self.invested_btc.tolist(),
+                self.final_btc.tolist(), self.cagr.tolist(),
+            ))
+        ]
+
+    def write_csv(self, file: TextIO) -> None:
+        # one row per user
+        rows = self.as_rows()
+        if not rows:
+            return
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
@@ -0,0 +1,83 @@
+from typing import Sequence
+
+import numpy as np
+
+from source.Constants import DEFAULT_CONFIG
+from source.SimulationConfig import SimulationConfig
+from source.licence.LicenceBuilder import LicenceBuilder, LicenceType
+from source.montecarlo.MonteCarloSimulator import MonteCarloSimulator
+from source.simulator.BatchResult import BatchResult
+from source.utils.Rounding import round_btc
+
+
+# Monte Carlo arrays with one row per user at the config's BTC price. Every user starts from its own
+# package, the daily policy then runs on all rows at once.
+class _UserRows(MonteCarloSimulator):
+
+    def _to_units(self, usd, prices: np.ndarray) -> np.ndarray:
+        # every row is priced at the config's BTC price, convert like SimulationConfig does
+        units = int(round_btc(usd / self.config.btc_price).scaleb(self._places))
+        return np.full(len(prices), units, dtype=np.int64)
+
+    def simulate_packages(self, packages: Sequence[LicenceBuilder], days: int) -> (np.ndarray, np.ndarray):
+        # invested and final BTC per user
+        num_users = len(packages)
+        self._set_yields(yields=None, days=days)
+        self._reset(num_paths=num_users)
+        # the price only sets the number of rows, the view takes no memory per day
+        prices = np.broadcast_to(float(self.config.btc_price), (num_users, days + 1))
+        card_cost = self._to_units(self.config.card_price, prices[:, 0])
+        invested = np.zeros(num_users, dtype=np.int64)
+        # users with the same package are added together, each user gets one licence
+        groups: dict[(LicenceType, int), list[int]] = {}
+        for user, package in enumerate(packages):
+            groups.setdefault((package.licence_type, package.num_cards), []).append(user)
+        for (licence_type, num_cards), users in groups.items():
+            licence_price, max_num_cards = self._licence_terms(licence_type=licence_type)
+            in_group = np.zeros(num_users, dtype=np.int64)
+            in_group[users] = 1
+            invested[users] = self._to_units(licence_price, prices[users, 0]) + num_cards * card_cost[users]
+            self._add_packages(
+                num_packages=in_group, max_num_cards=max_num_cards, num_cards=num_cards, card_cost=card_cost, day=0,
+            )
+        balance = self._run(prices=prices, balance=np.zeros(num_users, dtype=np.int64))
+        return self._to_btc(invested), self._to_btc(balance)
+
+
+# Simulates many users, each from its own initial package with no BTC, as rows of one Monte Carlo run
+# at the config's BTC price; each result is Simulator's under the config's backend, rounded to float.
+class BatchSimulator:
+
+    def __init__(
+            self,
+            package_type: LicenceType = LicenceType.PLATINUM,
+            package_num_cards: int = 10,
+            config: SimulationConfig = DEFAULT_CONFIG,
+    ):
+        self.package_type = package_type
+        self.package_num_cards = package_num_cards
+        self.config = config
+
+    def simulate(self, packages: Sequence[LicenceBuilder], days: int) -> BatchResult:
+        # packages holds one initial package per user, bought on day 0
+        if days < 1:
+            raise ValueError(f"days must be at least 1, got {days}")
+        for package in packages:
+            if package.config != self.config:
+                raise ValueError("packages must be built with the simulator's config")
+            if package.day != 0:
+                raise ValueError("initial packages are bought on day 0")
+            if not package.cards_fit:
+                raise ValueError("initial cards can not pay off before the licence expires")
+        licence_type = tuple(package.licence_type for package in packages)
+        num_cards = np.array([package.num_cards for package in packages], dtype=np.int64)
+        if not packages:
+            empty = np.zeros(0)
+            return BatchResult(licence_type=(), num_cards=num_cards, invested_btc=empty, final_btc=empty, cagr=empty)
+        rows = _UserRows(package_type=self.package_type, package_num_cards=self.package_num_cards, config=self.config)
+        invested_btc, final_btc = rows.simulate_packages(packages=packages, days=days)
+        with np.errstate(divide="ignore"):
+            cagr = (final_btc / invested_btc) ** (365 / days) - 1
+        return BatchResult(
+            licence_type=licence_type, num_cards=num_cards, invested_btc=invested_btc, final_btc=final_btc, cagr=cagr,
+        )
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+
+@dataclass(frozen=True)
+class DaySnapshot:
+    day: int
+    # user's BTC balance at the end of the day
+    btc_amount: Decimal
+    # cards that mine on the next day
+    num_active_cards: int
+    num_cards_added: int
+    num_licences_added: int
+    num_licences_expired: int
@@ -0,0 +1,272 @@
+import heapq
+from dataclasses import dataclass
+from enum import Enum
+
+from source.Constants import DEFAULT_CONFIG
+from source.SimulationConfig import SimulationConfig
+from source.licence.LicenceBuilder import LicenceType, LicenceBuilder
+from source.licence.LicenceState import Valid
+from source.mining_unit.MiningCard import MiningCard
+from source.mining_unit.MiningCardState import Reserved, Active
+from source.user.LicenceCapacityIndex import LicenceCapacityIndex
+from source.user.User import User
+from source.utils.NumericBackend import BtcAmount
+
+
+class _EventKind(Enum):
+    # daily mined amount changes, with an optional one-off amount mined that day
+    RATE_CHANGE = 1
+    # deactivated cards leave their licence
+    FREE_CAPACITY = 2
+    # licence has too few days left to accept cards
+    STOP_ACCEPTING = 3
+
+
+@dataclass(eq=False)
+class _EventLicence:
+    max_num_cards: int
+    num_cards: int
+    # last day the licence mines, it expires at the end of this day
+    last_mining_day: int
+    # first day the licence has too few days left to accept a card
+    stop_accepting_day: int
+
+
+# Accepting licences by remaining capacity, then most days left, then the order they were added in,
+# like User's index. Licences leave the index when they stop accepting cards.
+class _AcceptingIndex(LicenceCapacityIndex):
+
+    def _accepts(self, licence: _EventLicence) -> bool:
+        return licence.num_cards < licence.max_num_cards
+
+    def _capacity(self, licence: _EventLicence) -> int:
+        return licence.max_num_cards - licence.num_cards
+
+    def _expiry_day(self, licence: _EventLicence, day: int) -> int:
+        return licence.last_mining_day
+
+
+# Jumps between the days on which cohorts, licences or purchases change the daily mined amount,
+# the balance grows in closed form in between. The user is only read, the final BTC amount is returned.
+class EventDrivenSimulator:
+
+    def __init__(
+            self,
+            package_type: LicenceType = LicenceType.PLATINUM,
+            package_num_cards: int = 10,
+            config: SimulationConfig = DEFAULT_CONFIG,
+    ):
+        # licence package bought every day while there is enough time for it to pay off
+        self.package_type = package_type
+        self.package_num_cards = package_num_cards
+        if config.yield_schedule is not None:
+            raise ValueError("EventDrivenSimulator needs a constant card yield, use Simulator for a yield schedule")
+        self.config = config
+        self._reset()
+
+    def _reset(self) -> None:
+        self._events = []
+        self._seq = 0
+        self._accepting = _AcceptingIndex()
+
+    def simulate(self, user: User, days: int) -> BtcAmount:
+        if user.config != self.config:
+            raise ValueError("user was set up with a different simulation config")
+        self._reset()
+        package_builder = LicenceBuilder(licence_type=self.package_type, config=self.config) \
+            .set_num_cards(num_cards=self.package_num_cards)
+        package_cost = package_builder.package_cost
+        last_package_day = days - 365
+        card = MiningCard.from_config(self.config)
+        self._load_user(user=user)
+        balance = user.btc_amount
+        # BTC mined per day by the cohorts that are currently mining
+        rate = 0
+        day = 0
+        while day < days:
+            # next day something changes
+            next_day = min(self._events[0][0] if self._events else days, days)
+            if day < last_package_day + 1:
+                next_day = min(next_day, last_package_day + 1)
+            # first quiet day the balance reaches the cheapest thing that can be bought
+            threshold = None
+            # a licence that stops accepting tomorrow still counts, its event makes tomorrow a visited day anyway
+            if self._accepting.best(day=day) is not None:
+                threshold = card.cost
+            if day + 1 <= last_package_day:
+                threshold = package_cost if threshold is None else min(threshold, package_cost)
+            if threshold is not None and balance >= threshold:
+                next_day = day + 1
+            elif threshold is not None and rate > 0:
+                num_days, remainder = divmod(threshold - balance, rate)
+                next_day = min(next_day, day + int(num_days) + (1 if remainder else 0))
+            # jump over quiet days
+            balance += rate * (next_day - 1 - day)
+            day = next_day
+            # mine on the day the change happens
+            rate, mined_today = self._apply_events(day=day, rate=rate)
+            balance += rate + mined_today
+            # add new licences with cards if there is enough days left for licences to expire
+            if day <= last_package_day:
+                balance = self._add_new_packages(
+                    day=day, balance=balance, package_builder=package_builder, package_cost=package_cost, card=card
+                )
+            # add new cards
+            balance = self._add_new_cards(day=day, balance=balance, card=card)
+        # return total BTC amount for the user
+        return balance
+
+    def _push(self, day: int, kind: _EventKind, *payload) -> None:
+        heapq.heappush(self._events, (day, self._seq, kind, payload))
+        self._seq += 1
+
+    def _apply_events(self, day: int, rate: BtcAmount) -> (BtcAmount, BtcAmount):
+        # apply every event of the day, return the new daily rate and one-off amounts mined today
+        mined_today = 0
+        while self._events and self._events[0][0] == day:
+            _, _, kind, payload = heapq.heappop(self._events)
+            match kind:
+                case _EventKind.RATE_CHANGE:
+                    delta_rate, one_off = payload
+                    rate += delta_rate
+                    mined_today += one_off
+                case _EventKind.FREE_CAPACITY:
+                    licence, num_cards = payload
+                    licence.num_cards -= num_cards
+                    if licence in self._accepting.licences:
+                        self._accepting.add(licence=licence, day=day)
+                case _EventKind.STOP_ACCEPTING:
+                    licence, = payload
+                    self._accepting.remove(licences={licence})
+        return rate, mined_today
+
+    def _add_licence(self, max_num_cards: int, days_left: int, card_num_mining_days: int, day: int) -> _EventLicence:
+        # the licence mines days_left more days
+        last_mining_day = day + days_left
+        licence = _EventLicence(
+            max_num_cards=max_num_cards,
+            num_cards=0,
+            last_mining_day=last_mining_day,
+            stop_accepting_day=int(last_mining_day - card_num_mining_days),
+        )
+        if day < licence.stop_accepting_day:
+            self._accepting.add(licence=licence, day=day)
+            self._push(licence.stop_accepting_day, _EventKind.STOP_ACCEPTING, licence)
+        return licence
+
+    def _add_cohort(
+            self,
+            licence: _EventLicence,
+            card: MiningCard,
+            num_cards: int,
+            day: int,
+            reserved_days_left: int,
+            mined_btc: BtcAmount,
+    ) -> None:
+        # schedule the whole lifecycle of cards that are in the same state at the end of the day
+        licence.num_cards += num_cards
+        first_mining_day = day + reserved_days_left + 1
+        remaining = card.numeric.mining_target(cost=card.cost, profit_threshold=card.profit_threshold) - mined_btc
+        if remaining <= 0:
+            # card mines nothing and is deactivated on its first mining day
+            last_mining_day, last_day_amount = first_mining_day, 0
+        else:
+            num_full_days, last_day_amount = divmod(remaining, card.mines_btc_per_day)
+            last_mining_day = first_mining_day + int(num_full_days) - (0 if last_day_amount else 1)
+        if first_mining_day > licence.last_mining_day:
+            # licence expires before the cards start mining
+            return
+        cohort_rate = card.mines_btc_per_day * num_cards
+        if last_mining_day > licence.last_mining_day:
+            # licence expiry stops the cards
+            if remaining > 0:
+                self._push(first_mining_day, _EventKind.RATE_CHANGE, cohort_rate, 0)
+                self._push(licence.last_mining_day + 1, _EventKind.RATE_CHANGE, -cohort_rate, 0)
+            return
+        if remaining > 0:
+            self._push(first_mining_day, _EventKind.RATE_CHANGE, cohort_rate, 0)
+            if last_day_amount:
+                # partial mining on the last day
+                self._push(last_mining_day, _EventKind.RATE_CHANGE, -cohort_rate, last_day_amount * num_cards)
+            else:
+                self._push(last_mining_day + 1, _EventKind.RATE_CHANGE, -cohort_rate, 0)
+        # deactivated cards leave the licence after mining on their last day
+        self._push(last_mining_day, _EventKind.FREE_CAPACITY, licence, num_cards)
+
+    def _add_new_packages(
+            self,
+            day: int,
+            balance: BtcAmount,
+            package_builder: LicenceBuilder,
+            package_cost: BtcAmount,
+            card: MiningCard,
+    ) -> BtcAmount:
+        # buy as many packages as the balance allows
+        num_packages = balance // package_cost
+        for _ in range(int(num_packages)):
+            licence = self._add_licence(
+                max_num_cards=package_builder.max_cards,
+                days_left=365,
+                card_num_mining_days=self.config.card_num_mining_days,
+                day=day,
+            )
+            self._add_cohort(
+                licence=licence,
+                card=card,
+                num_cards=package_builder.num_cards,
+                day=day,
+                reserved_days_left=1,
+                mined_btc=card.numeric.zero,
+            )
+        return balance - num_packages * package_cost
+
+    def _add_new_cards(self, day: int, balance: BtcAmount, card: MiningCard) -> BtcAmount:
+        num_cards = int(balance // card.cost)
+        if num_cards == 0:
+            return balance
+        # cards go to the licences like adding them one by one to the licence with the largest remaining
+        # capacity, then the most days left; cards added to a licence on the same day form one cohort
+        num_cards_added = 0
+        for licence, licence_cards in self._accepting.distribute(num_cards=num_cards, day=day):
+            self._add_cohort(
+                licence=licence,
+                card=card,
+                num_cards=licence_cards,
+                day=day,
+                reserved_days_left=1,
+                mined_btc=card.numeric.zero,
+            )
+            self._accepting.add(licence=licence, day=day)
+            num_cards_added += licence_cards
+        return balance - num_cards_added * card.cost
+
+    def _load_user(self, user: User) -> None:
+        # in the order User breaks ties between licences in
+        for licence in user.ordered_licences():
+            # only valid licence can mine
+            if not isinstance(licence.state, Valid):
+                raise RuntimeError(f"Only valid licence can mine")
+            event_licence = self._add_licence(
+                max_num_cards=licence.max_num_cards,
+                days_left=licence.state.days_left,
+                card_num_mining_days=licence.card_num_mining_days,
+                day=0,
+            )
+            for cohort in licence.cards.cohorts:
+                card = cohort.card
+                match card.state:
+                    case Reserved(days_left=days):
+                        # activation takes the last reserved day, mining starts the day after
+                        reserved_days_left, mined_btc = days, card.numeric.zero
+                    case Active(mined_btc=btc):
+                        reserved_days_left, mined_btc = 0, btc
+                    case _:
+                        raise RuntimeError(f"Mine called on a card in state: {card.state}")
+                self._add_cohort(
+                    licence=event_licence,
+                    card=card,
+                    num_cards=cohort.count,
+                    day=0,
+                    reserved_days_left=reserved_days_left,
+                    mined_btc=mined_btc,
+                )
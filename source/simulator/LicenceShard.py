@@ -0,0 +1,120 @@
+import io
+import pickle
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+
+from source.SimulationConfig import SimulationConfig
+from source.licence.Licence import Licence
+from source.licence.LicenceState import Expired
+from source.mining_unit.CardLifecycle import CardLifecycle
+from source.utils.NumericBackend import BtcAmount
+
+
+# What a shard receives before mining a day: licences and cards bought since the day before.
+# Licences are known by the key the coordinator gave them.
+@dataclass(eq=False)
+class ShardDay:
+    new_licences: list[tuple[int, Licence]] = field(default_factory=list)
+    new_cards: list[tuple[int, CardLifecycle, int]] = field(default_factory=list)
+    # no day is mined, the shard takes the purchases, sends its licences back and stops
+    last: bool = False
+
+
+# What a shard reports after mining a day: the total it mined and the licences whose number of cards
+# changed, which is all the coordinator needs to run the purchases.
+@dataclass(frozen=True, eq=False)
+class ShardReport:
+    mined: BtcAmount
+    # (key, number of cards left) of licences that lost deactivated cards
+    num_cards_left: list[tuple[int, int]]
+    # keys of licences that expired and left the shard
+    expired: list[int]
+
+
+# Licences of one shard, mined in a worker process. Licences mine independently of each other,
+# so a shard mines its own like User.mine_for_day would and the totals add up to the user's.
+class LicenceShard:
+
+    def __init__(self):
+        # licences by key, in the order they joined the shard
+        self.licences: dict[int, Licence] = {}
+
+    def add(self, day: ShardDay) -> None:
+        for key, licence in day.new_licences:
+            self.licences[key] = licence
+        # cards come from the coordinator's purchase phase, their licences' capacity was already checked
+        for key, lifecycle, num_cards in day.new_cards:
+            self.licences[key].cards.add_scheduled(lifecycle, num_cards=num_cards)
+
+    def mine(self) -> ShardReport:
+        # int zero takes on the numeric type of the licences' amounts
+        mined = 0
+        num_cards_left = []
+        expired = []
+        for key, licence in self.licences.items():
+            num_cards = len(licence.cards)
+            mined += licence.get_daily_mining_amount()
+            if len(licence.cards) < num_cards:
+                num_cards_left.append((key, len(licence.cards)))
+            if isinstance(licence.state, Expired):
+                expired.append(key)
+        for key in expired:
+            del self.licences[key]
+        return ShardReport(mined=mined, num_cards_left=num_cards_left, expired=expired)
+
+
+# Messages refer to the config's yield table instead of carrying it: it is large, every scheduled lifecycle
+# holds it, and the shard already has it from the config it was started with.
+_CARD_YIELD_TABLE = "card_yield_table"
+
+
+class _MessagePickler(pickle.Pickler):
+
+    def __init__(self, file, config: SimulationConfig):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._table = config.card_yield_table
+
+    def persistent_id(self, obj):
+        return _CARD_YIELD_TABLE if self._table is not None and obj is self._table else None
+
+
+class _MessageUnpickler(pickle.Unpickler):
+
+    def __init__(self, file, config: SimulationConfig):
+        super().__init__(file)
+        self._table = config.card_yield_table
+
+    def persistent_load(self, pid):
+        if pid != _CARD_YIELD_TABLE:
+            raise pickle.UnpicklingError(f"unknown persistent id {pid}")
+        return self._table
+
+
+def send_message(connection: Connection, message, config: SimulationConfig) -> None:
+    buffer = io.BytesIO()
+    _MessagePickler(buffer, config=config).dump(message)
+    connection.send_bytes(buffer.getvalue())
+
+
+def receive_message(connection: Connection, config: SimulationConfig):
+    return _MessageUnpickler(io.BytesIO(connection.recv_bytes()), config=config).load()
+
+
+def serve_shard(connection: Connection, config: SimulationConfig) -> None:
+    # worker process loop, errors are sent back to be raised by the coordinator
+    shard = LicenceShard()
+    while True:
+        try:
+            day = receive_message(connection, config=config)
+        except EOFError:
+            # the coordinator stopped
+            return
+        try:
+            shard.add(day)
+            if day.last:
+                send_message(connection, shard.licences, config=config)
+                return
+            send_message(connection, shard.mine(), config=config)
+        except Exception as error:
+            send_message(connection, error, config=config)
+            return
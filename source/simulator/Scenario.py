@@ -0,0 +1,40 @@
+from dataclasses import dataclass, fields
+from decimal import Decimal
+from enum import Enum
+from itertools import product
+
+from source.SimulationConfig import SimulationConfig
+from source.licence.LicenceBuilder import LicenceType
+
+
+class Engine(Enum):
+    OBJECT = 1
+    EVENT_DRIVEN = 2
+    VECTORIZED = 3
+
+
+@dataclass(frozen=True)
+class Scenario:
+    btc_price: Decimal = Decimal("91000")
+    # initial licence package
+    licence_type: LicenceType = LicenceType.PRIME
+    num_cards: int = 14
+    # package bought every day while there is enough time for it to pay off
+    package_type: LicenceType = LicenceType.PLATINUM
+    package_num_cards: int = 10
+    # horizon in days
+    days: int = 365
+    engine: Engine = Engine.OBJECT
+
+    @property
+    def config(self) -> SimulationConfig:
+        return SimulationConfig(btc_price=self.btc_price)
+
+    @classmethod
+    def grid(cls, **values: list) -> list["Scenario"]:
+        # every combination of the given field values, other fields keep their defaults
+        names = [field.name for field in fields(cls) if field.name in values]
+        unknown = set(values) - set(names)
+        if unknown:
+            raise ValueError(f"unknown scenario fields: {', '.join(sorted(unknown))}")
+        return [cls(**dict(zip(names, combination))) for combination in product(*(values[name] for name in names))]
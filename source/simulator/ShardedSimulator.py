@@ -0,0 +1,196 @@
+import multiprocessing
+import os
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+
+from source.Constants import DEFAULT_CONFIG
+from source.SimulationConfig import SimulationConfig
+from source.cache.ResultCache import ResultCache
+from source.licence.Licence import Licence
+from source.licence.LicenceBuilder import LicenceType
+from source.licence.LicenceState import LicenceState, Valid, Expired
+from source.mining_unit.CardLifecycle import CardLifecycle
+from source.output.OutputSink import OutputSink
+from source.simulator.LicenceShard import ShardDay, ShardReport, serve_shard, send_message, receive_message
+from source.profiling.SimulationStats import SimulationStats
+from source.simulator.Simulator import Simulator
+from source.strategy.Strategy import Strategy
+from source.user.User import User
+from source.utils.NumericBackend import BtcAmount
+
+
+# Stands in for a licence's cards on the coordinator, the purchases only need their number.
+class _CardCount:
+
+    def __init__(self, num_cards: int):
+        self.num_cards = num_cards
+
+    def __len__(self) -> int:
+        return self.num_cards
+
+
+# Coordinator's stand-in for a licence that lives in a shard. It answers what the purchases ask a licence
+# and forwards the cards added to it. Its state follows from the day it expires, so the coordinator
+# does not count every licence down each day.
+@dataclass(eq=False, slots=True)
+class _LicenceProxy:
+    key: int
+    cost: BtcAmount
+    max_num_cards: int
+    card_num_mining_days: int
+    # number of days the user has mined when the licence expires
+    expiry_day: int
+    cards: _CardCount
+    user: "_ShardedUser" = field(repr=False)
+
+    @property
+    def state(self) -> LicenceState:
+        days_left = self.expiry_day - self.user.num_days_mined
+        return Valid(days_left=days_left) if days_left > 0 else Expired()
+
+    def can_add_mining_card(self, num_cards: int = 1) -> bool:
+        # same rule as Licence.can_add_mining_card
+        max_num_cards_reached = len(self.cards) + num_cards > self.max_num_cards
+        enough_days_left = self.expiry_day - self.user.num_days_mined > self.card_num_mining_days
+        return not max_num_cards_reached and enough_days_left
+
+    def add_new_mining_cards(self, lifecycle: CardLifecycle, num_cards: int = 1) -> None:
+        if not self.can_add_mining_card(num_cards=num_cards):
+            raise RuntimeError(f"Should not add a new card")
+        self.cards.num_cards += num_cards
+        self.user.send_cards(licence=self, lifecycle=lifecycle, num_cards=num_cards)
+
+
+# The user as the coordinator sees it: the purchase phase runs unchanged on licence proxies,
+# mining is done by the shards. Licences are spread over the shards round-robin as they are added.
+class _ShardedUser(User):
+
+    def __init__(self, connections: list[Connection], config: SimulationConfig):
+        super().__init__(config=config)
+        self._connections = connections
+        # purchases waiting to be sent to each shard with the next day
+        self._pending = [ShardDay() for _ in connections]
+        self._proxies: dict[int, _LicenceProxy] = {}
+        self._next_key = 0
+
+    def _add_licence(self, licence: Licence) -> None:
+        # the licence moves to a shard, the coordinator keeps its proxy
+        key = self._next_key
+        self._next_key += 1
+        self._pending[key % len(self._connections)].new_licences.append((key, licence))
+        days_left = licence.state.days_left if isinstance(licence.state, Valid) else 0
+        proxy = _LicenceProxy(
+            key=key,
+            cost=licence.cost,
+            max_num_cards=licence.max_num_cards,
+            card_num_mining_days=licence.card_num_mining_days,
+            expiry_day=self._num_days_mined + days_left,
+            cards=_CardCount(num_cards=len(licence.cards)),
+            user=self,
+        )
+        self._proxies[key] = proxy
+        super()._add_licence(licence=proxy)
+
+    def send_cards(self, licence: _LicenceProxy, lifecycle: CardLifecycle, num_cards: int) -> None:
+        self._pending[licence.key % len(self._connections)].new_cards.append((licence.key, lifecycle, num_cards))
+
+    def _mine_licences(self) -> None:
+        # every shard gets the day's message before any report is awaited, so the shards mine in parallel
+        self._send_pending(last=False)
+        reports: list[ShardReport] = [self._receive(connection) for connection in self._connections]
+        for report in reports:
+            self.btc_amount += report.mined
+            # deactivated cards freed capacity
+            for key, num_cards in report.num_cards_left:
+                proxy = self._proxies[key]
+                proxy.cards.num_cards = num_cards
+                self._capacity_index.add(licence=proxy, day=self._num_days_mined)
+            for key in report.expired:
+                del self._proxies[key]
+
+    def _send_pending(self, last: bool) -> None:
+        for connection, day in zip(self._connections, self._pending):
+            day.last = last
+            send_message(connection, day, config=self.config)
+        self._pending = [ShardDay() for _ in self._connections]
+
+    def collect_licences(self) -> list[Licence]:
+        # stop the shards and return their licences in the order that breaks ties like the proxies
+        self._send_pending(last=True)
+        licences: dict[int, Licence] = {}
+        for connection in self._connections:
+            licences.update(self._receive(connection))
+        return [licences[proxy.key] for proxy in self.ordered_licences()]
+
+    def _receive(self, connection: Connection):
+        reply = receive_message(connection, config=self.config)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+# Mines one large portfolio's licences in parallel worker processes, purchases run here on proxies.
+# Only simulate runs sharded; stats are rejected, the mining counters would stay in the workers.
+class ShardedSimulator(Simulator):
+
+    def __init__(
+            self,
+            num_shards: int | None = None,
+            package_type: LicenceType = LicenceType.PLATINUM,
+            package_num_cards: int = 10,
+            config: SimulationConfig = DEFAULT_CONFIG,
+            sink: OutputSink | None = None,
+            cache: ResultCache | None = None,
+            stats: SimulationStats | None = None,
+            strategy: Strategy | None = None,
+    ):
+        if stats is not None:
+            raise ValueError("ShardedSimulator can not be profiled, use Simulator to collect stats")
+        super().__init__(
+            package_type=package_type,
+            package_num_cards=package_num_cards,
+            config=config,
+            sink=sink,
+            cache=cache,
+            strategy=strategy,
+        )
+        # one shard per core by default
+        self.num_shards = num_shards or os.cpu_count() or 1
+        if self.num_shards < 1:
+            raise ValueError(f"num_shards must be at least 1, got {self.num_shards}")
+
+    def _simulate_days(self, user: User, days: int, start_day: int, stop_day: int, sink: OutputSink) -> None:
+        # the days run on a coordinator and its shards, the user continues from their final state
+        context = multiprocessing.get_context("spawn")
+        connections = []
+        workers = []
+        try:
+            for _ in range(self.num_shards):
+                connection, worker_connection = context.Pipe()
+                worker = context.Process(target=serve_shard, args=(worker_connection, self.config), daemon=True)
+                worker.start()
+                worker_connection.close()
+                connections.append(connection)
+                workers.append(worker)
+            coordinator = _ShardedUser(connections=connections, config=self.config)
+            coordinator.btc_amount = user.btc_amount
+            coordinator._num_days_mined = user.num_days_mined
+            # licences in index order, so proxies break ties like the user's licences
+            for licence in user.ordered_licences():
+                coordinator._add_licence(licence=licence)
+            super()._simulate_days(user=coordinator, days=days, start_day=start_day, stop_day=stop_day, sink=sink)
+            # continue from the shards' licences
+            user.take_state(User.resume(
+                licences=coordinator.collect_licences(),
+                btc_amount=coordinator.btc_amount,
+                num_days_mined=coordinator.num_days_mined,
+                config=self.config,
+            ))
+        finally:
+            # shards still waiting for a day stop when their connection closes
+            for connection in connections:
+                connection.close()
+            for worker in workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
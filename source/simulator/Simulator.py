@@ -1,54 +1,229 @@
+from contextlib import contextmanager
 from decimal import Decimal
+from time import perf_counter
+from typing import Iterator
 
-from source.Constants import BTC_PRICE, CARD_COST, CARD_NUM_MINING_DAYS, PRIME_LICENCE_COST
+from source.Constants import DEFAULT_CONFIG
+from source.SimulationConfig import SimulationConfig
+from source.cache.CachedResult import CachedResult
+from source.cache.ResultCache import ResultCache
+from source.checkpoint.Checkpoint import dump_checkpoint, load_checkpoint
 from source.licence.LicenceBuilder import LicenceType, LicenceBuilder
+from source.output.DayRecord import DayRecord
+from source.output.OutputSink import OutputSink, NullSink, PrintSink
+from source.profiling.SimulationStats import SimulationStats, Phase
+from source.simulator.DaySnapshot import DaySnapshot
+from source.strategy.PackageStrategy import PackageStrategy
+from source.strategy.Strategy import Strategy, DayState, PurchaseDecision
 from source.user.User import User
 from source.utils.Metrics import compound_annual_growth_rate
+from source.utils.NumericBackend import BtcAmount
 
 
 class Simulator:
 
-    def simulate(self, user: User, days: int) -> Decimal:
-        # simulate mining over days
-        for day in range(1, days + 1):
-            # mine
-            user.mine_for_day()
-            # add new licences with cards if there is enough days left for licences to expire
-            if day <= days - 365:
-                user.add_new_licence_with_cards(licence_type=LicenceType.PLATINUM, num_cards=10)
-            # add new cards
-            num_cards_added = user.add_new_cards()
-            # print out the state for each day: BTC amount in USD, how many cards were added
-            print( f"day: {day}, BTC value: ${(user.btc_amount * BTC_PRICE):.2f}, number of cards added: {num_cards_added}")
-        # return total BTC amount for the user
+    def __init__(
+            self,
+            package_type: LicenceType = LicenceType.PLATINUM,
+            package_num_cards: int = 10,
+            config: SimulationConfig = DEFAULT_CONFIG,
+            sink: OutputSink | None = None,
+            cache: ResultCache | None = None,
+            stats: SimulationStats | None = None,
+            strategy: Strategy | None = None,
+    ):
+        # licence package bought every day while there is enough time for it to pay off
+        self.package_type = package_type
+        self.package_num_cards = package_num_cards
+        # decides the daily purchases, by default the package policy above
+        self.strategy = strategy if strategy is not None else PackageStrategy(
+            package_type=package_type, package_num_cards=package_num_cards,
+        )
+        self.config = config
+        # receives the state of every day, nothing is recorded by default
+        self.sink = sink if sink is not None else NullSink()
+        # results of earlier identical simulations
+        self.cache = cache
+        # phase times and counters, attached to the user while simulating;
+        # profiled runs simulate every day, the cache is neither read nor written
+        self.stats = stats
+
+    @property
+    def _uses_cache(self) -> bool:
+        # strategies without a cache key and profiled runs are always simulated
+        return self.cache is not None and self.stats is None and self.strategy.cache_key() is not None
+
+    def simulate(self, user: User, days: int, start_day: int = 0, stop_day: int | None = None) -> BtcAmount:
+        self._check_setup(user=user, days=days)
+        stop_day = days if stop_day is None else stop_day
+        with self._stats_attached(user=user):
+            if not self._uses_cache:
+                self._simulate_days(user=user, days=days, start_day=start_day, stop_day=stop_day, sink=self.sink)
+                # return total BTC amount for the user
+                return user.btc_amount
+            return self._simulate_cached(user=user, days=days, start_day=start_day, stop_day=stop_day)
+
+    @contextmanager
+    def _stats_attached(self, user: User) -> Iterator[None]:
+        # the user collects into the simulator's stats while the context is open
+        if self.stats is None:
+            yield
+            return
+        previous = user.stats
+        user.stats = self.stats
+        try:
+            yield
+        finally:
+            user.stats = previous
+
+    def _check_setup(self, user: User, days: int) -> None:
+        if user.config != self.config:
+            raise ValueError("user was set up with a different simulation config")
+        schedule = self.config.yield_schedule
+        if schedule is not None and schedule.last_day < days:
+            raise ValueError(f"yield schedule ends on day {schedule.last_day}, the simulation runs {days} days")
+
+    def _simulate_days(self, user: User, days: int, start_day: int, stop_day: int, sink: OutputSink) -> None:
+        numeric = self.config.numeric
+        listening = sink.listening
+        # simulate mining over days, start_day > 0 resumes a simulation that stopped after that day,
+        # stop_day < days pauses the simulation after that day
+        for day in range(start_day + 1, stop_day + 1):
+            _, num_cards_added, _ = self._simulate_day(user=user, day=day, days=days)
+            # record the state for each day: BTC amount, how many cards were added
+            if listening:
+                sink.record(DayRecord(
+                    day=day, btc_amount=numeric.to_decimal(user.btc_amount), num_cards_added=num_cards_added,
+                ))
+        sink.flush()
+
+    def _cache_key_parts(self, days: int, start_day: int, stop_day: int) -> list[str]:
+        # everything besides the user's state that determines the result,
+        # subclasses that change the daily policy add their parameters
+        return [type(self).__name__, self.strategy.cache_key(), f"{start_day}-{stop_day}/{days}"]
+
+    def _simulate_cached(self, user: User, days: int, start_day: int, stop_day: int) -> BtcAmount:
+        # the user's full state is part of the key, it also carries the simulation config
+        key = ResultCache.key(*self._cache_key_parts(days=days, start_day=start_day, stop_day=stop_day),
+                              dump_checkpoint(user=user, day=start_day))
+        sink = self.sink
+        cached = self.cache.get(key)
+        if cached is not None and (cached.series is not None or not sink.listening):
+            # continue from the cached final state as if the days were simulated
+            final_user, _ = load_checkpoint(cached.state)
+            user.take_state(final_user)
+            if sink.listening:
+                for record in cached.series:
+                    sink.record(record)
+                sink.flush()
+            return user.btc_amount
+        # keep the daily records for the cache while passing them on
+        recorder = _SeriesRecorder(sink=sink)
+        self._simulate_days(user=user, days=days, start_day=start_day, stop_day=stop_day, sink=recorder)
+        self.cache.put(key, CachedResult(
+            btc_amount=self.config.numeric.to_decimal(user.btc_amount),
+            series=tuple(recorder.records) if sink.listening else None,
+            state=dump_checkpoint(user=user, day=stop_day),
+        ))
         return user.btc_amount
 
+    def iter_days(self, user: User, days: int, start_day: int = 0) -> Iterator[DaySnapshot]:
+        # same simulation as simulate, stepped by the caller one day at a time
+        self._check_setup(user=user, days=days)
+        numeric = self.config.numeric
+        with self._stats_attached(user=user):
+            for day in range(start_day + 1, days + 1):
+                num_licences_added, num_cards_added, num_licences_expired = self._simulate_day(
+                    user=user, day=day, days=days,
+                )
+                yield DaySnapshot(
+                    day=day,
+                    btc_amount=numeric.to_decimal(user.btc_amount),
+                    num_active_cards=user.num_active_cards,
+                    num_cards_added=num_cards_added,
+                    num_licences_added=num_licences_added,
+                    num_licences_expired=num_licences_expired,
+                )
+
+    def _simulate_day(self, user: User, day: int, days: int) -> (int, int, int):
+        # mine
+        num_licences = len(user.licences)
+        user.mine_for_day()
+        num_licences_expired = num_licences - len(user.licences)
+        stats = user.stats
+        if stats is None:
+            decision = self.strategy.decide(DayState(day=day, days=days, user=user))
+            num_licences_added = self._add_new_licences(user=user, decision=decision)
+            # add new cards
+            num_cards_added = user.add_new_cards(max_num_cards=decision.max_num_cards, reserve=decision.reserve)
+        else:
+            start = perf_counter()
+            decision = self.strategy.decide(DayState(day=day, days=days, user=user))
+            num_licences_added = self._add_new_licences(user=user, decision=decision)
+            licences_added = perf_counter()
+            num_cards_added = user.add_new_cards(max_num_cards=decision.max_num_cards, reserve=decision.reserve)
+            stats.add_time(Phase.LICENCE_PURCHASE, licences_added - start)
+            stats.add_time(Phase.CARD_PURCHASE, perf_counter() - licences_added)
+        # return number of added licences, added cards and expired licences
+        return num_licences_added, num_cards_added, num_licences_expired
+
+    @staticmethod
+    def _add_new_licences(user: User, decision: PurchaseDecision) -> int:
+        # add the packages the strategy decided on
+        if decision.package_type is None:
+            return 0
+        return user.add_new_licence_with_cards(
+            licence_type=decision.package_type,
+            num_cards=decision.package_num_cards,
+            max_num_packages=decision.max_num_packages,
+            reserve=decision.reserve,
+        )
+
+
+class _SeriesRecorder(OutputSink):
+    # passes records on to a sink and keeps them, listens only if the sink does
+
+    def __init__(self, sink: OutputSink):
+        self.sink = sink
+        self.listening = sink.listening
+        self.records: list[DayRecord] = []
+
+    def record(self, day_record: DayRecord) -> None:
+        self.records.append(day_record)
+        self.sink.record(day_record)
+
+    def flush(self) -> None:
+        self.sink.flush()
+
 
 if __name__ == "__main__":
+    # prices and card parameters
+    config = SimulationConfig()
+    numeric = config.numeric
     # configure licence builder
-    licence_builder = LicenceBuilder(licence_type=LicenceType.PRIME).set_num_cards(num_cards=14)
+    licence_builder = LicenceBuilder(licence_type=LicenceType.PRIME, config=config).set_num_cards(num_cards=14)
     # build licence with cards and cost
     licence, cost = licence_builder.build()
     # create a user
-    user = User()
+    user = User(config=config)
     # add licence to user
     user.licences.add(licence)
     # create simulator
-    simulator = Simulator()
+    simulator = Simulator(config=config, sink=PrintSink(btc_price=config.btc_price))
     # run simulation
     days = 365
     btc_amount = simulator.simulate(user=user, days=days)
     # calculate CAGR
     cagr = compound_annual_growth_rate(
-        beginning_value=cost,
-        ending_value=btc_amount,
+        beginning_value=numeric.to_decimal(cost),
+        ending_value=numeric.to_decimal(btc_amount),
         years=Decimal(days) / Decimal("365"),
     )
     print("--- Results ---")
-    print(f"Bitcoin price: ${BTC_PRICE:.2f}")
-    print(f"Prime licence cost: ${(PRIME_LICENCE_COST * BTC_PRICE):.2f}")
-    print(f"card cost: ${(CARD_COST * BTC_PRICE):.2f}")
-    print(f"card lifetime: {CARD_NUM_MINING_DAYS} days")
-    print(f"invested amount: ${(cost * BTC_PRICE):.2f}")
-    print(f"final amount: ${(btc_amount * BTC_PRICE):.2f}")
+    print(f"Bitcoin price: ${config.btc_price:.2f}")
+    print(f"Prime licence cost: ${(numeric.to_decimal(config.prime_licence_cost) * config.btc_price):.2f}")
+    print(f"card cost: ${(numeric.to_decimal(config.card_cost) * config.btc_price):.2f}")
+    print(f"card lifetime: {config.card_num_mining_days} days")
+    print(f"invested amount: ${(numeric.to_decimal(cost) * config.btc_price):.2f}")
+    print(f"final amount: ${(numeric.to_decimal(btc_amount) * config.btc_price):.2f}")
     print(f"CAGR: {(cagr * 100):.2f}%")
@@ -0,0 +1,21 @@
+from dataclasses import dataclass, asdict
+from decimal import Decimal
+
+from source.simulator.Scenario import Scenario
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    scenario: Scenario
+    invested_btc: Decimal
+    final_btc: Decimal
+    cagr: Decimal
+
+    def as_row(self) -> dict:
+        # flat row: scenario parameters followed by results
+        row = asdict(self.scenario)
+        row["licence_type"] = self.scenario.licence_type.name
+        row["package_type"] = self.scenario.package_type.name
+        row["engine"] = self.scenario.engine.name
+        row.update(invested_btc=self.invested_btc, final_btc=self.final_btc, cagr=self.cagr)
+        return row
@@ -0,0 +1,91 @@
+import csv
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from functools import partial
+from typing import Iterable, TextIO
+
+from source.cache.CachedResult import CachedResult
+from source.cache.ResultCache import ResultCache
+from source.licence.LicenceBuilder import LicenceBuilder
+from source.simulator.EventDrivenSimulator import EventDrivenSimulator
+from source.simulator.Scenario import Scenario, Engine
+from source.simulator.Simulator import Simulator
+from source.simulator.SweepResult import SweepResult
+from source.user.User import User
+from source.utils.Metrics import compound_annual_growth_rate
+
+
+def run_scenario(scenario: Scenario, cache: ResultCache | None = None) -> SweepResult:
+    config = scenario.config
+    match scenario.engine:
+        case Engine.OBJECT:
+            simulator_class = Simulator
+        case Engine.EVENT_DRIVEN:
+            simulator_class = EventDrivenSimulator
+        case Engine.VECTORIZED:
+            # numpy is only needed for this engine
+            from source.simulator.VectorizedSimulator import VectorizedSimulator
+            simulator_class = VectorizedSimulator
+        case _:
+            raise ValueError("unknown engine")
+    # build initial licence with cards and cost
+    licence, cost = LicenceBuilder(licence_type=scenario.licence_type, config=config) \
+        .set_num_cards(num_cards=scenario.num_cards) \
+        .build()
+    invested_btc = config.numeric.to_decimal(cost)
+    # the scenario and its fully resolved config describe the whole simulation
+    key = ResultCache.key("scenario", repr(scenario), config.cache_key())
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None:
+        final_btc = cached.btc_amount
+    else:
+        user = User(licences={licence}, config=config)
+        simulator = simulator_class(
+            package_type=scenario.package_type, package_num_cards=scenario.package_num_cards, config=config
+        )
+        final_btc = config.numeric.to_decimal(simulator.simulate(user=user, days=scenario.days))
+        if cache is not None:
+            cache.put(key, CachedResult(btc_amount=final_btc))
+    return SweepResult(
+        scenario=scenario,
+        invested_btc=invested_btc,
+        final_btc=final_btc,
+        cagr=compound_annual_growth_rate(
+            beginning_value=invested_btc,
+            ending_value=final_btc,
+            years=Decimal(scenario.days) / Decimal("365"),
+        ),
+    )
+
+
+# Runs scenarios in parallel worker processes, every scenario carries its own simulation config.
+# Scenarios found in the cache are not simulated again.
+class SweepRunner:
+
+    def __init__(self, max_workers: int | None = None, cache: ResultCache | None = None):
+        # use every core by default
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache = cache
+
+    def run(self, scenarios: Iterable[Scenario]) -> list[SweepResult]:
+        scenarios = list(scenarios)
+        if not scenarios:
+            return []
+        with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(scenarios)),
+                mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            # results in the order of the scenarios
+            return list(pool.map(partial(run_scenario, cache=self.cache), scenarios))
+
+    @staticmethod
+    def write_csv(results: list[SweepResult], file: TextIO) -> None:
+        # one row per scenario
+        rows = [result.as_row() for result in results]
+        if not rows:
+            return
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
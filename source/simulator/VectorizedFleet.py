@@ -0,0 +1,188 @@
+from decimal import Decimal
+
+import numpy as np
+
+# card state codes
+RESERVED = 0
+ACTIVE = 1
+DEACTIVATED = 2
+
+
+# Mining cards and licences of a user stored as NumPy arrays, one entry per card / licence.
+# BTC amounts are integers in units of 10^-places BTC, so array arithmetic stays exact
+# and matches the Decimal arithmetic of the object model.
+class VectorizedFleet:
+
+    def __init__(self, places: int):
+        self.places = places
+        # cards
+        self.card_state = np.empty(0, dtype=np.int8)
+        self.card_reserved_days_left = np.empty(0, dtype=np.int64)
+        self.card_mined = np.empty(0, dtype=np.int64)
+        self.card_cost = np.empty(0, dtype=np.int64)
+        self.card_mines_per_day = np.empty(0, dtype=np.int64)
+        self.card_target = np.empty(0, dtype=np.int64)
+        self.card_licence = np.empty(0, dtype=np.int64)
+        # licences
+        self.licence_valid = np.empty(0, dtype=bool)
+        self.licence_days_left = np.empty(0, dtype=np.int64)
+        self.licence_max_num_cards = np.empty(0, dtype=np.int64)
+        self.licence_num_cards = np.empty(0, dtype=np.int64)
+        self.licence_card_num_mining_days = np.empty(0, dtype=np.int64)
+
+    def to_units(self, value: Decimal) -> int:
+        # convert BTC amount into integer units, the scale must represent it exactly
+        units = value.scaleb(self.places)
+        if units != units.to_integral_value():
+            raise ValueError(f"{value} can not be represented with {self.places} decimal places")
+        return int(units)
+
+    def to_btc(self, units: int) -> Decimal:
+        return Decimal(units).scaleb(-self.places)
+
+    @property
+    def num_cards(self) -> int:
+        # number of cards that are still mining
+        return int(np.count_nonzero(self.card_state != DEACTIVATED))
+
+    @property
+    def num_licences(self) -> int:
+        # number of valid licences
+        return int(np.count_nonzero(self.licence_valid))
+
+    def add_licences(
+            self,
+            num_licences: int,
+            days_left: int | np.ndarray,
+            max_num_cards: int | np.ndarray,
+            card_num_mining_days: int | np.ndarray,
+    ) -> np.ndarray:
+        # append licences and return their indices, parameters are shared or given per licence
+        first = len(self.licence_valid)
+        self.licence_valid = np.concatenate((self.licence_valid, np.ones(num_licences, dtype=bool)))
+        self.licence_days_left = np.concatenate((self.licence_days_left, np.full(num_licences, days_left)))
+        self.licence_max_num_cards = np.concatenate((self.licence_max_num_cards, np.full(num_licences, max_num_cards)))
+        self.licence_num_cards = np.concatenate((self.licence_num_cards, np.zeros(num_licences, dtype=np.int64)))
+        self.licence_card_num_mining_days = np.concatenate(
+            (self.licence_card_num_mining_days, np.full(num_licences, card_num_mining_days))
+        )
+        return np.arange(first, first + num_licences)
+
+    def add_cards(
+            self,
+            card_licence: np.ndarray,
+            cost: int | np.ndarray,
+            mines_per_day: int | np.ndarray,
+            target: int | np.ndarray,
+            state: int | np.ndarray = RESERVED,
+            reserved_days_left: int | np.ndarray = 1,
+            mined: int | np.ndarray = 0,
+    ) -> None:
+        # append one card per entry of card_licence, parameters and state are shared or given per card
+        num_cards = len(card_licence)
+        if num_cards == 0:
+            return
+        self.card_state = np.concatenate((self.card_state, np.full(num_cards, state, dtype=np.int8)))
+        self.card_reserved_days_left = np.concatenate(
+            (self.card_reserved_days_left, np.full(num_cards, reserved_days_left, dtype=np.int64))
+        )
+        self.card_mined = np.concatenate((self.card_mined, np.full(num_cards, mined, dtype=np.int64)))
+        self.card_cost = np.concatenate((self.card_cost, np.full(num_cards, cost, dtype=np.int64)))
+        self.card_mines_per_day = np.concatenate(
+            (self.card_mines_per_day, np.full(num_cards, mines_per_day, dtype=np.int64))
+        )
+        self.card_target = np.concatenate((self.card_target, np.full(num_cards, target, dtype=np.int64)))
+        self.card_licence = np.concatenate((self.card_licence, card_licence.astype(np.int64)))
+        self.licence_num_cards += np.bincount(card_licence, minlength=len(self.licence_num_cards))
+
+    def mine_for_day(self) -> int:
+        state = self.card_state
+        reserved = state == RESERVED
+        active = state == ACTIVE
+        # reserved cards count down, a card activated today starts mining the next day
+        self.card_reserved_days_left[reserved] -= 1
+        activated = reserved & (self.card_reserved_days_left <= 0)
+        # active cards mine until they reach their target
+        mined = self.card_mined
+        mined_today = np.where(active, np.minimum(self.card_mines_per_day, np.maximum(0, self.card_target - mined)), 0)
+        mined += mined_today
+        deactivated = active & (mined >= self.card_target)
+        state[activated] = ACTIVE
+        mined[activated] = 0
+        self._deactivate_cards(cards=deactivated)
+        # acknowledge mining day, cards of expired licences stop mining
+        valid = self.licence_valid
+        self.licence_days_left[valid] -= 1
+        expired = valid & (self.licence_days_left <= 0)
+        if expired.any():
+            valid &= ~expired
+            self._deactivate_cards(cards=(state != DEACTIVATED) & expired[self.card_licence])
+        self._compact()
+        return int(mined_today.sum())
+
+    def _deactivate_cards(self, cards: np.ndarray) -> None:
+        self.card_state[cards] = DEACTIVATED
+        self.licence_num_cards -= np.bincount(self.card_licence[cards], minlength=len(self.licence_num_cards))
+
+    def add_new_cards(self, num_cards: int, cost: int, mines_per_day: int, target: int) -> int:
+        # licences that can accept a card which will be able to mine a profit until the licence expires
+        capacity = self.licence_max_num_cards - self.licence_num_cards
+        eligible = np.flatnonzero(
+            self.licence_valid & (capacity > 0) & (self.licence_days_left > self.licence_card_num_mining_days)
+        )
+        if num_cards <= 0 or len(eligible) == 0:
+            return 0
+        capacity = capacity[eligible]
+        # cards go one by one to the licence with the largest remaining capacity,
+        # this lowers the largest capacities down to a common level
+        if num_cards >= capacity.sum():
+            added = capacity
+        else:
+            level = self._fill_level(capacity=capacity, num_cards=num_cards)
+            added = np.maximum(0, capacity - level)
+            # remaining cards go to licences sitting at the level, most days left first
+            remaining = num_cards - int(added.sum())
+            at_level = np.flatnonzero(capacity >= level)
+            order = np.lexsort((at_level, -self.licence_days_left[eligible[at_level]]))
+            added[at_level[order[:remaining]]] += 1
+        self.add_cards(
+            card_licence=np.repeat(eligible, added),
+            cost=cost,
+            mines_per_day=mines_per_day,
+            target=target,
+        )
+        return int(added.sum())
+
+    @staticmethod
+    def _fill_level(capacity: np.ndarray, num_cards: int) -> int:
+        # lowest level the capacities can be lowered to with at most num_cards cards
+        low, high = 0, int(capacity.max())
+        while low < high:
+            level = (low + high) // 2
+            if int(np.maximum(0, capacity - level).sum()) <= num_cards:
+                high = level
+            else:
+                low = level + 1
+        return low
+
+    def _compact(self) -> None:
+        # drop licences and cards that no longer take part in the simulation once they are the majority
+        live_cards = self.card_state != DEACTIVATED
+        if 2 * np.count_nonzero(live_cards) < len(live_cards):
+            self.card_state = self.card_state[live_cards]
+            self.card_reserved_days_left = self.card_reserved_days_left[live_cards]
+            self.card_mined = self.card_mined[live_cards]
+            self.card_cost = self.card_cost[live_cards]
+            self.card_mines_per_day = self.card_mines_per_day[live_cards]
+            self.card_target = self.card_target[live_cards]
+            self.card_licence = self.card_licence[live_cards]
+        valid = self.licence_valid
+        if 2 * np.count_nonzero(valid) < len(valid):
+            # keep licence order, it breaks ties when adding cards
+            new_index = np.cumsum(valid) - 1
+            self.card_licence = new_index[self.card_licence]
+            self.licence_valid = valid[valid]
+            self.licence_days_left = self.licence_days_left[valid]
+            self.licence_max_num_cards = self.licence_max_num_cards[valid]
+            self.licence_num_cards = self.licence_num_cards[valid]
+            self.licence_card_num_mining_days = self.licence_card_num_mining_days[valid]
@@ -0,0 +1,161 @@
+from decimal import Decimal
+
+import numpy as np
+
+from source.Constants import DEFAULT_CONFIG
+from source.SimulationConfig import SimulationConfig
+from source.licence.LicenceBuilder import LicenceType, LicenceBuilder
+from source.licence.LicenceState import Valid
+from source.mining_unit.MiningCard import MiningCard
+from source.mining_unit.MiningCardState import Reserved, Active
+from source.simulator.VectorizedFleet import VectorizedFleet, RESERVED, ACTIVE
+from source.user.User import User
+from source.utils.NumericBackend import BtcAmount
+
+
+# Advances the user's cards and licences as NumPy arrays, one array operation per step of the day.
+# The user is only read, the final BTC amount is returned.
+class VectorizedSimulator:
+
+    def __init__(
+            self,
+            package_type: LicenceType = LicenceType.PLATINUM,
+            package_num_cards: int = 10,
+            config: SimulationConfig = DEFAULT_CONFIG,
+    ):
+        # licence package bought every day while there is enough time for it to pay off
+        self.package_type = package_type
+        self.package_num_cards = package_num_cards
+        if config.yield_schedule is not None:
+            raise ValueError("VectorizedSimulator needs a constant card yield, use Simulator for a yield schedule")
+        self.config = config
+
+    def simulate(self, user: User, days: int) -> BtcAmount:
+        if user.config != self.config:
+            raise ValueError("user was set up with a different simulation config")
+        numeric = self.config.numeric
+        package_builder = LicenceBuilder(licence_type=self.package_type, config=self.config) \
+            .set_num_cards(num_cards=self.package_num_cards)
+        package_cost = numeric.to_decimal(package_builder.package_cost)
+        card = MiningCard.from_config(self.config)
+        card_cost = numeric.to_decimal(card.cost)
+        card_mines_per_day = numeric.to_decimal(card.mines_btc_per_day)
+        card_target = self._mining_target(card=card)
+        balance = numeric.to_decimal(user.btc_amount)
+        # load user into arrays
+        fleet = VectorizedFleet(
+            places=self._decimal_places(user, balance, package_cost, card_cost, card_mines_per_day, card_target)
+        )
+        self._load_user(fleet=fleet, user=user)
+        balance = fleet.to_units(balance)
+        card_cost = fleet.to_units(card_cost)
+        card_mines_per_day = fleet.to_units(card_mines_per_day)
+        card_target = fleet.to_units(card_target)
+        package_cost = fleet.to_units(package_cost)
+        # simulate mining over days
+        for day in range(1, days + 1):
+            # mine
+            balance += fleet.mine_for_day()
+            # add new licences with cards if there is enough days left for licences to expire
+            if day <= days - 365:
+                num_packages = balance // package_cost
+                if num_packages > 0:
+                    balance -= num_packages * package_cost
+                    licences = fleet.add_licences(
+                        num_licences=num_packages,
+                        days_left=365,
+                        max_num_cards=package_builder.max_cards,
+                        card_num_mining_days=self.config.card_num_mining_days,
+                    )
+                    fleet.add_cards(
+                        card_licence=np.repeat(licences, package_builder.num_cards),
+                        cost=card_cost,
+                        mines_per_day=card_mines_per_day,
+                        target=card_target,
+                    )
+            # add new cards
+            num_cards_added = fleet.add_new_cards(
+                num_cards=balance // card_cost,
+                cost=card_cost,
+                mines_per_day=card_mines_per_day,
+                target=card_target,
+            )
+            balance -= num_cards_added * card_cost
+        # return total BTC amount for the user
+        return numeric.from_decimal(fleet.to_btc(balance))
+
+    @staticmethod
+    def _mining_target(card: MiningCard) -> Decimal:
+        # same target the card computes while mining
+        numeric = card.numeric
+        return numeric.to_decimal(numeric.mining_target(cost=card.cost, profit_threshold=card.profit_threshold))
+
+    def _decimal_places(self, user: User, *amounts: Decimal) -> int:
+        # smallest number of decimal places that represents every BTC amount in the simulation exactly
+        amounts = list(amounts)
+        for licence in user.licences:
+            for cohort in licence.cards.cohorts:
+                card = cohort.card
+                amounts += [
+                    card.numeric.to_decimal(card.cost),
+                    card.numeric.to_decimal(card.mines_btc_per_day),
+                    self._mining_target(card=card),
+                ]
+                if isinstance(card.state, Active):
+                    amounts.append(card.numeric.to_decimal(card.state.mined_btc))
+        return max(0, max(-amount.normalize().as_tuple().exponent for amount in amounts))
+
+    def _load_user(self, fleet: VectorizedFleet, user: User) -> None:
+        # collect a row per licence and per card cohort, then add them to the fleet at once;
+        # licences keep the order User breaks ties between them in
+        licences: list[(int, int, int)] = []
+        cohorts: list[(int, int, int, int, int, int, int, int)] = []
+        for position, licence in enumerate(user.ordered_licences()):
+            # only valid licence can mine
+            if not isinstance(licence.state, Valid):
+                raise RuntimeError(f"Only valid licence can mine")
+            licences.append((licence.state.days_left, licence.max_num_cards, int(licence.card_num_mining_days)))
+            for cohort in licence.cards.cohorts:
+                card = cohort.card
+                match card.state:
+                    case Reserved(days_left=days):
+                        state, reserved_days_left, mined = RESERVED, days, 0
+                    case Active(mined_btc=btc):
+                        state, reserved_days_left, mined = ACTIVE, 0, fleet.to_units(card.numeric.to_decimal(btc))
+                    case _:
+                        raise RuntimeError(f"Mine called on a card in state: {card.state}")
+                cohorts.append((
+                    position,
+                    cohort.count,
+                    fleet.to_units(card.numeric.to_decimal(card.cost)),
+                    fleet.to_units(card.numeric.to_decimal(card.mines_btc_per_day)),
+                    fleet.to_units(self._mining_target(card=card)),
+                    state,
+                    reserved_days_left,
+                    mined,
+                ))
+        if not licences:
+            return
+        days_left, max_num_cards, card_num_mining_days = (np.array(column) for column in zip(*licences))
+        indices = fleet.add_licences(
+            num_licences=len(licences),
+            days_left=days_left,
+            max_num_cards=max_num_cards,
+            card_num_mining_days=card_num_mining_days,
+        )
+        if not cohorts:
+            return
+        columns = [np.array(column, dtype=np.int64) for column in zip(*cohorts)]
+        # one entry per card
+        position, _, cost, mines_per_day, target, state, reserved_days_left, mined = (
+            np.repeat(column, columns[1]) for column in columns
+        )
+        fleet.add_cards(
+            card_licence=indices[position],
+            cost=cost,
+            mines_per_day=mines_per_day,
+            target=target,
+            state=state,
+            reserved_days_left=reserved_days_left,
+            mined=mined,
+        )
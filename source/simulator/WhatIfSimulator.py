@@ -0,0 +1,27 @@
+from source.simulator.Simulator import Simulator
+from source.user.User import User
+from source.utils.NumericBackend import BtcAmount
+
+
+# Runs scenarios that share their first days: the shared prefix is simulated once,
+# then every branch continues from a fork of the user's state.
+# Forking copies licences and card cohorts, card lifecycles are shared, so it costs far less than the prefix.
+class WhatIfSimulator:
+
+    def __init__(self, prefix: Simulator, branches: list[Simulator]):
+        for branch in branches:
+            if branch.config != prefix.config:
+                raise ValueError("branches must run with the prefix's simulation config")
+        self.prefix = prefix
+        self.branches = branches
+
+    def simulate(self, user: User, days: int, fork_day: int) -> list[BtcAmount]:
+        # days 1..fork_day run with the prefix simulator, the rest with each branch
+        if not 0 <= fork_day <= days:
+            raise ValueError(f"fork day must be between 0 and {days}, got {fork_day}")
+        self.prefix.simulate(user=user, days=days, stop_day=fork_day)
+        # return total BTC amount for each branch, in the order of the branches
+        return [
+            branch.simulate(user=user.fork(), days=days, start_day=fork_day)
+            for branch in self.branches
+        ]
@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+from source.SimulationConfig import SimulationConfig
+from source.strategy.Strategy import Strategy
+
+
+@dataclass(frozen=True, eq=False)
+class StrategyEvaluation:
+    strategy: Strategy
+    # final BTC, None if the strategy was pruned
+    final_btc: Decimal | None
+    # day on which the strategy was shown to end below another one, None if it was simulated to the end
+    pruned_on_day: int | None
+    # upper bound on the final BTC when pruned, the final BTC otherwise
+    upper_bound_btc: float
+
+    @property
+    def pruned(self) -> bool:
+        return self.pruned_on_day is not None
+
+
+@dataclass(frozen=True, eq=False)
+class OptimizationResult:
+    # price scenario the strategies ran on
+    config: SimulationConfig
+    invested_btc: Decimal
+    # one evaluation per strategy, in the order of the strategies
+    evaluations: tuple[StrategyEvaluation, ...]
+
+    @property
+    def best(self) -> StrategyEvaluation:
+        # highest final BTC, the first of equal ones; a pruned strategy can not end above it
+        return self.ranking()[0]
+
+    def ranking(self) -> list[StrategyEvaluation]:
+        # strategies simulated to the end, highest final BTC first, equal ones in the order of the strategies
+        finished = [evaluation for evaluation in self.evaluations if not evaluation.pruned]
+        return sorted(finished, key=lambda evaluation: evaluation.final_btc, reverse=True)
+
+    @property
+    def num_pruned(self) -> int:
+        return sum(evaluation.pruned for evaluation in self.evaluations)
+
+    def as_rows(self) -> list[dict]:
+        # flat rows: price scenario, strategy and its outcome
+        return [
+            dict(
+                btc_price=self.config.btc_price,
+                strategy=repr(evaluation.strategy),
+                invested_btc=self.invested_btc,
+                final_btc=evaluation.final_btc,
+                pruned_on_day=evaluation.pruned_on_day,
+                upper_bound_btc=evaluation.upper_bound_btc,
+            )
+            for evaluation in self.evaluations
+        ]
@@ -0,0 +1,52 @@
+from dataclasses import dataclass, fields
+from decimal import Decimal
+from itertools import product
+
+from source.licence.LicenceBuilder import LicenceType
+from source.strategy.Strategy import Strategy, DayState, PurchaseDecision
+
+
+# Buys packages of one kind every day while enough days are left for them, then single cards with the rest,
+# keeping a cash reserve. The defaults are Simulator's original policy: PLATINUM packages with 10 cards
+# while a licence can run its full 365 days, cards until the last day, no reserve.
+@dataclass(frozen=True)
+class PackageStrategy(Strategy):
+    package_type: LicenceType = LicenceType.PLATINUM
+    package_num_cards: int = 10
+    # packages are bought while at least this many days are left, cards while at least stop_cards_days are
+    stop_buying_days: int = 365
+    stop_cards_days: int = 0
+    # BTC never spent
+    reserve_btc: Decimal = Decimal("0")
+
+    def __post_init__(self) -> None:
+        if self.package_num_cards < 0:
+            raise ValueError(f"package_num_cards must not be negative, got {self.package_num_cards}")
+        if self.stop_buying_days < 0 or self.stop_cards_days < 0:
+            raise ValueError("stop days must not be negative")
+        if self.reserve_btc < 0:
+            raise ValueError(f"reserve must not be negative, got {self.reserve_btc}")
+
+    def decide(self, state: DayState) -> PurchaseDecision:
+        days_left = state.days_left
+        reserve = state.config.numeric.from_decimal(self.reserve_btc) if self.reserve_btc else None
+        buy_packages = days_left >= self.stop_buying_days
+        return PurchaseDecision(
+            package_type=self.package_type if buy_packages else None,
+            package_num_cards=self.package_num_cards,
+            max_num_cards=None if days_left >= self.stop_cards_days else 0,
+            reserve=reserve,
+        )
+
+    def cache_key(self) -> str:
+        # the fields decide everything
+        return repr(self)
+
+    @classmethod
+    def grid(cls, **values: list) -> list["PackageStrategy"]:
+        # every combination of the given field values, other fields keep their defaults
+        names = [field.name for field in fields(cls) if field.name in values]
+        unknown = set(values) - set(names)
+        if unknown:
+            raise ValueError(f"unknown strategy fields: {', '.join(sorted(unknown))}")
+        return [cls(**dict(zip(names, combination))) for combination in product(*(values[name] for name in names))]
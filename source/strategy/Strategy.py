@@ -0,0 +1,67 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from source.SimulationConfig import SimulationConfig
+from source.licence.LicenceBuilder import LicenceType
+from source.user.User import User
+from source.utils.NumericBackend import BtcAmount
+
+
+# What a strategy sees on a day, after the day's mining and before anything is bought.
+# Values are read from the user when asked for, a strategy must not change the user.
+@dataclass(frozen=True, eq=False, slots=True)
+class DayState:
+    day: int
+    # last day of the simulation
+    days: int
+    user: User
+
+    @property
+    def days_left(self) -> int:
+        return self.days - self.day
+
+    @property
+    def config(self) -> SimulationConfig:
+        return self.user.config
+
+    @property
+    def btc_amount(self) -> BtcAmount:
+        return self.user.btc_amount
+
+    @property
+    def num_licences(self) -> int:
+        return len(self.user.licences)
+
+    @property
+    def num_active_cards(self) -> int:
+        return self.user.num_active_cards
+
+    @property
+    def daily_mining_rate(self) -> BtcAmount:
+        return self.user.daily_mining_rate
+
+
+# Purchases of one day: licence packages first, then single cards with what is left.
+@dataclass(frozen=True, eq=False, slots=True)
+class PurchaseDecision:
+    # packages of this type with this many cards, None buys no packages
+    package_type: LicenceType | None = None
+    package_num_cards: int = 0
+    # upper limits, None buys as many as the balance allows
+    max_num_packages: int | None = None
+    max_num_cards: int | None = None
+    # BTC kept aside, neither packages nor cards are paid from it; None keeps nothing
+    reserve: BtcAmount | None = None
+
+
+# Decides every day what the user buys. Simulator asks its strategy once per simulated day.
+class Strategy(ABC):
+
+    @abstractmethod
+    def decide(self, state: DayState) -> PurchaseDecision:
+        ...
+
+    def cache_key(self) -> str | None:
+        # identifies the strategy's decisions in result cache keys, equal keys must mean equal decisions;
+        # None leaves results of the strategy out of the cache
+        return None
@@ -0,0 +1,252 @@
+import math
+import multiprocessing
+import os
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import partial
+from itertools import accumulate
+from typing import Callable, Iterable, Sequence
+
+from source.SimulationConfig import SimulationConfig
+from source.licence.LicenceBuilder import LicenceBuilder, LicenceType
+from source.simulator.Simulator import Simulator
+from source.strategy.OptimizationResult import OptimizationResult, StrategyEvaluation
+from source.strategy.Strategy import Strategy
+from source.user.User import User
+
+# relative slack for float rounding, bounds only prune when they are below the incumbent by more than this
+_BOUND_SLACK = 1e-9
+
+
+def cash_multipliers(config: SimulationConfig, days: int) -> list[float]:
+    # Most BTC one BTC available for purchases on day t (index) can grow to by the last day, if cards could
+    # be bought in fractions and always had room: a card bought on day t pays the day's yield from day t + 2
+    # until it reaches its mining target, and the payout is worth what it can grow to from its day.
+    # Kept cash is worth the next day's multiplier. Licences only cost, so no strategy does better.
+    numeric = config.numeric
+    cost = float(numeric.to_decimal(config.card_cost))
+    target = float(numeric.to_decimal(
+        numeric.mining_target(cost=config.card_cost, profit_threshold=config.card_profit_threshold)
+    ))
+    schedule = config.yield_schedule
+    if schedule is not None:
+        if schedule.last_day < days:
+            raise ValueError(f"yield schedule ends on day {schedule.last_day}, the simulation runs {days} days")
+        daily_yield = [float(value) for value in schedule.daily_yield[:days + 1]]
+    else:
+        daily_yield = [float(config.card_daily_yield)] * (days + 1)
+    # cumulative yield from day 1 through each day
+    cumulative = list(accumulate(daily_yield[1:], initial=0.0))
+    multipliers = [1.0] * (days + 2)
+    # sum of yield times multiplier from each day through the last day
+    weighted = [0.0] * (days + 3)
+    for day in range(days, -1, -1):
+        first_day = day + 2
+        if first_day <= days:
+            last_day = bisect_left(cumulative, cumulative[first_day - 1] + target * (1 - _BOUND_SLACK), lo=first_day)
+            if last_day > days:
+                payout = weighted[first_day]
+            else:
+                rest = target - (cumulative[last_day - 1] - cumulative[first_day - 1])
+                payout = weighted[first_day] - weighted[last_day] + rest * multipliers[last_day]
+            multipliers[day] = max(multipliers[day + 1], payout / cost * (1 + _BOUND_SLACK))
+        else:
+            multipliers[day] = multipliers[day + 1]
+        weighted[day] = weighted[day + 1] + daily_yield[day] * multipliers[day]
+    return multipliers
+
+
+def upper_bound(user: User, days: int, multipliers: list[float], limit: float = math.inf) -> float:
+    # Largest final BTC any strategy can reach from the user's state: the balance is spent from the next day,
+    # what the user's cards mine on a day is spent from that day, each worth its day's multiplier.
+    # The user is not changed, its cards are mined on a fork until none are left.
+    # Once the bound is known to reach limit it is not worked out further, math.inf is returned.
+    numeric = user.config.numeric
+    fork = user.fork()
+    value = float(numeric.to_decimal(fork.btc_amount)) * multipliers[fork.num_days_mined + 1]
+    for day in range(fork.num_days_mined + 1, days + 1):
+        before = fork.btc_amount
+        fork.mine_for_day()
+        mined = fork.btc_amount - before
+        if mined:
+            value += float(numeric.to_decimal(mined)) * multipliers[day]
+            if value >= limit:
+                return math.inf
+        elif fork.count_cards() == 0:
+            break
+    return value * (1 + _BOUND_SLACK)
+
+
+# A candidate advanced by a worker: its user is simulated up to stop_day.
+@dataclass(frozen=True, eq=False)
+class _Step:
+    strategy: Strategy
+    user: User
+    stop_day: int
+    days: int
+    multipliers: list[float]
+    # best final BTC of the candidate's scenario so far, bounds only matter once there is one
+    incumbent: float | None
+
+
+# What the worker sends back: the user at stop_day and the upper bound, or the final BTC on the last day.
+@dataclass(frozen=True, eq=False)
+class _Progress:
+    user: User | None
+    upper_bound: float
+    final_btc: Decimal | None
+
+
+def _advance(step: _Step) -> _Progress:
+    # a worker process advances its own copy of the user, in the optimizer's process the user itself moves on
+    user = step.user
+    Simulator(config=user.config, strategy=step.strategy).simulate(
+        user=user, days=step.days, start_day=user.num_days_mined, stop_day=step.stop_day,
+    )
+    if step.stop_day == step.days:
+        final_btc = user.config.numeric.to_decimal(user.btc_amount)
+        return _Progress(user=None, upper_bound=float(final_btc), final_btc=final_btc)
+    if step.incumbent is None:
+        return _Progress(user=user, upper_bound=math.inf, final_btc=None)
+    bound = upper_bound(user=user, days=step.days, multipliers=step.multipliers, limit=step.incumbent)
+    return _Progress(user=user, upper_bound=bound, final_btc=None)
+
+
+class _Candidate:
+
+    def __init__(self, scenario: int, index: int, strategy: Strategy, user: User):
+        self.scenario = scenario
+        self.index = index
+        self.strategy = strategy
+        self.user: User | None = user
+        self.day = 0
+        self.upper_bound = math.inf
+        self.final_btc: Decimal | None = None
+        self.pruned_on_day: int | None = None
+
+    @property
+    def live(self) -> bool:
+        return self.final_btc is None and self.pruned_on_day is None
+
+    def evaluation(self) -> StrategyEvaluation:
+        return StrategyEvaluation(
+            strategy=self.strategy,
+            final_btc=self.final_btc,
+            pruned_on_day=self.pruned_on_day,
+            upper_bound_btc=self.upper_bound,
+        )
+
+
+# Finds the best strategy of a family for each price scenario. Every strategy starts from the same initial
+# package and is simulated in stages, one candidate per worker process at a time (in this process with a
+# single worker). Candidates that are furthest along go first, so finished strategies soon set an incumbent
+# for their scenario. After each stage a candidate's upper bound, the most BTC any purchases could still make
+# of its state, is checked against the incumbent, and a candidate whose bound is below it is dropped: it
+# provably ends below a strategy that was simulated to the end. The best strategy is the same as when
+# simulating every one.
+class StrategyOptimizer:
+
+    def __init__(self, max_workers: int | None = None, num_stages: int = 8):
+        # use every core by default
+        self.max_workers = max_workers or os.cpu_count() or 1
+        if num_stages < 1:
+            raise ValueError(f"num_stages must be at least 1, got {num_stages}")
+        self.num_stages = num_stages
+
+    def optimize(
+            self,
+            strategies: Sequence[Strategy],
+            configs: Iterable[SimulationConfig],
+            days: int,
+            licence_type: LicenceType = LicenceType.PRIME,
+            num_cards: int = 14,
+    ) -> list[OptimizationResult]:
+        # one result per config, in the order of the configs
+        strategies = list(strategies)
+        configs = list(configs)
+        if not strategies:
+            raise ValueError("no strategies to optimize")
+        if days < 1:
+            raise ValueError(f"days must be at least 1, got {days}")
+        stop_days = sorted({days * stage // self.num_stages for stage in range(1, self.num_stages + 1)} - {0})
+        multipliers = []
+        invested = []
+        candidates = []
+        for scenario, config in enumerate(configs):
+            licence, cost = LicenceBuilder(licence_type=licence_type, config=config) \
+                .set_num_cards(num_cards=num_cards) \
+                .build()
+            user = User(licences={licence}, config=config)
+            multipliers.append(cash_multipliers(config=config, days=days))
+            invested.append(config.numeric.to_decimal(cost))
+            candidates.append([
+                _Candidate(
+                    scenario=scenario, index=index, strategy=strategy, user=user if index == 0 else user.fork(),
+                )
+                for index, strategy in enumerate(strategies)
+            ])
+        search = partial(self._search, candidates=candidates, stop_days=stop_days, days=days, multipliers=multipliers)
+        if self.max_workers == 1:
+            search(advance=map)
+        else:
+            with ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+            ) as pool:
+                search(advance=pool.map)
+        return [
+            OptimizationResult(
+                config=config,
+                invested_btc=invested[scenario],
+                evaluations=tuple(candidate.evaluation() for candidate in candidates[scenario]),
+            )
+            for scenario, config in enumerate(configs)
+        ]
+
+    def _search(
+            self,
+            candidates: list[list[_Candidate]],
+            stop_days: list[int],
+            days: int,
+            multipliers: list[list[float]],
+            advance: Callable[[Callable, list[_Step]], Iterable[_Progress]],
+    ) -> None:
+        # advance candidates until every one is finished or pruned
+        incumbents: list[float | None] = [None] * len(candidates)
+        while True:
+            live = [candidate for scenario in candidates for candidate in scenario if candidate.live]
+            if not live:
+                return
+            live.sort(key=lambda candidate: (
+                -candidate.day, -candidate.upper_bound, candidate.scenario, candidate.index,
+            ))
+            batch = live[:self.max_workers]
+            steps = [
+                _Step(
+                    strategy=candidate.strategy,
+                    user=candidate.user,
+                    stop_day=next(day for day in stop_days if day > candidate.day),
+                    days=days,
+                    multipliers=multipliers[candidate.scenario],
+                    incumbent=incumbents[candidate.scenario],
+                )
+                for candidate in batch
+            ]
+            for candidate, step, progress in zip(batch, steps, advance(_advance, steps)):
+                candidate.day = step.stop_day
+                candidate.user = progress.user
+                # a bound found later is not always lower, both hold
+                candidate.upper_bound = min(candidate.upper_bound, progress.upper_bound)
+                candidate.final_btc = progress.final_btc
+                if progress.final_btc is not None:
+                    incumbent = incumbents[candidate.scenario]
+                    incumbents[candidate.scenario] = max(incumbent or 0.0, float(progress.final_btc))
+            for scenario, incumbent in zip(candidates, incumbents):
+                if incumbent is None:
+                    continue
+                for candidate in scenario:
+                    if candidate.live and candidate.upper_bound < incumbent:
+                        candidate.pruned_on_day = candidate.day
+                        candidate.user = None
@@ -0,0 +1,131 @@
+import heapq
+
+from source.licence.Licence import Licence
+
+
+# Licences that can accept a card, ordered like the rule User.add_new_cards applies:
+# largest remaining capacity first, then most days left, then the order the licences were indexed in.
+# Entries are invalidated lazily: only a licence's latest entry counts, and only while its capacity
+# still matches; other entries are dropped (and the licence re-pushed with the current capacity)
+# when they reach the top of the heap.
+# Days left are stored as the day the licence expires, which stays fixed while every licence
+# counts down together. Subclasses index other licence records by overriding the three accessors.
+class LicenceCapacityIndex:
+
+    def __init__(self):
+        self._heap: list[(int, int, int, int, Licence)] = []
+        self._seq = 0
+        # tie breaking rank and sequence number of the latest entry of each indexed licence
+        self._rank: dict[Licence, int] = {}
+        self._latest: dict[Licence, int] = {}
+        self._next_rank = 0
+        self.licences: set[Licence] = set()
+        # heap entries looked at while searching for the best licence
+        self.num_scanned = 0
+
+    def add(self, licence: Licence, day: int) -> None:
+        # (re)index the licence with its current capacity, day is the number of days mined so far
+        self.licences.add(licence)
+        rank = self._rank.get(licence)
+        if rank is None:
+            rank = self._rank[licence] = self._next_rank
+            self._next_rank += 1
+        if self._accepts(licence):
+            entry = (-self._capacity(licence), -self._expiry_day(licence, day), rank, self._seq, licence)
+            heapq.heappush(self._heap, entry)
+            self._latest[licence] = self._seq
+            self._seq += 1
+
+    def remove(self, licences: set[Licence]) -> None:
+        # entries of removed licences are dropped when they reach the top of the heap
+        self.licences -= licences
+        for licence in licences:
+            self._rank.pop(licence, None)
+            self._latest.pop(licence, None)
+        self._drop_stale_entries()
+
+    def sync(self, licences: set[Licence], day: int) -> set[Licence]:
+        # pick up licences that were added or removed without going through the index, return the added ones
+        self.remove(self.licences - licences)
+        added = licences - self.licences
+        for licence in added:
+            self.add(licence=licence, day=day)
+        self._drop_stale_entries()
+        return added
+
+    def best(self, day: int) -> Licence | None:
+        # licence with the largest remaining capacity that can accept a card
+        while self._heap:
+            self.num_scanned += 1
+            entry = self._heap[0]
+            if self._is_current(entry):
+                return entry[4]
+            heapq.heappop(self._heap)
+            licence = entry[4]
+            # capacity changed since the licence's latest entry was pushed
+            if self._latest.get(licence) == entry[3] and licence in self.licences and self._accepts(licence):
+                self.add(licence=licence, day=day)
+        return None
+
+    def distribute(self, num_cards: int, day: int) -> list[(Licence, int)]:
+        # Adding cards one by one to the best licence lowers the largest capacities to a common level.
+        # Find that level in one pass over the licences that receive cards and return how many cards
+        # each of them gets. Licences that get no cards stay indexed, the caller re-adds the others.
+        group: list[((int, int, int, int, Licence), int)] = []
+        level = 0
+        while True:
+            licence = self.best(day=day)
+            next_level = self._capacity(licence) if licence is not None else 0
+            # cards needed to lower every licence taken so far to the next licence's capacity
+            needed = len(group) * (level - next_level)
+            if needed > num_cards:
+                break
+            num_cards -= needed
+            level = next_level
+            if licence is None:
+                break
+            entry = heapq.heappop(self._heap)
+            group.append((entry, next_level))
+        # spread the remaining cards evenly, the leftover goes to licences with the most days left
+        extra = 0
+        if group and level > 0:
+            lowered_by, extra = divmod(num_cards, len(group))
+            level -= lowered_by
+            group.sort(key=lambda taken: taken[0][1:3])
+        allocation = []
+        for position, (entry, capacity) in enumerate(group):
+            licence = entry[4]
+            licence_cards = capacity - level + (1 if position < extra else 0)
+            if licence_cards > 0:
+                allocation.append((licence, licence_cards))
+            else:
+                heapq.heappush(self._heap, entry)
+        return allocation
+
+    def ordered(self, licences: set[Licence]) -> list[Licence]:
+        # licences in the order that breaks ties between equal licences, licences never indexed go first
+        return sorted(licences, key=lambda licence: self._rank.get(licence, -1))
+
+    def _drop_stale_entries(self) -> None:
+        # once they outnumber the licences
+        if len(self._heap) > 2 * len(self.licences) + 64:
+            self._heap = [entry for entry in self._heap if self._is_current(entry)]
+            heapq.heapify(self._heap)
+
+    def _accepts(self, licence: Licence) -> bool:
+        return licence.can_add_mining_card()
+
+    def _capacity(self, licence: Licence) -> int:
+        return licence.max_num_cards - len(licence.cards)
+
+    def _expiry_day(self, licence: Licence, day: int) -> int:
+        return licence.state.days_left + day
+
+    def _is_current(self, entry: (int, int, int, int, Licence)) -> bool:
+        negative_capacity, _, _, seq, licence = entry
+        return (
+                licence in self.licences
+                and self._latest.get(licence) == seq
+                and self._accepts(licence)
+                and self._capacity(licence) == -negative_capacity
+        )
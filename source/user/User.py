@@ -1,64 +1,233 @@
 from dataclasses import dataclass, field
-from decimal import Decimal
+from time import perf_counter
 
-from source.Constants import CARD_COST
+from source.Constants import DEFAULT_CONFIG, NUMERIC
+from source.SimulationConfig import SimulationConfig
 from source.licence.Licence import Licence
 from source.licence.LicenceBuilder import LicenceType, LicenceBuilder
-from source.licence.LicenceState import Expired
-from source.mining_unit.MiningCard import MiningCard
+from source.licence.LicenceState import Expired, Valid
+from source.mining_unit.CardLifecycle import bought_card_lifecycle
+from source.profiling.SimulationStats import SimulationStats, Phase
+from source.user.LicenceCapacityIndex import LicenceCapacityIndex
+from source.utils.DayCalendar import DayCalendar
+from source.utils.NumericBackend import BtcAmount
 
 
 @dataclass
 class User:
     licences: set[Licence] = field(default_factory=set)
-    btc_amount: Decimal = Decimal("0")
+    btc_amount: BtcAmount = NUMERIC.zero
+    config: SimulationConfig = field(default=DEFAULT_CONFIG, repr=False, compare=False)
+    # collects phase times and counters of the daily loop when set
+    stats: SimulationStats | None = field(default=None, repr=False, compare=False)
+    # licences that can accept a card, ordered by remaining capacity
+    _capacity_index: LicenceCapacityIndex = field(
+        default_factory=LicenceCapacityIndex, init=False, repr=False, compare=False
+    )
+    # licences by the day after which they expire
+    _expiry_calendar: DayCalendar[Licence] = field(
+        default_factory=DayCalendar, init=False, repr=False, compare=False
+    )
+    _num_days_mined: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # keep BTC amounts in the representation of the config's numeric backend
+        if self.btc_amount == 0:
+            self.btc_amount = self.config.numeric.zero
+
+    @classmethod
+    def resume(
+            cls,
+            licences: list[Licence],
+            btc_amount: BtcAmount,
+            num_days_mined: int,
+            config: SimulationConfig = DEFAULT_CONFIG,
+    ) -> "User":
+        # user that already mined num_days_mined days, licences are indexed in the given order
+        user = cls(btc_amount=btc_amount, config=config)
+        user._num_days_mined = num_days_mined
+        for licence in licences:
+            user._add_licence(licence=licence)
+        return user
+
+    @property
+    def num_days_mined(self) -> int:
+        return self._num_days_mined
+
+    def ordered_licences(self) -> list[Licence]:
+        # licences in the order that breaks ties when cards are distributed
+        self._sync_licences()
+        return self._capacity_index.ordered(self.licences)
+
+    def take_state(self, other: "User") -> None:
+        # continue from another user's licences and balance, e.g. a restored checkpoint
+        if other.config != self.config:
+            raise ValueError("user was set up with a different simulation config")
+        self.licences = other.licences
+        self.btc_amount = other.btc_amount
+        self._capacity_index = other._capacity_index
+        self._expiry_calendar = other._expiry_calendar
+        self._num_days_mined = other._num_days_mined
+
+    def fork(self) -> "User":
+        # independent copy for continuing the simulation along another branch
+        return User.resume(
+            licences=[licence.fork() for licence in self.ordered_licences()],
+            btc_amount=self.btc_amount,
+            num_days_mined=self._num_days_mined,
+            config=self.config,
+        )
+
+    def _add_licence(self, licence: Licence) -> None:
+        self.licences.add(licence)
+        self._capacity_index.add(licence=licence, day=self._num_days_mined)
+        self._schedule_expiry(licence=licence)
+
+    def _schedule_expiry(self, licence: Licence) -> None:
+        # expired licences are due right away
+        days_left = licence.state.days_left if isinstance(licence.state, Valid) else 0
+        self._expiry_calendar.schedule(self._num_days_mined + days_left, licence)
+
+    def _sync_licences(self) -> None:
+        # track licences that were added to or removed from the user directly
+        if len(self.licences) != len(self._capacity_index.licences):
+            for licence in self._capacity_index.sync(licences=self.licences, day=self._num_days_mined):
+                self._schedule_expiry(licence=licence)
 
     def _remove_expired_licences(self) -> None:
-        # collect expired licences
-        expired_licences = {licence for licence in self.licences if isinstance(licence.state, Expired)}
+        self._sync_licences()
+        # collect licences due to expire today
+        expired_licences = set()
+        for licence in self._expiry_calendar.pop(self._num_days_mined):
+            if licence not in self.licences:
+                continue
+            if isinstance(licence.state, Expired):
+                expired_licences.add(licence)
+            else:
+                # state was changed outside of the daily loop
+                self._schedule_expiry(licence=licence)
         # remove expired licences
         self.licences -= expired_licences
+        self._capacity_index.remove(licences=expired_licences)
 
     def mine_for_day(self) -> None:
+        if self.stats is not None:
+            self._mine_for_day_with_stats(stats=self.stats)
+            return
+        self._mine_licences_for_day()
+        # remove expired licences
+        self._remove_expired_licences()
+
+    def _mine_licences_for_day(self) -> None:
+        self._sync_licences()
+        self._num_days_mined += 1
+        self._mine_licences()
+
+    def _mine_for_day_with_stats(self, stats: SimulationStats) -> None:
+        # the steps of mine_for_day timed, with the work counted outside the timed parts
+        self._sync_licences()
+        fleets = [licence.cards for licence in self.licences]
+        num_cards = sum(len(fleet) for fleet in fleets)
+        stats.days += 1
+        stats.licences_mined += len(fleets)
+        # scheduled cohorts are mined through the running rates, only stepped cohorts touch their cards
+        stats.cohorts_touched += sum(fleet.num_stepped_cohorts for fleet in fleets)
+        stats.cards_touched += sum(fleet.num_stepped_cards for fleet in fleets)
+        num_rate_changes = sum(fleet.num_rate_changes for fleet in fleets)
+        # states are updated in place, only cards that become active get a new one
+        stats.states_allocated += sum(fleet.num_activating_cohorts for fleet in fleets)
+        mining = perf_counter()
+        self._mine_licences_for_day()
+        mined = perf_counter()
+        stats.cards_deactivated += num_cards - sum(len(fleet) for fleet in fleets)
+        stats.rate_changes += sum(fleet.num_rate_changes for fleet in fleets) - num_rate_changes
+        num_licences = len(self.licences)
+        self._remove_expired_licences()
+        removed = perf_counter()
+        stats.licences_expired += num_licences - len(self.licences)
+        stats.add_time(Phase.MINING, mined - mining)
+        stats.add_time(Phase.EXPIRED_LICENCE_REMOVAL, removed - mined)
+
+    def _mine_licences(self) -> None:
         # mine with each licence
         for licence in self.licences:
+            num_cards = len(licence.cards)
             self.btc_amount += licence.get_daily_mining_amount()
-        # remove expired licences
-        self._remove_expired_licences()
+            # deactivated cards freed capacity
+            if len(licence.cards) < num_cards:
+                self._capacity_index.add(licence=licence, day=self._num_days_mined)
 
-    def add_new_licence_with_cards(self, licence_type: LicenceType, num_cards: int) -> None:
+    @property
+    def num_active_cards(self) -> int:
+        # cards that mine on the next day
+        return sum(licence.num_active_cards for licence in self.licences)
+
+    @property
+    def daily_mining_rate(self) -> BtcAmount:
+        # amount mined on the next day, from the licences' running aggregates
+        return sum((licence.daily_mining_rate for licence in self.licences), self.config.numeric.zero)
+
+    @property
+    def days_until_change(self) -> int | None:
+        # mining days before any card changes state or any licence expires, None without valid licences
+        days = [licence.days_until_change for licence in self.licences]
+        return min((day for day in days if day is not None), default=None)
+
+    def count_cards(self) -> int:
+        # cards that were not deactivated yet, reserved cards included
+        return sum(len(licence.cards) for licence in self.licences)
+
+    def add_new_licence_with_cards(
+            self,
+            licence_type: LicenceType,
+            num_cards: int,
+            max_num_packages: int | None = None,
+            reserve: BtcAmount | None = None,
+    ) -> int:
         # configure a builder to construct a licence with initial cards
-        licence_builder = LicenceBuilder(licence_type=licence_type).set_num_cards(num_cards=num_cards)
-        # get a licence with cards and cost
-        licence, cost = licence_builder.build()
-        # keep buying packages until there is enough BTC
-        while self.btc_amount >= cost:
-            # pay for licence with cards
-            self.btc_amount -= cost
-            # add licence with cards to user
-            self.licences.add(licence)
-            # build new licence with cards package
-            licence, cost = licence_builder.build()
-
-    def add_new_cards(self) -> int:
+        licence_builder = LicenceBuilder(licence_type=licence_type, config=self.config, day=self._num_days_mined) \
+            .set_num_cards(num_cards=num_cards)
+        # buy as many packages as there is enough BTC above the reserve for, none if their cards could not pay off
+        budget = self.btc_amount if reserve is None else self.btc_amount - reserve
+        num_packages = int(budget // licence_builder.package_cost) if licence_builder.cards_fit else 0
+        if max_num_packages is not None:
+            num_packages = min(num_packages, max_num_packages)
+        if num_packages <= 0:
+            return 0
+        # get licences with cards and their cost
+        licences, cost = licence_builder.build_batch(num_packages=num_packages)
+        # pay for licences with cards
+        self.btc_amount -= cost
+        # add licences with cards to user
+        for licence in licences:
+            self._add_licence(licence=licence)
+        # return number of added licences
+        return num_packages
+
+    def add_new_cards(self, max_num_cards: int | None = None, reserve: BtcAmount | None = None) -> int:
+        self._sync_licences()
+        # number of cards there is enough BTC above the reserve for
+        budget = self.btc_amount if reserve is None else self.btc_amount - reserve
+        num_cards = int(budget // self.config.card_cost)
+        if max_num_cards is not None:
+            num_cards = min(num_cards, max_num_cards)
+        if num_cards <= 0:
+            return 0
+        # Distribute the cards like adding them one by one to the best licence:
+        # - can_add_mining_card() is True
+        # - has the largest remaining capacity
+        # - on equal capacity, has the most days left
         num_cards_added = 0
-        while self.btc_amount >= CARD_COST:
-            # Find the best licence to add a card:
-            # - can_add_mining_card() is True
-            # - has the largest remaining capacity
-            licence = max(
-                (licence for licence in self.licences if licence.can_add_mining_card()),
-                key=lambda l: l.max_num_cards - len(l.cards),
-                default=None,
-            )
-            # skip adding cards if no licence can add mining card
-            if licence is None:
-                break
-            # pay for card
-            self.btc_amount -= CARD_COST
-            # Add card
-            licence.cards.add(MiningCard())
-            # acknowledge card added
-            num_cards_added += 1
+        lifecycle = bought_card_lifecycle(self.config, day=self._num_days_mined)
+        num_scanned = self._capacity_index.num_scanned
+        for licence, licence_cards in self._capacity_index.distribute(num_cards=num_cards, day=self._num_days_mined):
+            # cards bought together follow the same trajectory -> add them as one cohort
+            licence.add_new_mining_cards(lifecycle=lifecycle, num_cards=licence_cards)
+            self._capacity_index.add(licence=licence, day=self._num_days_mined)
+            num_cards_added += licence_cards
+        if self.stats is not None:
+            self.stats.licences_scanned += self._capacity_index.num_scanned - num_scanned
+        # pay for cards
+        self.btc_amount -= num_cards_added * self.config.card_cost
         # return number of added cards
         return num_cards_added
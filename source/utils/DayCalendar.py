@@ -0,0 +1,39 @@
+from heapq import heappush, heappop
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+# Items bucketed by the day they are due, so each day only touches the items due that day.
+class DayCalendar(Generic[T]):
+
+    def __init__(self):
+        self._days: dict[int, list[T]] = {}
+        # days with items, as a heap; days popped from the calendar are dropped lazily
+        self._order: list[int] = []
+
+    def schedule(self, day: int, item: T) -> None:
+        items = self._days.get(day)
+        if items is None:
+            self._days[day] = [item]
+            heappush(self._order, day)
+        else:
+            items.append(item)
+
+    def pop(self, day: int) -> list[T]:
+        # remove and return the items due on the day
+        items = self._days.pop(day, [])
+        order = self._order
+        while order and order[0] not in self._days:
+            heappop(order)
+        return items
+
+    def next_day(self) -> int | None:
+        # earliest day with items due, None if the calendar is empty
+        order = self._order
+        while order and order[0] not in self._days:
+            heappop(order)
+        return order[0] if order else None
+
+    def __len__(self) -> int:
+        return sum(len(items) for items in self._days.values())
@@ -0,0 +1,82 @@
+from abc import ABC, abstractmethod
+from decimal import Decimal, ROUND_HALF_EVEN
+from functools import cache
+
+# BTC amount as represented by a numeric backend
+BtcAmount = Decimal | int
+
+# smallest BTC amount, the quantum round_btc rounds to
+BTC_QUANTUM = Decimal("0.0000000001")
+BTC_QUANTUM_PLACES = 10
+
+_ONE = Decimal("1")
+_HUNDRED = Decimal("100")
+
+
+class NumericBackend(ABC):
+    # zero BTC
+    zero: BtcAmount
+
+    # backends hold no state, instances of the same backend are interchangeable
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other)
+
+    def __hash__(self) -> int:
+        return hash(type(self))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+    @abstractmethod
+    def from_decimal(self, value: Decimal) -> BtcAmount:
+        ...
+
+    @abstractmethod
+    def to_decimal(self, value: BtcAmount) -> Decimal:
+        ...
+
+    @abstractmethod
+    def mining_target(self, cost: BtcAmount, profit_threshold: Decimal) -> BtcAmount:
+        # amount a card has to mine to return its cost plus profit_threshold percent
+        ...
+
+
+class DecimalBackend(NumericBackend):
+    # BTC amounts are Decimals
+
+    zero = Decimal("0")
+
+    def from_decimal(self, value: Decimal) -> Decimal:
+        return value
+
+    def to_decimal(self, value: Decimal) -> Decimal:
+        return value
+
+    def mining_target(self, cost: Decimal, profit_threshold: Decimal) -> Decimal:
+        return (_ONE + (profit_threshold / _HUNDRED)) * cost
+
+
+class FixedPointBackend(NumericBackend):
+    # BTC amounts are ints counting BTC_QUANTUM units
+
+    zero = 0
+
+    def from_decimal(self, value: Decimal) -> int:
+        units = value.scaleb(BTC_QUANTUM_PLACES)
+        if units != units.to_integral_value():
+            raise ValueError(f"{value} BTC is not a multiple of {BTC_QUANTUM} BTC")
+        return int(units)
+
+    def to_decimal(self, value: int) -> Decimal:
+        # exact, every int is a whole number of quanta
+        return Decimal(value).scaleb(-BTC_QUANTUM_PLACES)
+
+    def mining_target(self, cost: int, profit_threshold: Decimal) -> int:
+        return _fixed_point_mining_target(cost=cost, profit_threshold=profit_threshold)
+
+
+@cache
+def _fixed_point_mining_target(cost: int, profit_threshold: Decimal) -> int:
+    # the target is the only amount that falls between quanta, round it like round_btc does
+    target = Decimal(cost) * (_HUNDRED + profit_threshold) / _HUNDRED
+    return int(target.to_integral_value(rounding=ROUND_HALF_EVEN))
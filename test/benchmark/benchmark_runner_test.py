@@ -0,0 +1,65 @@
+from source.benchmark.BenchmarkCase import BenchmarkCase, BenchmarkTarget, scale_matrix
+from source.benchmark.BenchmarkResult import BenchmarkResult
+from source.benchmark.BenchmarkRunner import BenchmarkRunner, main
+from source.licence.Licence import Licence
+from source.user.User import User
+
+
+def _result(case: str, days_per_second: float, peak_memory_bytes: int) -> BenchmarkResult:
+    return BenchmarkResult(case=case, days_per_second=days_per_second, seconds=1.0, peak_memory_bytes=peak_memory_bytes)
+
+
+def test_scale_matrix_covers_every_target():
+    cases = scale_matrix(num_licences=(1, 10), cards_per_licence=(14,), days=(30, 60))
+
+    assert len(cases) == 2 * 2 * len(BenchmarkTarget)
+    assert len({case.name for case in cases}) == len(cases)
+    assert BenchmarkCase(BenchmarkTarget.ADD_NEW_CARDS, 10, 14, 60).name == "User.add_new_cards[10x14x60]"
+
+
+def test_run_measures_every_target():
+    mine_for_day = User.mine_for_day
+    licence_mining = Licence.get_daily_mining_amount
+
+    results = BenchmarkRunner(repeat=1).run(cases=scale_matrix(num_licences=(2,), cards_per_licence=(14,), days=(30,)))
+
+    assert [result.case for result in results] == [
+        "Simulator.simulate[2x14x30]", "User.mine_for_day[2x14x30]",
+        "User.add_new_cards[2x14x30]", "Licence.get_daily_mining_amount[2x14x30]",
+    ]
+    assert all(result.days_per_second > 0 and result.peak_memory_bytes > 0 for result in results)
+    # timed methods are restored
+    assert User.mine_for_day is mine_for_day
+    assert Licence.get_daily_mining_amount is licence_mining
+
+
+def test_save_and_load(tmp_path):
+    path = tmp_path / "baseline.json"
+    results = [_result("a", 100.0, 1000), _result("b", 50.5, 2000)]
+
+    BenchmarkRunner.save(results=results, path=path)
+
+    assert BenchmarkRunner.load(path=path) == {"a": results[0], "b": results[1]}
+
+
+def test_find_regressions():
+    baseline = {"slower": _result("slower", 100.0, 1000), "bigger": _result("bigger", 100.0, 1000),
+                "noise": _result("noise", 100.0, 1000)}
+    results = [_result("slower", 70.0, 1000), _result("bigger", 120.0, 1500), _result("noise", 85.0, 1100),
+               _result("new", 1.0, 10 ** 9)]
+
+    regressions = BenchmarkRunner.find_regressions(baseline=baseline, results=results, threshold=0.2)
+
+    assert [(regression.case, regression.metric) for regression in regressions] == [
+        ("slower", "days_per_second"), ("bigger", "peak_memory_bytes"),
+    ]
+    assert str(regressions[0]) == "slower: days_per_second 100 -> 70 (-30.0%)"
+
+
+def test_main_saves_baseline(tmp_path, capsys):
+    path = tmp_path / "baseline.json"
+
+    assert main(["--quick", "--repeat", "1", "--save", "--baseline", str(path)]) == 0
+
+    assert len(BenchmarkRunner.load(path=path)) == 2 * len(BenchmarkTarget)
+    assert "baseline saved" in capsys.readouterr().out
@@ -0,0 +1,180 @@
+import os
+import time
+from decimal import Decimal
+
+import pytest
+
+from source.cache.CachedResult import CachedResult
+from source.cache.ResultCache import ResultCache, engine_version
+from source.licence.LicenceBuilder import LicenceBuilder, LicenceType
+from source.output.ColumnarRecorder import ColumnarRecorder
+from source.output.DayRecord import DayRecord
+from source.profiling.SimulationStats import SimulationStats
+from source.simulator.Scenario import Scenario
+from source.simulator.Simulator import Simulator
+from source.simulator.SweepRunner import run_scenario
+from source.strategy.PackageStrategy import PackageStrategy
+from source.strategy.Strategy import Strategy, DayState, PurchaseDecision
+from source.user.User import User
+
+
+class _CountingSimulator(Simulator):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.num_days_simulated = 0
+
+    def _simulate_day(self, user: User, day: int, days: int) -> (int, int, int):
+        self.num_days_simulated += 1
+        return super()._simulate_day(user=user, day=day, days=days)
+
+
+# no cache key of its own, repr shows only the object's address
+class _StopCardsAfter(Strategy):
+
+    def __init__(self, day: int):
+        self.day = day
+
+    def decide(self, state: DayState) -> PurchaseDecision:
+        return PurchaseDecision(max_num_cards=None if state.day <= self.day else 0)
+
+
+def _user(btc_amount: Decimal = Decimal("0.05")) -> User:
+    licence, _ = LicenceBuilder(licence_type=LicenceType.PRIME).set_num_cards(num_cards=14).build()
+    return User(licences={licence}, btc_amount=btc_amount)
+
+
+def test_key_is_stable_and_separates_parts():
+    assert ResultCache.key("ab", "c") == ResultCache.key("ab", "c")
+    assert ResultCache.key("ab", "c") != ResultCache.key("a", "bc")
+    assert ResultCache.key(b"x") == ResultCache.key("x")
+    # the code version is a hash of the source files
+    assert engine_version() == engine_version()
+    assert len(engine_version()) == 64
+
+
+def test_round_trip(tmp_path):
+    cache = ResultCache(directory=str(tmp_path))
+    result = CachedResult(
+        btc_amount=Decimal("0.1234567890"),
+        series=(DayRecord(day=1, btc_amount=Decimal("0.1"), num_cards_added=2),),
+        state=b"\x00\x01",
+    )
+    cache.put("k", result)
+    assert cache.get("k") == result
+    assert cache.get("missing") is None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(directory=str(tmp_path), max_bytes=200)
+    for key in ["a", "b", "c"]:
+        cache.put(key, CachedResult(btc_amount=Decimal("1")))
+        # distinct modification times
+        time.sleep(0.01)
+    size = os.path.getsize(tmp_path / "a.json")
+    cache = ResultCache(directory=str(tmp_path), max_bytes=3 * size)
+    cache.get("a")
+    cache.put("d", CachedResult(btc_amount=Decimal("2")))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None and cache.get("d") is not None
+    assert len(cache) == 3
+
+
+def test_puts_scan_the_directory_only_beyond_the_limit(tmp_path, monkeypatch):
+    cache = ResultCache(directory=str(tmp_path), max_bytes=900)
+    scans = []
+    listdir = os.listdir
+    monkeypatch.setattr(os, "listdir", lambda path: scans.append(path) or listdir(path))
+
+    for key in ["a", "b", "a"]:
+        cache.put(key, CachedResult(btc_amount=Decimal("1")))
+    assert scans == []
+    # a replaced result counts once
+    assert cache._total_bytes == 2 * os.path.getsize(tmp_path / "a.json")
+    cache.put("c", CachedResult(btc_amount=Decimal("1"), state=b"\x00" * 600))
+
+    assert len(scans) == 1
+    assert cache.get("c") is not None
+    assert len(cache) == 2
+    assert cache._total_bytes == sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+
+
+def test_simulator_serves_identical_run_from_cache(tmp_path):
+    cache = ResultCache(directory=str(tmp_path))
+    first = _CountingSimulator(cache=cache)
+    expected_user = _user()
+    expected = first.simulate(user=expected_user, days=500)
+
+    second = _CountingSimulator(cache=cache)
+    user = _user()
+    btc_amount = second.simulate(user=user, days=500)
+
+    assert first.num_days_simulated == 500
+    assert second.num_days_simulated == 0
+    assert btc_amount == expected == user.btc_amount
+    assert user.num_days_mined == 500
+    assert user.count_cards() == expected_user.count_cards()
+    # a different horizon is another scenario
+    assert _CountingSimulator(cache=cache).simulate(user=_user(), days=300) != expected
+
+
+def test_cached_series_is_replayed(tmp_path):
+    cache = ResultCache(directory=str(tmp_path))
+    _CountingSimulator(cache=cache).simulate(user=_user(), days=50)
+    # first run stored no series, so a listening run simulates again and stores it
+    recorded = ColumnarRecorder()
+    simulator = _CountingSimulator(cache=cache, sink=recorded)
+    simulator.simulate(user=_user(), days=50)
+    assert simulator.num_days_simulated == 50
+    replayed = ColumnarRecorder()
+    simulator = _CountingSimulator(cache=cache, sink=replayed)
+    simulator.simulate(user=_user(), days=50)
+    assert simulator.num_days_simulated == 0
+    assert replayed.columns() == recorded.columns()
+
+
+def test_profiled_runs_skip_the_cache(tmp_path):
+    cache = ResultCache(directory=str(tmp_path))
+    _CountingSimulator(cache=cache).simulate(user=_user(), days=50)
+    stats = SimulationStats()
+    simulator = _CountingSimulator(cache=cache, stats=stats)
+    simulator.simulate(user=_user(), days=50)
+
+    assert simulator.num_days_simulated == 50
+    assert stats.days == 50
+    assert len(cache) == 1
+
+
+def test_strategies_without_cache_key_are_always_simulated(tmp_path):
+    cache = ResultCache(directory=str(tmp_path))
+    # built one after another, the second strategy may reuse the first one's address
+    results = []
+    for day in [100, 10]:
+        simulator = _CountingSimulator(cache=cache, strategy=_StopCardsAfter(day=day))
+        results.append(simulator.simulate(user=_user(), days=200))
+        assert simulator.num_days_simulated == 200
+
+    assert results == [
+        Simulator(strategy=_StopCardsAfter(day=day)).simulate(user=_user(), days=200) for day in [100, 10]
+    ]
+    assert results[0] != results[1]
+    assert len(cache) == 0
+    # strategies with a cache key are cached
+    _CountingSimulator(cache=cache, strategy=PackageStrategy()).simulate(user=_user(), days=200)
+    assert len(cache) == 1
+
+
+def test_sweep_scenarios_use_cache(tmp_path):
+    cache = ResultCache(directory=str(tmp_path))
+    scenario = Scenario(days=40)
+    assert run_scenario(scenario=scenario, cache=cache) == run_scenario(scenario=scenario)
+    assert len(cache) == 1
+    assert run_scenario(scenario=scenario, cache=cache).final_btc == Decimal("0.0019444614")
+    # a config constant the scenario does not set is part of the key
+    cache.put(ResultCache.key("scenario", repr(scenario)), CachedResult(btc_amount=Decimal("1")))
+    assert run_scenario(scenario=scenario, cache=cache).final_btc == Decimal("0.0019444614")
+
+
+def test_rejects_empty_cache(tmp_path):
+    with pytest.raises(ValueError):
+        ResultCache(directory=str(tmp_path), max_bytes=0)
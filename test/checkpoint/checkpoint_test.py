@@ -0,0 +1,107 @@
+from decimal import Decimal
+
+import pytest
+
+from source.SimulationConfig import SimulationConfig
+from source.checkpoint.Checkpoint import dump_checkpoint, load_checkpoint, MAGIC
+from source.licence.Licence import Licence
+from source.licence.LicenceBuilder import LicenceBuilder, LicenceType
+from source.licence.LicenceState import Valid
+from source.mining_unit.MiningCard import MiningCard
+from source.mining_unit.MiningCardState import Active, Reserved
+from source.mining_unit.YieldSchedule import YieldSchedule
+from source.simulator.Simulator import Simulator
+from source.user.User import User
+from source.utils.NumericBackend import FixedPointBackend
+
+
+def _user(btc_amount: Decimal, config: SimulationConfig = SimulationConfig()) -> User:
+    licence, _ = LicenceBuilder(licence_type=LicenceType.PRIME, config=config).set_num_cards(num_cards=14).build()
+    return User(licences={licence}, btc_amount=config.numeric.from_decimal(btc_amount), config=config)
+
+
+def _run_until(user: User, days: int, stop_day: int) -> None:
+    for snapshot in Simulator(config=user.config).iter_days(user=user, days=days):
+        if snapshot.day == stop_day:
+            return
+
+
+_HALVING = YieldSchedule.decaying(
+    initial_yield=Decimal("0.0000245"), days=900, daily_decay=Decimal("0.0002"), halving_days=[500],
+)
+
+
+@pytest.mark.parametrize("config", [
+    SimulationConfig(),
+    SimulationConfig(numeric=FixedPointBackend()),
+    SimulationConfig(yield_schedule=_HALVING),
+    SimulationConfig(numeric=FixedPointBackend(), yield_schedule=_HALVING),
+])
+def test_resumed_simulation_matches_uninterrupted_run(config):
+    days = 900
+    expected = Simulator(config=config).simulate(user=_user(btc_amount=Decimal("0.5"), config=config), days=days)
+    user = _user(btc_amount=Decimal("0.5"), config=config)
+    _run_until(user=user, days=days, stop_day=400)
+
+    resumed, day = load_checkpoint(dump_checkpoint(user=user, day=400))
+
+    assert day == 400
+    assert resumed.config == config
+    assert resumed.btc_amount == user.btc_amount
+    assert resumed.count_cards() == user.count_cards()
+    assert len(resumed.licences) == len(user.licences)
+    assert all(licence.numeric == config.numeric for licence in resumed.licences)
+    assert Simulator(config=config).simulate(user=resumed, days=days, start_day=day) == expected
+
+
+def test_checkpoint_keeps_card_states():
+    card = MiningCard(state=Active(mined_btc=Decimal("0.001")))
+    licence = Licence(cost=Decimal("0.01"), max_num_cards=5, state=Valid(days_left=300))
+    licence.add_mining_card(card, num_cards=2)
+    licence.add_mining_card(MiningCard(state=Reserved(days_left=3)))
+    user = User(licences={licence}, btc_amount=Decimal("0.0123"))
+
+    resumed, _ = load_checkpoint(dump_checkpoint(user=user, day=0))
+
+    resumed_licence, = resumed.licences
+    assert resumed_licence.state == Valid(days_left=300)
+    assert resumed_licence.cost == Decimal("0.01")
+    assert [card.state for card in resumed_licence.cards] == [
+        Active(mined_btc=Decimal("0.001")), Active(mined_btc=Decimal("0.001")), Reserved(days_left=3),
+    ]
+    assert resumed.btc_amount == Decimal("0.0123")
+
+
+def test_checkpoint_is_compact():
+    user = _user(btc_amount=Decimal("2"))
+    _run_until(user=user, days=800, stop_day=300)
+    data = dump_checkpoint(user=user, day=300)
+    assert data.startswith(MAGIC)
+    assert len(data) < 64 * (len(user.licences) + 1) + sum(len(licence.cards.cohorts) for licence in user.licences) * 16
+
+
+def test_load_rejects_other_data():
+    data = dump_checkpoint(user=_user(btc_amount=Decimal("0")), day=0)
+    with pytest.raises(ValueError, match="not a simulation checkpoint"):
+        load_checkpoint(b"PK" + data)
+    with pytest.raises(ValueError, match="unsupported checkpoint version"):
+        load_checkpoint(MAGIC + (99).to_bytes(4, "little") + data[8:])
+    with pytest.raises(ValueError, match="truncated"):
+        load_checkpoint(data[:-3])
+
+
+def test_checkpoint_keeps_long_decimals():
+    btc_amount = Decimal("0." + "1234567890" * 40)
+    user = User(licences=set(), btc_amount=btc_amount)
+
+    resumed, _ = load_checkpoint(dump_checkpoint(user=user, day=0))
+
+    assert resumed.btc_amount == btc_amount
+
+
+def test_load_rejects_corrupt_decimals():
+    data = dump_checkpoint(user=User(licences=set(), btc_amount=Decimal("0.0123")), day=0)
+    assert data.count(b"0.0123") == 1
+
+    with pytest.raises(ValueError, match="invalid decimal '0.0x23'"):
+        load_checkpoint(data.replace(b"0.0123", b"0.0x23"))
@@ -34,6 +34,7 @@ def test_cards_cost_calculation():
 
     assert builder.cards_cost == Decimal("10") * CARD_COST
 
+
 def test_build_adds_cards():
     builder = LicenceBuilder(licence_type=LicenceType.PRIME).set_num_cards(num_cards=5)
 
@@ -41,6 +42,7 @@ def test_build_adds_cards():
 
     assert len(licence.cards) == 5
 
+
 def test_package_cost():
     builder = LicenceBuilder(licence_type=LicenceType.PRIME).set_num_cards(num_cards=3)
 
@@ -48,3 +50,14 @@ def test_package_cost():
 
     expected_cost = PRIME_LICENCE_COST + Decimal("3") * CARD_COST
     assert package_cost == expected_cost
+
+
+def test_build_batch():
+    builder = LicenceBuilder(licence_type=LicenceType.PLATINUM).set_num_cards(num_cards=10)
+
+    licences, cost = builder.build_batch(num_packages=3)
+
+    assert len(licences) == 3
+    assert len({id(licence) for licence in licences}) == 3
+    assert all(len(licence.cards) == 10 for licence in licences)
+    assert cost == 3 * (PLATINUM_LICENCE_COST + Decimal("10") * CARD_COST)
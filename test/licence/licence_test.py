@@ -316,3 +316,65 @@ def test_licence_full_lifecycle():
     mined = licence.get_daily_mining_amount()
     assert mined == Decimal("0.2")  # 0.1 + 0.1, reached target mining amount
     assert len(licence.cards) == 0  # cards were deactivated and removed
+
+
+def test_add_mining_card_cohort_respects_capacity():
+    licence = Licence(
+        cost=PRIME_LICENCE_COST,
+        max_num_cards=5,
+    )
+    licence.add_mining_card(MiningCard(), num_cards=4)
+
+    assert len(licence.cards) == 4
+    assert licence.can_add_mining_card() is True
+    assert licence.can_add_mining_card(num_cards=2) is False
+    with pytest.raises(RuntimeError, match=f"Should not add a new card"):
+        licence.add_mining_card(MiningCard(), num_cards=2)
+
+
+def test_licence_state_counts_down_in_place():
+    licence = Licence(cost=PRIME_LICENCE_COST, max_num_cards=5, state=Valid(days_left=2))
+    state = licence.state
+
+    licence.get_daily_mining_amount()
+    assert licence.state is state
+    assert state == Valid(days_left=1)
+    licence.get_daily_mining_amount()
+
+    assert licence.state is Expired()
+    assert not hasattr(state, "__dict__")
+
+
+def test_fork_has_its_own_states():
+    licence = Licence(cost=PRIME_LICENCE_COST, max_num_cards=5, state=Valid(days_left=10))
+    licence.cards.add(MiningCard(state=Active(mined_btc=Decimal("0"))))
+
+    fork = licence.fork()
+    fork.get_daily_mining_amount()
+
+    assert licence.state == Valid(days_left=10)
+    assert fork.state == Valid(days_left=9)
+    assert next(iter(licence.cards)).state == Active(mined_btc=Decimal("0"))
+    assert next(iter(fork.cards)).state == Active(mined_btc=CARD_MINES_BTC_PER_DAY)
+
+
+def test_running_aggregates_cover_stepped_cards_and_expiry():
+    licence = Licence(cost=PRIME_LICENCE_COST, max_num_cards=5, state=Valid(days_left=3))
+    # added directly, the licence would refuse cards this close to expiry
+    licence.cards.add(MiningCard(state=Active(mined_btc=Decimal("0"))), num_cards=2)
+    licence.cards.add(MiningCard())
+
+    assert licence.num_active_cards == 2
+    assert licence.daily_mining_rate == 2 * CARD_MINES_BTC_PER_DAY
+    # stepped cards are only known a day ahead
+    assert licence.days_until_change == 1
+    licence.get_daily_mining_amount()
+    assert licence.num_active_cards == 3
+    licence.get_daily_mining_amount()
+    licence.get_daily_mining_amount()
+
+    assert licence.num_active_cards == 0
+    # zero of the licence's numeric backend
+    assert licence.daily_mining_rate == Decimal("0")
+    assert isinstance(licence.daily_mining_rate, Decimal)
+    assert licence.days_until_change is None
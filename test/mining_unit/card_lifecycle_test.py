@@ -0,0 +1,109 @@
+import pickle
+from decimal import Decimal
+
+import pytest
+
+from source.Constants import NUMERIC
+from source.SimulationConfig import SimulationConfig
+from source.mining_unit.CardLifecycle import (
+    bought_card_lifecycle, card_lifecycle, new_card_lifecycle, scheduled_card_lifecycle,
+)
+from source.mining_unit.MiningCard import MiningCard
+from source.mining_unit.MiningCardState import Reserved, Active, Deactivated
+from source.mining_unit.YieldSchedule import YieldSchedule, yield_table
+
+
+def _lifecycle():
+    return card_lifecycle(
+        cost=Decimal("1"),
+        mines_btc_per_day=Decimal("0.5"),
+        profit_threshold=Decimal("10"),
+        reserved_days=1,
+        numeric=NUMERIC,
+    )
+
+
+def test_daily_yield():
+    lifecycle = _lifecycle()
+
+    # activation day, two full days, partial day up to the 1.1 target
+    assert lifecycle.daily_yield == (Decimal("0"), Decimal("0.5"), Decimal("0.5"), Decimal("0.1"))
+    assert lifecycle.num_days == 4
+
+
+def test_lifecycle_is_memoized():
+    assert _lifecycle() is _lifecycle()
+
+
+def test_mined_between_uses_prefix_sums():
+    lifecycle = _lifecycle()
+
+    assert lifecycle.mined_between(from_age=1, to_age=3) == Decimal("1.0")
+    assert lifecycle.mined_between(from_age=0, to_age=100) == Decimal("1.1")
+
+
+def test_state_at():
+    lifecycle = _lifecycle()
+
+    assert lifecycle.state_at(age=0) == Reserved(days_left=1)
+    assert lifecycle.state_at(age=1) == Active(mined_btc=Decimal("0"))
+    assert lifecycle.state_at(age=3) == Active(mined_btc=Decimal("1.0"))
+    assert isinstance(lifecycle.state_at(age=4), Deactivated)
+
+
+def test_default_card_matches_stepped_card():
+    lifecycle = new_card_lifecycle(MiningCard())
+    card = MiningCard()
+
+    for age in range(lifecycle.num_days):
+        assert card.get_daily_mining_amount() == lifecycle.daily_yield[age]
+    assert isinstance(card.state, Deactivated)
+
+
+def test_new_card_lifecycle_requires_reserved_card():
+    with pytest.raises(ValueError, match="Lifecycle starts in reserved state"):
+        new_card_lifecycle(MiningCard(state=Active(mined_btc=Decimal("0"))))
+
+
+def test_scheduled_lifecycle_with_constant_yield_matches_stepped_card():
+    config = SimulationConfig(yield_schedule=YieldSchedule.decaying(initial_yield=Decimal("0.0000245"), days=400))
+    lifecycle = bought_card_lifecycle(config, day=30)
+    expected = new_card_lifecycle(MiningCard.from_config(config))
+
+    assert lifecycle.num_days == expected.num_days
+    assert list(lifecycle.daily_yield) == list(expected.daily_yield)
+    assert list(lifecycle.cumulative_yield) == list(expected.cumulative_yield)
+    assert lifecycle is bought_card_lifecycle(config, day=30)
+
+
+def test_scheduled_lifecycle_follows_the_schedule():
+    # bought on day 1, reserved on day 2, mines from day 3 towards the 1.1 target
+    table = yield_table(YieldSchedule.of(["1", "1", "1", "0.5", "0.25", "0.25", "0.25", "0.25"]), NUMERIC)
+    lifecycle = scheduled_card_lifecycle(
+        cost=Decimal("1"), profit_threshold=Decimal("10"), reserved_days=1, table=table, purchase_day=1,
+    )
+
+    assert list(lifecycle.daily_yield) == [
+        Decimal("0"), Decimal("0.5"), Decimal("0.25"), Decimal("0.25"), Decimal("0.1"),
+    ]
+    assert list(lifecycle.cumulative_yield) == [
+        Decimal("0"), Decimal("0"), Decimal("0.5"), Decimal("0.75"), Decimal("1.00"), Decimal("1.1"),
+    ]
+    assert lifecycle.state_at(age=3) == Active(mined_btc=Decimal("0.75"))
+    assert lifecycle.mined_between(from_age=2, to_age=100) == Decimal("0.6")
+
+
+def test_scheduled_lifecycle_ends_with_the_schedule():
+    table = yield_table(YieldSchedule.of(["1", "0.25", "0.25", "0.25"]), NUMERIC)
+    lifecycle = scheduled_card_lifecycle(
+        cost=Decimal("1"), profit_threshold=Decimal("10"), reserved_days=1, table=table, purchase_day=0,
+    )
+
+    assert list(lifecycle.daily_yield) == [Decimal("0"), Decimal("0.25"), Decimal("0.25")]
+
+
+def test_unpickled_lifecycles_are_the_cached_ones():
+    config = SimulationConfig(yield_schedule=YieldSchedule.decaying(Decimal("0.0003"), days=400))
+
+    for lifecycle in (new_card_lifecycle(MiningCard()), bought_card_lifecycle(config, day=20)):
+        assert pickle.loads(pickle.dumps(lifecycle)) is lifecycle
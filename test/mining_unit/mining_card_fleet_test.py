@@ -0,0 +1,188 @@
+from decimal import Decimal
+
+from source.Constants import NUMERIC
+from source.mining_unit.CardLifecycle import new_card_lifecycle, scheduled_card_lifecycle
+from source.mining_unit.MiningCard import MiningCard
+from source.mining_unit.MiningCardFleet import MiningCardFleet
+from source.mining_unit.MiningCardState import Reserved, Active, Deactivated
+from source.mining_unit.ScheduledCardCohort import ScheduledCardCohort
+from source.mining_unit.YieldSchedule import YieldSchedule, yield_table
+
+
+def test_identical_cards_are_grouped_into_one_cohort():
+    fleet = MiningCardFleet()
+
+    fleet.add(MiningCard())
+    fleet.add(MiningCard())
+    fleet.add(MiningCard(), num_cards=3)
+
+    assert len(fleet) == 5
+    assert len(fleet.cohorts) == 1
+    assert next(iter(fleet.cohorts)).count == 5
+
+
+def test_cards_in_different_states_are_not_grouped():
+    fleet = MiningCardFleet()
+
+    fleet.add(MiningCard(state=Reserved(days_left=1)))
+    fleet.add(MiningCard(state=Active(mined_btc=Decimal("0"))))
+
+    assert len(fleet) == 2
+    assert len(fleet.cohorts) == 2
+
+
+def test_cards_with_different_parameters_are_not_grouped():
+    fleet = MiningCardFleet()
+
+    fleet.add(MiningCard(mines_btc_per_day=Decimal("0.1")))
+    fleet.add(MiningCard(mines_btc_per_day=Decimal("0.2")))
+
+    assert len(fleet.cohorts) == 2
+
+
+def test_iteration_yields_card_for_each_card_in_cohort():
+    fleet = MiningCardFleet()
+    card = MiningCard()
+
+    fleet.add(card, num_cards=3)
+
+    assert list(fleet) == [card, card, card]
+    assert card in fleet
+
+
+def test_remove_deactivated_drops_whole_cohort():
+    fleet = MiningCardFleet()
+    fleet.add(MiningCard(state=Active(mined_btc=Decimal("0"))), num_cards=2)
+    fleet.add(MiningCard(state=Deactivated()), num_cards=4)
+
+    fleet.remove_deactivated()
+
+    assert len(fleet) == 2
+    assert len(fleet.cohorts) == 1
+
+
+def test_cohort_mines_same_amount_as_individual_cards():
+    cohort_fleet = MiningCardFleet()
+    cohort_fleet.add(MiningCard(), num_cards=7)
+    cards = [MiningCard() for _ in range(7)]
+
+    for _ in range(200):
+        if not cards:
+            break
+        mined_by_cohort = cohort_fleet.get_daily_mining_amount()
+        mined_by_cards = sum(card.get_daily_mining_amount() for card in cards)
+        assert mined_by_cohort == mined_by_cards
+        cohort_fleet.remove_deactivated()
+        cards = [card for card in cards if not isinstance(card.state, Deactivated)]
+        assert len(cohort_fleet) == len(cards)
+
+
+def test_scheduled_cohort_mines_same_amount_as_cards():
+    fleet = MiningCardFleet()
+    fleet.add_scheduled(new_card_lifecycle(MiningCard()), num_cards=3)
+    fleet.add_scheduled(new_card_lifecycle(MiningCard()), num_cards=2)
+    cards = [MiningCard() for _ in range(5)]
+
+    assert len(fleet.cohorts) == 1
+    while cards:
+        mined_by_cohort = fleet.get_daily_mining_amount()
+        mined_by_cards = sum(card.get_daily_mining_amount() for card in cards)
+        assert mined_by_cohort == mined_by_cards
+        fleet.remove_deactivated()
+        cards = [card for card in cards if not isinstance(card.state, Deactivated)]
+        assert len(fleet) == len(cards)
+
+
+def test_scheduled_cohort_exposes_card_state():
+    fleet = MiningCardFleet()
+    fleet.add_scheduled(new_card_lifecycle(MiningCard()), num_cards=2)
+
+    assert all(isinstance(card.state, Reserved) for card in fleet)
+    next(iter(fleet.cohorts)).get_daily_mining_amount()
+    assert all(card.state == Active(mined_btc=Decimal("0")) for card in fleet)
+
+
+def test_scheduled_cohort_is_removed_on_its_deactivation_day():
+    lifecycle = new_card_lifecycle(MiningCard())
+    fleet = MiningCardFleet()
+    fleet.add_scheduled(lifecycle, num_cards=2)
+    # a day later another cohort is bought
+    fleet.get_daily_mining_amount()
+    fleet.remove_deactivated()
+    fleet.add_scheduled(lifecycle, num_cards=3)
+
+    for _ in range(lifecycle.num_days - 1):
+        fleet.get_daily_mining_amount()
+        fleet.remove_deactivated()
+
+    assert len(fleet) == 3
+    fleet.get_daily_mining_amount()
+    fleet.remove_deactivated()
+    assert len(fleet) == 0
+
+
+def test_running_rate_matches_cohort_lookups():
+    table = yield_table(YieldSchedule.decaying(Decimal("0.0001"), days=200, daily_decay=Decimal("0.01")), NUMERIC)
+    lifecycles = [
+        new_card_lifecycle(MiningCard()),
+        new_card_lifecycle(MiningCard(cost=Decimal("0.00153"), state=Reserved(days_left=3))),
+        scheduled_card_lifecycle(
+            cost=Decimal("0.0005"), profit_threshold=Decimal("1"), reserved_days=1, table=table, purchase_day=4,
+        ),
+    ]
+    fleet = MiningCardFleet()
+    # the same cohorts stepped on their own
+    cohorts = []
+    for day in range(60):
+        if day % 7 == 0:
+            lifecycle = lifecycles[day // 7 % len(lifecycles)]
+            age = day % 3 if lifecycle.yield_table is None else 0
+            fleet.add_scheduled(lifecycle, num_cards=day + 1, age=age)
+            cohorts.append(ScheduledCardCohort(lifecycle=lifecycle, count=day + 1, age=age))
+        cohorts = [cohort for cohort in cohorts if not cohort.is_deactivated]
+        assert fleet.num_active_cards == sum(
+            cohort.count for cohort in cohorts if isinstance(cohort.lifecycle.state_at(cohort.age), Active)
+        )
+        assert fleet.daily_mining_rate == sum(
+            cohort.lifecycle.daily_yield[cohort.age] * cohort.count for cohort in cohorts
+        )
+        assert fleet.get_daily_mining_amount() == sum(cohort.get_daily_mining_amount() for cohort in cohorts)
+        fleet.remove_deactivated()
+        assert len(fleet) == sum(cohort.count for cohort in cohorts if not cohort.is_deactivated)
+
+
+def test_days_until_change_of_scheduled_cards():
+    lifecycle = new_card_lifecycle(MiningCard())
+    fleet = MiningCardFleet()
+    assert fleet.days_until_change is None
+
+    fleet.add_scheduled(lifecycle, num_cards=2)
+
+    # cards activate after their reserved day and mine at a constant rate until their last day
+    assert fleet.num_active_cards == 0
+    assert fleet.days_until_change == 1
+    fleet.get_daily_mining_amount()
+    assert fleet.num_active_cards == 2
+    assert fleet.daily_mining_rate == 2 * lifecycle.mines_btc_per_day
+    assert fleet.days_until_change == lifecycle.num_days - 2
+    num_rate_changes = fleet.num_rate_changes
+    for _ in range(lifecycle.num_days - 2):
+        fleet.get_daily_mining_amount()
+    assert fleet.num_rate_changes == num_rate_changes + 1
+    assert fleet.daily_mining_rate == 2 * lifecycle.daily_yield[-1]
+    fleet.get_daily_mining_amount()
+    assert fleet.num_active_cards == 0
+    assert fleet.days_until_change is None
+
+
+def test_scheduled_cohort_ages_catch_up_when_looked_at():
+    lifecycle = new_card_lifecycle(MiningCard())
+    fleet = MiningCardFleet()
+    fleet.add_scheduled(lifecycle, num_cards=2)
+    for _ in range(5):
+        fleet.get_daily_mining_amount()
+    fleet.add_scheduled(lifecycle, num_cards=3)
+    fleet.add_scheduled(lifecycle, num_cards=1)
+
+    assert [(cohort.count, cohort.age) for cohort in fleet.cohorts] == [(2, 5), (4, 0)]
+    assert [(cohort.count, cohort.age) for cohort in fleet.fork().cohorts] == [(2, 5), (4, 0)]
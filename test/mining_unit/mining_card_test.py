@@ -4,6 +4,7 @@ import pytest
 
 from source.mining_unit.MiningCard import MiningCard
 from source.mining_unit.MiningCardState import Reserved, Active, Deactivated
+from source.utils.NumericBackend import FixedPointBackend
 
 
 def test_reserved_status_counts_down():
@@ -130,3 +131,48 @@ def test_full_card_lifecycle():
     # 9th day -> in deactivated state
     with pytest.raises(RuntimeError, match=f"Mine called on a card in state: {card.state}"):
         card.get_daily_mining_amount()
+
+
+def test_fixed_point_card_lifecycle_matches_decimal_card():
+    numeric = FixedPointBackend()
+    decimal_card = MiningCard(
+        cost=Decimal("1"),
+        mines_btc_per_day=Decimal("0.3"),
+        profit_threshold=Decimal("10"),
+        state=Active(mined_btc=Decimal("0")),
+    )
+    fixed_point_card = MiningCard(
+        cost=numeric.from_decimal(Decimal("1")),
+        mines_btc_per_day=numeric.from_decimal(Decimal("0.3")),
+        profit_threshold=Decimal("10"),
+        state=Active(mined_btc=numeric.zero),
+        numeric=numeric,
+    )
+
+    for _ in range(4):
+        mined = fixed_point_card.get_daily_mining_amount()
+        assert isinstance(mined, int)
+        assert numeric.to_decimal(mined) == decimal_card.get_daily_mining_amount()
+    assert isinstance(fixed_point_card.state, Deactivated)
+    assert isinstance(decimal_card.state, Deactivated)
+
+
+def test_states_are_updated_in_place():
+    card = MiningCard(cost=Decimal("1"), mines_btc_per_day=Decimal("0.5"), state=Reserved(days_left=2))
+    reserved = card.state
+
+    card.get_daily_mining_amount()
+    assert card.state is reserved
+    card.get_daily_mining_amount()
+    active = card.state
+    card.get_daily_mining_amount()
+
+    assert card.state is active
+    assert active == Active(mined_btc=Decimal("0.5"))
+
+
+def test_states_are_compact():
+    assert not hasattr(Reserved(days_left=1), "__dict__")
+    assert not hasattr(Active(mined_btc=Decimal("0")), "__dict__")
+    assert not hasattr(MiningCard(), "__dict__")
+    assert Deactivated() is Deactivated()
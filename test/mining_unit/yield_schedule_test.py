@@ -0,0 +1,70 @@
+from decimal import Decimal
+
+import pytest
+
+from source.SimulationConfig import SimulationConfig
+from source.mining_unit.YieldSchedule import YieldSchedule, yield_table
+from source.utils.NumericBackend import DecimalBackend, FixedPointBackend
+
+
+def test_decaying_schedule_halves_on_halving_days():
+    schedule = YieldSchedule.decaying(
+        initial_yield=Decimal("0.0000245"), days=6, daily_decay=Decimal("0.1"), halving_days=[4],
+    )
+
+    assert schedule.last_day == 6
+    assert schedule.daily_yield[:4] == (
+        Decimal("0.0000245000"), Decimal("0.0000220500"), Decimal("0.0000198450"), Decimal("0.0000178605"),
+    )
+    # 0.0000245 * 0.9^4 / 2, rounded to 1e-10 BTC
+    assert schedule.daily_yield[4] == Decimal("0.0000080372")
+
+
+def test_schedule_rejects_non_positive_yields():
+    with pytest.raises(ValueError, match="day 2 has 0"):
+        YieldSchedule.of([Decimal("1"), Decimal("1"), Decimal("0")])
+
+
+def test_schedules_with_equal_yields_are_equal():
+    first = YieldSchedule.of(["0.5", "0.25", "0.25"])
+    second = YieldSchedule.of([Decimal("0.5"), Decimal("0.25"), Decimal("0.25")])
+
+    assert first == second
+    assert hash(first) == hash(second)
+    assert SimulationConfig(yield_schedule=first) == SimulationConfig(yield_schedule=second)
+
+
+@pytest.mark.parametrize("numeric", [DecimalBackend(), FixedPointBackend()])
+def test_table_lookups(numeric):
+    schedule = YieldSchedule.of(["1", "0.5", "0.5", "0.25", "0.25", "0.25", "0.25"])
+    table = yield_table(schedule, numeric)
+    amount = numeric.from_decimal
+
+    assert table is yield_table(schedule, numeric)
+    assert table.mined_between(first_day=2, last_day=4) == amount(Decimal("1"))
+    # from day 2: 0.5, 0.75, 1.0
+    assert table.reach_day(first_day=2, amount=amount(Decimal("0.6"))) == 3
+    assert table.reach_day(first_day=2, amount=amount(Decimal("1"))) == 4
+    assert table.num_mining_days(day=1, amount=amount(Decimal("1"))) == 3
+    # the schedule ends before 10 BTC are mined
+    assert table.reach_day(first_day=1, amount=amount(Decimal("10"))) == table.last_day + 1
+
+
+def test_constant_schedule_matches_config_numbers():
+    config = SimulationConfig()
+    table = yield_table(YieldSchedule.decaying(initial_yield=config.card_daily_yield, days=1000), config.numeric)
+
+    assert table.num_mining_days(day=17, amount=config.card_cost) == config.card_num_mining_days
+    assert table.min_days_left(expiry_day=700, card_cost=config.card_cost) == config.card_num_mining_days
+
+
+def test_min_days_left_follows_falling_yield():
+    # a card bought on day t mines its cost of 1 BTC from day t + 1 on: by day 2 when bought on day 0,
+    # by day 6 when bought on day 1 once the yield falls on day 3
+    schedule = YieldSchedule.of(["0.5", "0.5", "0.5", "0.125", "0.125", "0.125", "0.125", "0.125", "0.125"])
+    table = yield_table(schedule, DecimalBackend())
+
+    # a licence expiring on day 6 accepts cards done by day 5, so only on day 0 when it has 6 days left
+    assert table.min_days_left(expiry_day=6, card_cost=Decimal("1")) == 5
+    # expiring on day 3 the threshold follows the 2 days a card bought on day 0 needs
+    assert table.min_days_left(expiry_day=3, card_cost=Decimal("1")) == 2
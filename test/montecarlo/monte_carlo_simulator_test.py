@@ -0,0 +1,172 @@
+from decimal import Decimal
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from source.SimulationConfig import SimulationConfig
+from source.licence.LicenceBuilder import LicenceBuilder, LicenceType
+from source.mining_unit.YieldSchedule import YieldSchedule
+from source.montecarlo.MonteCarloSimulator import MonteCarloSimulator
+from source.montecarlo.PricePaths import (
+    bootstrap_price_paths, constant_price_paths, gbm_price_paths, historical_price_paths,
+)
+from source.series.DailySeries import DailySeries
+from source.simulator.Simulator import Simulator
+from source.user.User import User
+from source.utils.NumericBackend import DecimalBackend, FixedPointBackend, NumericBackend
+
+
+def _object_model(config: SimulationConfig, days: int, package_type: LicenceType = LicenceType.PLATINUM) -> float:
+    licence, _ = LicenceBuilder(licence_type=LicenceType.PRIME, config=config).set_num_cards(num_cards=14).build()
+    user = User(licences={licence}, config=config)
+    return float(config.numeric.to_decimal(
+        Simulator(package_type=package_type, config=config).simulate(user=user, days=days)
+    ))
+
+
+@pytest.mark.parametrize("numeric", [DecimalBackend(), FixedPointBackend()], ids=["decimal", "fixed_point"])
+@pytest.mark.parametrize("btc_price, days", [(91000, 365), (91000, 1500), (60000, 900), (150000, 1200)])
+def test_constant_price_matches_object_model(btc_price, days, numeric):
+    config = SimulationConfig(btc_price=Decimal(btc_price), numeric=numeric)
+    expected = _object_model(config=config, days=days)
+    package_cost = LicenceBuilder(LicenceType.PRIME, config).set_num_cards(14).package_cost
+
+    result = MonteCarloSimulator(config=config).simulate(
+        prices=constant_price_paths(price=btc_price, days=days, num_paths=2)
+    )
+
+    assert result.final_btc.tolist() == [expected] * 2
+    assert result.invested_btc.tolist() == [float(numeric.to_decimal(package_cost))] * 2
+
+
+def test_prime_packages_match_object_model():
+    expected = _object_model(config=SimulationConfig(), days=1100, package_type=LicenceType.PRIME)
+
+    result = MonteCarloSimulator(package_type=LicenceType.PRIME).simulate(
+        prices=constant_price_paths(price=91000, days=1100)
+    )
+
+    assert result.final_btc.tolist() == [expected]
+
+
+def test_prices_round_like_the_object_model():
+    # 999 / 3840000 BTC is a tie between two quanta, the float quotient lands just above it
+    config = SimulationConfig(btc_price=Decimal(3840000), card_price=Decimal(999))
+
+    result = MonteCarloSimulator(config=config).simulate(prices=constant_price_paths(price=3840000, days=400))
+
+    assert result.final_btc.tolist() == [_object_model(config=config, days=400)]
+
+
+def test_rejects_unknown_numeric_backends():
+    class _FloatBackend(NumericBackend):
+        zero = 0.0
+
+        def from_decimal(self, value: Decimal) -> float:
+            return float(value)
+
+        def to_decimal(self, value: float) -> Decimal:
+            return Decimal(value)
+
+        def mining_target(self, cost: float, profit_threshold: Decimal) -> float:
+            return cost * float(1 + profit_threshold / 100)
+
+    with pytest.raises(ValueError, match="_FloatBackend is not supported"):
+        MonteCarloSimulator(config=SimulationConfig(numeric=_FloatBackend()))
+
+
+def test_paths_are_independent():
+    prices = gbm_price_paths(initial_price=91000, drift=0.1, volatility=0.6, days=800, num_paths=40, seed=7)
+    batch = MonteCarloSimulator().simulate(prices=prices)
+    for path in [0, 17, 39]:
+        single = MonteCarloSimulator().simulate(prices=prices[path:path + 1])
+        assert single.final_btc[0] == batch.final_btc[path]
+    summary = batch.percentiles(q=(5, 50, 95))
+    assert summary["final_btc"][5] <= summary["final_btc"][50] <= summary["final_btc"][95]
+    assert set(summary) == {"final_btc", "final_usd", "cagr"}
+
+
+def test_price_paths_are_seeded():
+    first = gbm_price_paths(initial_price=91000, drift=0.05, volatility=0.5, days=30, num_paths=3, seed=1)
+    assert first.shape == (3, 31)
+    assert np.all(first[:, 0] == 91000)
+    assert np.array_equal(first, gbm_price_paths(91000, 0.05, 0.5, days=30, num_paths=3, seed=1))
+    history = np.array([100.0, 110.0, 99.0, 120.0])
+    paths = bootstrap_price_paths(history=history, initial_price=91000, days=10, num_paths=2, seed=3)
+    returns = np.round(paths[:, 1:] / paths[:, :-1], 12)
+    assert set(returns.ravel()) <= set(np.round(history[1:] / history[:-1], 12))
+
+
+def test_rejects_prices_where_initial_cards_can_not_pay_off():
+    with pytest.raises(ValueError):
+        MonteCarloSimulator().simulate(prices=constant_price_paths(price=30000, days=10))
+
+
+def test_historical_price_paths(tmp_path):
+    series = DailySeries.write(
+        path=str(tmp_path / "prices.mrds"), values=[Decimal(90000 + day) for day in range(10)], places=0
+    )
+
+    paths = historical_price_paths(series=series, days=3, start_days=[0, 6])
+
+    assert np.array_equal(paths, [[90000, 90001, 90002, 90003], [90006, 90007, 90008, 90009]])
+    with pytest.raises(ValueError, match="do not fit"):
+        historical_price_paths(series=series, days=3, start_days=[7])
+
+
+def test_configured_yield_series_matches_default(tmp_path):
+    days = 900
+    yields = DailySeries.write(
+        path=str(tmp_path / "yields.mrds"), values=[Decimal("0.0000245")] * (days + 1), places=12
+    )
+    prices = constant_price_paths(price=91000, days=days)
+
+    with_series = MonteCarloSimulator().simulate(prices=prices, yields=yields)
+
+    assert with_series.final_btc[0] == MonteCarloSimulator().simulate(prices=prices).final_btc[0]
+
+
+def test_yield_series_matches_object_model_with_that_yield(tmp_path):
+    days = 1000
+    config = SimulationConfig(btc_price=Decimal(91000), card_daily_yield=Decimal("0.0000267"))
+    yields = DailySeries.write(
+        path=str(tmp_path / "yields.mrds"), values=[config.card_daily_yield] * (days + 1), places=7
+    )
+
+    result = MonteCarloSimulator().simulate(prices=constant_price_paths(price=91000, days=days), yields=yields)
+
+    assert np.allclose(result.final_btc, float(_object_model(config=config, days=days)), rtol=1e-13, atol=0)
+
+
+def test_halved_yield_mines_less(tmp_path):
+    days = 800
+    prices = constant_price_paths(price=91000, days=days)
+    halving = DailySeries.write(
+        path=str(tmp_path / "yields.mrds"),
+        values=[Decimal("0.0000245") if day < 400 else Decimal("0.00001225") for day in range(days + 1)],
+        places=8,
+    )
+
+    constant = MonteCarloSimulator().simulate(prices=prices).final_btc[0]
+    halved = MonteCarloSimulator().simulate(prices=prices, yields=halving).final_btc[0]
+
+    assert 0 < halved < constant
+
+
+def test_yield_series_must_cover_the_simulation(tmp_path):
+    yields = DailySeries.write(path=str(tmp_path / "yields.mrds"), values=[Decimal("0.0000245")] * 10, places=7)
+
+    with pytest.raises(ValueError, match="10 days, 31 are needed"):
+        MonteCarloSimulator().simulate(prices=constant_price_paths(price=91000, days=30), yields=yields)
+
+
+def test_yield_schedule_matches_object_model():
+    days = 1100
+    config = SimulationConfig(yield_schedule=YieldSchedule.decaying(
+        initial_yield=Decimal("0.0000245"), days=days, daily_decay=Decimal("0.0002"), halving_days=[600],
+    ))
+
+    result = MonteCarloSimulator(config=config).simulate(prices=constant_price_paths(price=91000, days=days))
+
+    assert np.allclose(result.final_btc, float(_object_model(config=config, days=days)), rtol=1e-13, atol=0)
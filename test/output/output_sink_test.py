@@ -0,0 +1,89 @@
+import io
+import json
+from decimal import Decimal
+
+import pytest
+
+from source.licence.LicenceBuilder import LicenceBuilder, LicenceType
+from source.output.ColumnarRecorder import ColumnarRecorder
+from source.output.DayRecord import DayRecord
+from source.output.FileSink import BufferedFileSink, CsvSink, NdjsonSink
+from source.output.OutputSink import OutputSink, NullSink, PrintSink
+from source.simulator.Simulator import Simulator
+from source.user.User import User
+
+
+class _ExplodingSink(NullSink):
+
+    def record(self, day_record: DayRecord) -> None:
+        raise AssertionError("sink is not listening")
+
+
+def _simulate(sink: OutputSink | None, days: int = 30) -> Decimal:
+    licence, _ = LicenceBuilder(licence_type=LicenceType.PRIME).set_num_cards(num_cards=14).build()
+    return Simulator(sink=sink).simulate(user=User(licences={licence}), days=days)
+
+
+def test_simulator_prints_nothing_by_default(capsys):
+    _simulate(sink=None)
+    assert capsys.readouterr().out == ""
+
+
+def test_null_sink_receives_no_records():
+    assert _simulate(sink=_ExplodingSink()) == _simulate(sink=None)
+
+
+def test_columnar_recorder_keeps_every_day():
+    recorder = ColumnarRecorder()
+    btc_amount = _simulate(sink=recorder)
+    assert len(recorder) == 30
+    assert recorder.days == list(range(1, 31))
+    assert recorder.btc_amounts[-1] == btc_amount
+    assert recorder.columns()["num_cards_added"] == recorder.num_cards_added
+
+
+def test_print_sink_output(capsys):
+    _simulate(sink=PrintSink(btc_price=Decimal("91000"), batch_size=7), days=3)
+    assert capsys.readouterr().out.splitlines() == [
+        "day: 1, BTC value: $0.00, number of cards added: 0",
+        "day: 2, BTC value: $31.21, number of cards added: 0",
+        "day: 3, BTC value: $62.43, number of cards added: 0",
+    ]
+
+
+def test_csv_sink_writes_in_batches():
+    file = io.StringIO()
+    sink = CsvSink(file=file, batch_size=3)
+    for day in range(1, 3):
+        sink.record(DayRecord(day=day, btc_amount=Decimal("0.1"), num_cards_added=0))
+    assert file.getvalue() == ""
+    sink.record(DayRecord(day=3, btc_amount=Decimal("0.2"), num_cards_added=1))
+    assert file.getvalue().splitlines() == ["day,btc_amount,num_cards_added", "1,0.1,0", "2,0.1,0", "3,0.2,1"]
+
+
+def test_csv_sink_is_flushed_after_simulation():
+    file = io.StringIO()
+    _simulate(sink=CsvSink(file=file, batch_size=10), days=25)
+    lines = file.getvalue().splitlines()
+    assert len(lines) == 26
+    assert lines[2] == "2,0.0003430,0"
+
+
+def test_ndjson_sink_keeps_amounts_exact():
+    file = io.StringIO()
+    btc_amount = _simulate(sink=NdjsonSink(file=file), days=5)
+    rows = [json.loads(line) for line in file.getvalue().splitlines()]
+    assert [row["day"] for row in rows] == [1, 2, 3, 4, 5]
+    assert Decimal(rows[-1]["btc_amount"]) == btc_amount
+
+
+def test_buffered_sink_rejects_empty_batches():
+    with pytest.raises(ValueError):
+        CsvSink(file=io.StringIO(), batch_size=0)
+
+
+def test_sinks_must_implement_their_writes():
+    with pytest.raises(TypeError):
+        OutputSink()
+    with pytest.raises(TypeError):
+        BufferedFileSink(file=io.StringIO())
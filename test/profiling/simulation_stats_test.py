@@ -0,0 +1,88 @@
+from decimal import Decimal
+
+from source.licence.LicenceBuilder import LicenceBuilder, LicenceType
+from source.mining_unit.MiningCard import MiningCard
+from source.mining_unit.MiningCardState import Reserved
+from source.profiling.SimulationStats import SimulationStats, Phase
+from source.simulator.Simulator import Simulator
+from source.user.User import User
+
+
+def _user(btc_amount: Decimal = Decimal("0.5")) -> User:
+    licence, _ = LicenceBuilder(licence_type=LicenceType.PRIME).set_num_cards(num_cards=14).build()
+    return User(licences={licence}, btc_amount=btc_amount)
+
+
+def test_stats_do_not_change_the_result():
+    stats = SimulationStats()
+    user = _user()
+
+    result = Simulator(stats=stats).simulate(user=user, days=900)
+
+    assert result == Simulator().simulate(user=_user(), days=900)
+    # stats are only attached while simulating
+    assert user.stats is None
+    assert stats.days == 900
+    assert all(seconds > 0 for seconds in stats.phase_seconds.values())
+
+
+def test_counters_match_daily_snapshots():
+    stats = SimulationStats()
+    user = _user()
+    snapshots = list(Simulator(stats=stats).iter_days(user=user, days=800))
+
+    assert stats.licences_expired == sum(snapshot.num_licences_expired for snapshot in snapshots)
+    assert stats.licences_scanned > 0
+    assert stats.cards_deactivated > 0
+    # new cards are mined through the licences' running rates, which change on a few days only
+    assert stats.cohorts_touched == stats.cards_touched == 0
+    assert 0 < stats.rate_changes < stats.days * stats.licences_mined
+    # new cards follow lifecycles and licence states count down in place
+    assert stats.states_allocated == 0
+
+
+def test_user_collects_stats_without_simulator():
+    stats = SimulationStats()
+    user = _user(btc_amount=Decimal("0"))
+    user.stats = stats
+
+    for _ in range(3):
+        user.mine_for_day()
+        user.add_new_cards()
+
+    assert stats.days == 3
+    assert stats.licences_mined == 3
+    # the package's cards are scheduled
+    assert stats.cards_touched == 0
+    assert stats.phase_seconds[Phase.MINING] > 0
+    # purchases are timed by the simulator
+    assert stats.phase_seconds[Phase.CARD_PURCHASE] == 0
+
+
+def test_report():
+    stats = SimulationStats()
+    Simulator(stats=stats).simulate(user=_user(), days=30)
+
+    report = stats.report()
+
+    for phase in Phase:
+        assert phase.value in report
+    assert "licences scanned" in report
+    assert stats.as_dict()["days"] == 30
+    assert stats.as_dict()["mining_seconds"] == stats.phase_seconds[Phase.MINING]
+
+
+def test_stepped_cards_allocate_a_state_when_activated():
+    stats = SimulationStats()
+    user = _user(btc_amount=Decimal("0"))
+    licence = next(iter(user.licences))
+    licence.add_mining_card(MiningCard(), num_cards=2)
+    licence.add_mining_card(MiningCard(state=Reserved(days_left=2)))
+    user.stats = stats
+
+    for _ in range(3):
+        user.mine_for_day()
+
+    assert stats.states_allocated == 2
+    assert stats.cohorts_touched == 2 * 3
+    assert stats.cards_touched == 3 * 3
@@ -0,0 +1,81 @@
+import pickle
+from decimal import Decimal
+
+import pytest
+
+from source.series.DailySeries import DailySeries
+
+
+def test_write_and_read_by_day(tmp_path):
+    series = DailySeries.write(
+        path=str(tmp_path / "prices.mrds"), values=[Decimal("91000.5"), Decimal("90000"), 89500], places=2
+    )
+
+    assert len(series) == 3
+    assert series[0] == Decimal("91000.50")
+    assert series[2] == Decimal("89500")
+    assert list(series.raw) == [9100050, 9000000, 8950000]
+
+
+def test_rejects_values_with_too_many_places(tmp_path):
+    with pytest.raises(ValueError, match="more than 2 decimal places"):
+        DailySeries.write(path=str(tmp_path / "prices.mrds"), values=[Decimal("1.234")], places=2)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a series at all")
+    with pytest.raises(ValueError, match="is not a daily series"):
+        DailySeries(str(path))
+    series = DailySeries.write(path=str(tmp_path / "prices.mrds"), values=range(4), places=0)
+    series.close()
+    path.write_bytes((tmp_path / "prices.mrds").read_bytes()[:-3])
+    with pytest.raises(ValueError, match="is truncated"):
+        DailySeries(str(path))
+
+
+def test_from_csv(tmp_path):
+    csv_path = tmp_path / "history.csv"
+    csv_path.write_text("date,price,yield\n2024-01-01,42000.10,0.0000245\n2024-01-02,43000,0.0000241\n")
+
+    prices = DailySeries.from_csv(str(csv_path), str(tmp_path / "prices.mrds"), column="price", places=2)
+    yields = DailySeries.from_csv(str(csv_path), str(tmp_path / "yields.mrds"), column="yield", places=10)
+
+    assert [prices[0], prices[1]] == [Decimal("42000.10"), Decimal("43000.00")]
+    assert yields[1] == Decimal("0.0000241")
+
+
+def test_pickles_by_path(tmp_path):
+    series = DailySeries.write(path=str(tmp_path / "prices.mrds"), values=range(1000), places=0)
+
+    data = pickle.dumps(series)
+    copy = pickle.loads(data)
+
+    assert len(data) < 200
+    assert copy.path == series.path
+    assert copy[999] == 999
+
+
+def test_numpy_view_reads_the_file(tmp_path):
+    np = pytest.importorskip("numpy")
+    series = DailySeries.write(path=str(tmp_path / "prices.mrds"), values=range(5), places=1)
+
+    values = series.to_numpy()
+
+    assert np.array_equal(values, [0, 10, 20, 30, 40])
+    assert not values.flags.writeable
+    assert not values.flags.owndata
+
+
+def test_close_waits_for_numpy_views(tmp_path):
+    np = pytest.importorskip("numpy")
+    series = DailySeries.write(path=str(tmp_path / "prices.mrds"), values=range(5), places=0)
+    view = series.to_numpy()
+    values = view.copy()
+
+    with pytest.raises(BufferError):
+        series.close()
+    del view
+    series.close()
+
+    assert np.array_equal(values, range(5))
@@ -0,0 +1,81 @@
+from decimal import Decimal
+
+import pytest
+
+from source.Constants import DEFAULT_CONFIG, CARD_COST, CARD_NUM_MINING_DAYS, PRIME_LICENCE_COST, PLATINUM_LICENCE_COST
+from source.SimulationConfig import SimulationConfig
+from source.licence.LicenceBuilder import LicenceBuilder, LicenceType
+from source.mining_unit.MiningCard import MiningCard
+from source.mining_unit.YieldSchedule import YieldSchedule
+from source.simulator.EventDrivenSimulator import EventDrivenSimulator
+from source.simulator.Simulator import Simulator
+from source.user.User import User
+from source.utils.NumericBackend import FixedPointBackend
+
+
+def simulate(config: SimulationConfig, simulator_class=Simulator, days: int = 400) -> Decimal:
+    licence, _ = LicenceBuilder(licence_type=LicenceType.PRIME, config=config).set_num_cards(num_cards=14).build()
+    user = User(licences={licence}, config=config)
+    return config.numeric.to_decimal(simulator_class(config=config).simulate(user=user, days=days))
+
+
+def test_default_config_matches_constants():
+    assert DEFAULT_CONFIG == SimulationConfig()
+    assert DEFAULT_CONFIG.card_cost == CARD_COST == Decimal("0.0041538462")
+    assert DEFAULT_CONFIG.prime_licence_cost == PRIME_LICENCE_COST
+    assert DEFAULT_CONFIG.platinum_licence_cost == PLATINUM_LICENCE_COST
+    assert DEFAULT_CONFIG.card_num_mining_days == CARD_NUM_MINING_DAYS == 170
+
+
+def test_derived_values_follow_btc_price():
+    config = SimulationConfig(btc_price=Decimal("60000"))
+    assert config.card_cost == Decimal("0.0063000000")
+    assert config.card_num_mining_days == 258
+    card = MiningCard.from_config(config)
+    assert card.cost == config.card_cost
+    builder = LicenceBuilder(licence_type=LicenceType.PLATINUM, config=config).set_num_cards(num_cards=3)
+    assert builder.package_cost == config.platinum_licence_cost + 3 * config.card_cost
+    licence, _ = builder.build()
+    assert licence.card_num_mining_days == 258
+
+
+def test_config_rejects_non_positive_price():
+    with pytest.raises(ValueError):
+        SimulationConfig(btc_price=Decimal("0"))
+
+
+def test_configs_run_side_by_side_in_one_process():
+    default_result = simulate(config=SimulationConfig())
+    cheap_btc_result = simulate(config=SimulationConfig(btc_price=Decimal("60000")))
+    assert simulate(config=SimulationConfig()) == default_result
+    assert cheap_btc_result != default_result
+    assert simulate(config=SimulationConfig(btc_price=Decimal("60000")), simulator_class=EventDrivenSimulator) \
+        == cheap_btc_result
+
+
+def test_fixed_point_config():
+    config = SimulationConfig(numeric=FixedPointBackend())
+    assert config.card_cost == 41538462
+    assert User(config=config).btc_amount == 0
+    assert simulate(config=config) == simulate(config=config, simulator_class=EventDrivenSimulator)
+
+
+def test_simulator_rejects_user_with_other_config():
+    user = User(config=SimulationConfig(btc_price=Decimal("60000")))
+    with pytest.raises(ValueError):
+        Simulator().simulate(user=user, days=1)
+
+
+def test_cache_key_covers_every_parameter():
+    key = SimulationConfig().cache_key()
+
+    assert SimulationConfig().cache_key() == key
+    for other in [
+        SimulationConfig(card_price=Decimal("400")),
+        SimulationConfig(card_daily_yield=Decimal("0.00003")),
+        SimulationConfig(card_profit_threshold=Decimal("10")),
+        SimulationConfig(platinum_licence_price=Decimal("900")),
+        SimulationConfig(numeric=FixedPointBackend()),
+        SimulationConfig(yield_schedule=YieldSchedule.of([Decimal("0.0000245")] * 10)),
+    ]:
+        assert other.cache_key() != key
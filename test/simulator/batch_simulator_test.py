@@ -0,0 +1,92 @@
+import io
+from decimal import Decimal
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from source.SimulationConfig import SimulationConfig
+from source.licence.LicenceBuilder import LicenceBuilder, LicenceType
+from source.mining_unit.YieldSchedule import YieldSchedule
+from source.simulator.BatchSimulator import BatchSimulator
+from source.simulator.Simulator import Simulator
+from source.user.User import User
+from source.utils.NumericBackend import FixedPointBackend
+
+_PACKAGES = [(LicenceType.PRIME, 14), (LicenceType.PLATINUM, 0), (LicenceType.PRIME, 3), (LicenceType.PRIME, 14),
+             (LicenceType.PLATINUM, 30), (LicenceType.PRIME, 0)]
+
+
+def _packages(config: SimulationConfig) -> list[LicenceBuilder]:
+    return [
+        LicenceBuilder(licence_type=licence_type, config=config).set_num_cards(num_cards=num_cards)
+        for licence_type, num_cards in _PACKAGES
+    ]
+
+
+def _object_model(package: LicenceBuilder, days: int, package_type: LicenceType) -> float:
+    licence, _ = package.build()
+    user = User(licences={licence}, config=package.config)
+    btc_amount = Simulator(package_type=package_type, config=package.config).simulate(user=user, days=days)
+    return float(package.config.numeric.to_decimal(btc_amount))
+
+
+@pytest.mark.parametrize("config, days, package_type", [
+    (SimulationConfig(), 1100, LicenceType.PLATINUM),
+    (SimulationConfig(btc_price=Decimal("60000")), 900, LicenceType.PRIME),
+    (SimulationConfig(yield_schedule=YieldSchedule.decaying(Decimal("0.0003"), days=1000, halving_days=(500,))),
+     1000, LicenceType.PLATINUM),
+    (SimulationConfig(numeric=FixedPointBackend()), 1100, LicenceType.PLATINUM),
+], ids=["default", "low_price", "yield_schedule", "fixed_point"])
+def test_every_user_matches_object_model(config, days, package_type):
+    packages = _packages(config=config)
+
+    result = BatchSimulator(package_type=package_type, config=config).simulate(packages=packages, days=days)
+
+    assert len(result) == len(packages)
+    for user, package in enumerate(packages):
+        expected = _object_model(package=package, days=days, package_type=package_type)
+        assert result.final_btc[user] == expected
+        assert result.invested_btc[user] == float(config.numeric.to_decimal(package.package_cost))
+    assert result.num_cards.tolist() == [num_cards for _, num_cards in _PACKAGES]
+
+
+def test_users_are_independent():
+    config = SimulationConfig()
+    packages = _packages(config=config)
+    batch = BatchSimulator(config=config).simulate(packages=packages, days=800)
+    for user in [0, 4]:
+        single = BatchSimulator(config=config).simulate(packages=packages[user:user + 1], days=800)
+        assert single.final_btc[0] == batch.final_btc[user]
+
+
+def test_results_table():
+    config = SimulationConfig()
+    result = BatchSimulator(config=config).simulate(packages=_packages(config=config)[:2], days=365)
+
+    rows = result.as_rows()
+    assert [row["user"] for row in rows] == [0, 1]
+    assert rows[1]["licence_type"] == "PLATINUM"
+    assert rows[0]["cagr"] == pytest.approx(rows[0]["final_btc"] / rows[0]["invested_btc"] - 1)
+    file = io.StringIO()
+    result.write_csv(file=file)
+    lines = file.getvalue().splitlines()
+    assert lines[0] == "user,licence_type,num_cards,invested_btc,final_btc,cagr"
+    assert len(lines) == 3
+
+
+def test_empty_batch():
+    result = BatchSimulator().simulate(packages=[], days=365)
+    assert len(result) == 0
+    assert result.as_rows() == []
+
+
+def test_rejects_packages_it_can_not_simulate():
+    config = SimulationConfig()
+    simulator = BatchSimulator(config=config)
+    with pytest.raises(ValueError):
+        simulator.simulate(packages=_packages(config=config), days=0)
+    with pytest.raises(ValueError):
+        simulator.simulate(packages=_packages(config=SimulationConfig(btc_price=Decimal("60000"))), days=365)
+    with pytest.raises(ValueError):
+        simulator.simulate(packages=[LicenceBuilder(LicenceType.PRIME, config=config, day=5)], days=365)
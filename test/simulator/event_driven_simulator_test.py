@@ -0,0 +1,98 @@
+from decimal import Decimal
+
+import pytest
+
+from source.licence.Licence import Licence
+from source.licence.LicenceBuilder import LicenceBuilder, LicenceType
+from source.licence.LicenceState import Valid
+from source.mining_unit.MiningCard import MiningCard
+from source.mining_unit.MiningCardState import Active, Reserved
+from source.simulator.EventDrivenSimulator import EventDrivenSimulator
+from source.simulator.Simulator import Simulator
+from source.user.User import User
+
+
+def _user(btc_amount: Decimal) -> User:
+    licence, _ = LicenceBuilder(licence_type=LicenceType.PRIME).set_num_cards(num_cards=14).build()
+    return User(licences={licence}, btc_amount=btc_amount)
+
+
+@pytest.mark.parametrize("btc_amount, days", [(Decimal("0"), 400), (Decimal("0.5"), 700), (Decimal("0.03"), 1000)])
+def test_same_btc_amount_as_object_model(btc_amount, days):
+    expected = Simulator().simulate(user=_user(btc_amount=btc_amount), days=days)
+
+    btc = EventDrivenSimulator().simulate(user=_user(btc_amount=btc_amount), days=days)
+
+    assert btc == expected
+
+
+def test_cards_spread_over_many_licences():
+    def user() -> User:
+        packages = [(LicenceType.PRIME, 14), (LicenceType.PRIME, 3), (LicenceType.PLATINUM, 0),
+                    (LicenceType.PLATINUM, 30), (LicenceType.PRIME, 0), (LicenceType.PLATINUM, 0)]
+        licences = {
+            LicenceBuilder(licence_type=licence_type).set_num_cards(num_cards=num_cards).build()[0]
+            for licence_type, num_cards in packages
+        }
+        return User(licences=licences, btc_amount=Decimal("0.3"))
+
+    expected = Simulator().simulate(user=user(), days=900)
+
+    assert EventDrivenSimulator().simulate(user=user(), days=900) == expected
+
+
+def test_partial_last_mining_day():
+    card = MiningCard(
+        cost=Decimal("1"),
+        mines_btc_per_day=Decimal("0.5"),
+        profit_threshold=Decimal("10"),
+        state=Reserved(days_left=1),
+    )
+    licence = Licence(cost=Decimal("0"), max_num_cards=1, state=Valid(days_left=10), cards={card})
+    user = User(licences={licence})
+
+    btc = EventDrivenSimulator().simulate(user=user, days=10)
+
+    # activation day, then 0.5 + 0.5 + 0.1 until the 1.1 target is reached
+    assert btc == Decimal("1.1")
+
+
+def test_licence_expiry_stops_cards():
+    card = MiningCard(
+        cost=Decimal("1"),
+        mines_btc_per_day=Decimal("0.1"),
+        profit_threshold=Decimal("10"),
+        state=Active(mined_btc=Decimal("0")),
+    )
+    licence = Licence(cost=Decimal("0"), max_num_cards=2, state=Valid(days_left=3), cards={card})
+    user = User(licences={licence})
+
+    btc = EventDrivenSimulator().simulate(user=user, days=10)
+
+    assert btc == Decimal("0.3")
+
+
+def test_quiet_days_are_skipped(monkeypatch):
+    visited_days = []
+    apply_events = EventDrivenSimulator._apply_events
+
+    def record_day(self, day, rate):
+        visited_days.append(day)
+        return apply_events(self, day=day, rate=rate)
+
+    monkeypatch.setattr(EventDrivenSimulator, "_apply_events", record_day)
+    # card mines too little to ever buy anything
+    card = MiningCard(
+        cost=Decimal("0.001"),
+        mines_btc_per_day=Decimal("0.00001"),
+        profit_threshold=Decimal("10"),
+        state=Active(mined_btc=Decimal("0")),
+    )
+    licence = Licence(cost=Decimal("0"), max_num_cards=1, state=Valid(days_left=2000), cards={card})
+    user = User(licences={licence})
+
+    btc = EventDrivenSimulator().simulate(user=user, days=3000)
+
+    assert btc == Decimal("0.0011")
+    # mining starts, card deactivation, rate drops, licence stops accepting cards, end of package buying, last day
+    assert visited_days == [1, 110, 111, 1830, 2636, 3000]
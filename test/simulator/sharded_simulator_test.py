@@ -0,0 +1,112 @@
+from decimal import Decimal
+
+import pytest
+
+from source.SimulationConfig import SimulationConfig
+from source.cache.ResultCache import ResultCache
+from source.licence.LicenceBuilder import LicenceBuilder, LicenceType
+from source.licence.LicenceState import Expired
+from source.mining_unit.YieldSchedule import YieldSchedule
+from source.output.ColumnarRecorder import ColumnarRecorder
+from source.profiling.SimulationStats import SimulationStats
+from source.simulator.LicenceShard import LicenceShard, ShardDay
+from source.simulator.ShardedSimulator import ShardedSimulator
+from source.simulator.Simulator import Simulator
+from source.strategy.PackageStrategy import PackageStrategy
+from source.user.User import User
+from source.utils.NumericBackend import FixedPointBackend
+
+
+def _user(config: SimulationConfig, btc_amount: Decimal = Decimal("1")) -> User:
+    licence, _ = LicenceBuilder(licence_type=LicenceType.PRIME, config=config).set_num_cards(num_cards=14).build()
+    return User(licences={licence}, btc_amount=config.numeric.from_decimal(btc_amount), config=config)
+
+
+def _licences(user: User) -> list:
+    return sorted(
+        (licence.state.days_left, len(licence.cards), licence.num_active_cards, licence.daily_mining_rate)
+        for licence in user.licences
+    )
+
+
+@pytest.mark.parametrize("config", [
+    SimulationConfig(),
+    SimulationConfig(numeric=FixedPointBackend()),
+    SimulationConfig(yield_schedule=YieldSchedule.decaying(Decimal("0.0003"), days=1000, halving_days=(500,))),
+], ids=["decimal", "fixed_point", "yield_schedule"])
+def test_sharded_run_is_identical_to_single_process(config):
+    expected = _user(config=config)
+    simulator = Simulator(package_type=LicenceType.PRIME, package_num_cards=14, config=config)
+    simulator.simulate(user=expected, days=1000, stop_day=600)
+    user = _user(config=config)
+
+    ShardedSimulator(num_shards=3, package_type=LicenceType.PRIME, package_num_cards=14, config=config) \
+        .simulate(user=user, days=1000, stop_day=600)
+
+    assert user.btc_amount == expected.btc_amount
+    assert user.num_days_mined == 600
+    assert _licences(user) == _licences(expected)
+    # the shards' licences continue in a single process
+    assert simulator.simulate(user=user, days=1000, start_day=600) == simulator.simulate(
+        user=expected, days=1000, start_day=600,
+    )
+
+
+def test_sharded_run_records_every_day():
+    config = SimulationConfig()
+    recorder = ColumnarRecorder()
+
+    result = ShardedSimulator(num_shards=2, config=config, sink=recorder).simulate(user=_user(config=config), days=400)
+
+    assert result == Simulator(config=config).simulate(user=_user(config=config), days=400)
+    assert len(recorder) == 400
+
+
+def test_sharded_run_follows_the_strategy_and_uses_the_cache(tmp_path):
+    config = SimulationConfig()
+    strategy = PackageStrategy(package_type=LicenceType.PRIME, package_num_cards=14, stop_cards_days=100)
+    expected = Simulator(config=config, strategy=strategy).simulate(user=_user(config=config), days=500)
+    cache = ResultCache(directory=str(tmp_path))
+    user = _user(config=config)
+
+    result = ShardedSimulator(num_shards=2, config=config, cache=cache, strategy=strategy).simulate(user=user, days=500)
+
+    assert result == expected
+    assert len(cache) == 1
+    # the second run is served from the cache, its user continues from the cached state
+    cached_user = _user(config=config)
+    assert ShardedSimulator(num_shards=2, config=config, cache=cache, strategy=strategy).simulate(
+        user=cached_user, days=500,
+    ) == expected
+    assert _licences(cached_user) == _licences(user)
+
+
+def test_sharded_runs_can_not_be_profiled():
+    with pytest.raises(ValueError, match="ShardedSimulator can not be profiled"):
+        ShardedSimulator(num_shards=1, stats=SimulationStats())
+
+
+def test_shard_mines_its_licences_and_reports_freed_capacity():
+    config = SimulationConfig()
+    licence, _ = LicenceBuilder(licence_type=LicenceType.PRIME, config=config).set_num_cards(num_cards=14).build()
+    copy = licence.fork()
+    shard = LicenceShard()
+    shard.add(ShardDay(new_licences=[(7, licence)]))
+
+    reports = [shard.mine() for _ in range(365)]
+
+    expected = [copy.get_daily_mining_amount() for _ in range(365)]
+    assert [report.mined for report in reports] == expected
+    freed = [report.num_cards_left for report in reports if report.num_cards_left]
+    assert freed == [[(7, 0)]]
+    assert reports[-1].expired == [7]
+    assert shard.licences == {}
+
+
+def test_shard_errors_are_raised_by_the_coordinator():
+    config = SimulationConfig()
+    user = _user(config=config)
+    next(iter(user.licences)).state = Expired()
+
+    with pytest.raises(RuntimeError, match="Only valid licence can mine"):
+        ShardedSimulator(num_shards=1, config=config).simulate(user=user, days=10)
@@ -0,0 +1,93 @@
+from decimal import Decimal
+from itertools import islice
+
+import pytest
+
+from source.SimulationConfig import SimulationConfig
+from source.licence.LicenceBuilder import LicenceBuilder, LicenceType
+from source.mining_unit.YieldSchedule import YieldSchedule
+from source.simulator.EventDrivenSimulator import EventDrivenSimulator
+from source.simulator.Simulator import Simulator
+from source.user.User import User
+from source.utils.NumericBackend import FixedPointBackend
+
+
+def _user(btc_amount: Decimal = Decimal("0")) -> User:
+    licence, _ = LicenceBuilder(licence_type=LicenceType.PRIME).set_num_cards(num_cards=14).build()
+    return User(licences={licence}, btc_amount=btc_amount)
+
+
+def test_iter_days_ends_with_simulate_result():
+    expected = Simulator().simulate(user=_user(btc_amount=Decimal("0.05")), days=800)
+
+    snapshots = list(Simulator().iter_days(user=_user(btc_amount=Decimal("0.05")), days=800))
+
+    assert [snapshot.day for snapshot in snapshots] == list(range(1, 801))
+    assert snapshots[-1].btc_amount == expected
+
+
+def test_iter_days_reports_btc_as_decimal():
+    config = SimulationConfig(numeric=FixedPointBackend())
+    licence, _ = LicenceBuilder(licence_type=LicenceType.PRIME, config=config).set_num_cards(num_cards=14).build()
+    user = User(licences={licence}, config=config)
+
+    snapshot = list(Simulator(config=config).iter_days(user=user, days=30))[-1]
+
+    assert snapshot.btc_amount == config.numeric.to_decimal(user.btc_amount) == Decimal("0.0021048076")
+    # the cards bought on the last day are reserved
+    assert snapshot.num_active_cards == user.count_cards() - snapshot.num_cards_added
+
+
+def test_iter_days_counts_cards_and_licences():
+    user = _user(btc_amount=Decimal("0.05"))
+    num_licences = 1
+    total_added = total_expired = 0
+    for snapshot in Simulator().iter_days(user=user, days=800):
+        num_licences += snapshot.num_licences_added - snapshot.num_licences_expired
+        total_added += snapshot.num_licences_added
+        total_expired += snapshot.num_licences_expired
+        assert num_licences == len(user.licences)
+        assert snapshot.num_active_cards == user.num_active_cards <= user.count_cards()
+    # packages are bought until day 435, the initial licence expires after day 365
+    assert total_added > 0
+    assert total_expired >= 1
+
+
+def test_iter_days_is_lazy():
+    user = _user()
+    days = Simulator().iter_days(user=user, days=100_000)
+    first_days = list(islice(days, 10))
+    assert [snapshot.day for snapshot in first_days] == list(range(1, 11))
+    assert user.btc_amount == first_days[-1].btc_amount
+
+
+def _scheduled_user(config: SimulationConfig) -> User:
+    licence, _ = LicenceBuilder(licence_type=LicenceType.PRIME, config=config).set_num_cards(num_cards=14).build()
+    return User(licences={licence}, config=config)
+
+
+def test_constant_yield_schedule_matches_constant_yield():
+    config = SimulationConfig(yield_schedule=YieldSchedule.decaying(initial_yield=Decimal("0.0000245"), days=1500))
+
+    assert Simulator(config=config).simulate(user=_scheduled_user(config), days=1500) == Decimal("0.119565012688")
+
+
+def test_halving_lowers_the_result():
+    days = 1100
+    halving = SimulationConfig(yield_schedule=YieldSchedule.decaying(
+        initial_yield=Decimal("0.0000245"), days=days, daily_decay=Decimal("0.0002"), halving_days=[600],
+    ))
+
+    result = Simulator(config=halving).simulate(user=_scheduled_user(halving), days=days)
+
+    assert result == Decimal("0.083480142636")
+    assert result < Simulator().simulate(user=_scheduled_user(SimulationConfig()), days=days)
+
+
+def test_yield_schedule_has_to_cover_the_simulation():
+    config = SimulationConfig(yield_schedule=YieldSchedule.decaying(initial_yield=Decimal("0.0000245"), days=100))
+
+    with pytest.raises(ValueError, match="yield schedule ends on day 100, the simulation runs 365 days"):
+        Simulator(config=config).simulate(user=_scheduled_user(config), days=365)
+    with pytest.raises(ValueError, match="EventDrivenSimulator needs a constant card yield"):
+        EventDrivenSimulator(config=config)
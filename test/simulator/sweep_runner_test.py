@@ -0,0 +1,34 @@
+import io
+from decimal import Decimal
+
+import pytest
+
+from source.simulator.Scenario import Scenario, Engine
+from source.simulator.SweepRunner import SweepRunner
+
+
+def test_grid_combines_field_values():
+    scenarios = Scenario.grid(days=[30, 60], engine=[Engine.OBJECT, Engine.EVENT_DRIVEN])
+    assert [(scenario.days, scenario.engine) for scenario in scenarios] == [
+        (30, Engine.OBJECT), (30, Engine.EVENT_DRIVEN), (60, Engine.OBJECT), (60, Engine.EVENT_DRIVEN),
+    ]
+
+
+def test_grid_rejects_unknown_fields():
+    with pytest.raises(ValueError):
+        Scenario.grid(price=[1])
+
+
+def test_sweep_keeps_scenario_order_and_applies_btc_price():
+    scenarios = Scenario.grid(btc_price=[Decimal("60000"), Decimal("91000")], days=[30])
+    scenarios.append(Scenario(btc_price=Decimal("60000"), days=30, engine=Engine.EVENT_DRIVEN))
+    results = SweepRunner(max_workers=2).run(scenarios)
+    assert [result.scenario for result in results] == scenarios
+    assert results[1].final_btc == Decimal("0.0021048076")
+    # a lower price makes cards more expensive in BTC
+    assert results[0].invested_btc > results[1].invested_btc
+    assert results[0].final_btc == results[2].final_btc
+    file = io.StringIO()
+    SweepRunner.write_csv(results, file)
+    assert file.getvalue().splitlines()[0].startswith("btc_price,licence_type,num_cards")
+    assert len(file.getvalue().splitlines()) == 4
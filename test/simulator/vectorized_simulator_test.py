@@ -0,0 +1,79 @@
+from decimal import Decimal
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from source.licence.Licence import Licence
+from source.licence.LicenceBuilder import LicenceBuilder, LicenceType
+from source.licence.LicenceState import Valid
+from source.mining_unit.MiningCard import MiningCard
+from source.mining_unit.MiningCardState import Active
+from source.simulator.Simulator import Simulator
+from source.simulator.VectorizedFleet import VectorizedFleet
+from source.simulator.VectorizedSimulator import VectorizedSimulator
+from source.user.User import User
+
+
+def _user(btc_amount: Decimal) -> User:
+    licence, _ = LicenceBuilder(licence_type=LicenceType.PRIME).set_num_cards(num_cards=14).build()
+    return User(licences={licence}, btc_amount=btc_amount)
+
+
+@pytest.mark.parametrize("btc_amount, days", [(Decimal("0"), 400), (Decimal("0.5"), 700)])
+def test_same_btc_amount_as_object_model(btc_amount, days):
+    expected = Simulator().simulate(user=_user(btc_amount=btc_amount), days=days)
+
+    btc = VectorizedSimulator().simulate(user=_user(btc_amount=btc_amount), days=days)
+
+    assert btc == expected
+
+
+def test_loads_cards_in_progress():
+    card = MiningCard(
+        cost=Decimal("1"),
+        mines_btc_per_day=Decimal("0.5"),
+        profit_threshold=Decimal("10"),
+        state=Active(mined_btc=Decimal("0.5")),
+    )
+    licence = Licence(cost=Decimal("0"), max_num_cards=1, state=Valid(days_left=10), cards={card})
+    user = User(licences={licence})
+
+    btc = VectorizedSimulator().simulate(user=user, days=3)
+
+    # 0.5 + 0.1 until the card reaches its 1.1 target, the licence has too few days left to add cards
+    assert btc == Decimal("0.6")
+
+
+def test_loads_a_user_in_the_middle_of_a_simulation():
+    user = _user(btc_amount=Decimal("0.3"))
+    Simulator().simulate(user=user, days=800, stop_day=120)
+    assert len(user.licences) > 1
+    copy = user.fork()
+
+    expected = Simulator().simulate(user=user, days=500)
+
+    assert VectorizedSimulator().simulate(user=copy, days=500) == expected
+
+
+def test_add_new_cards_fills_largest_capacity_first():
+    fleet = VectorizedFleet(places=0)
+    fleet.add_licences(num_licences=1, days_left=300, max_num_cards=5, card_num_mining_days=100)
+    fleet.add_licences(num_licences=1, days_left=200, max_num_cards=10, card_num_mining_days=100)
+    fleet.add_licences(num_licences=1, days_left=250, max_num_cards=10, card_num_mining_days=100)
+
+    added = fleet.add_new_cards(num_cards=12, cost=1, mines_per_day=1, target=2)
+
+    assert added == 12
+    # capacities 5, 10, 10 are lowered to 5, 5, 5, the 2 remaining cards go to the licences with most days left
+    # and leave capacities 4, 5, 4
+    assert fleet.licence_num_cards.tolist() == [1, 5, 6]
+
+
+def test_add_new_cards_skips_licences_without_enough_days_left():
+    fleet = VectorizedFleet(places=0)
+    fleet.add_licences(num_licences=1, days_left=100, max_num_cards=5, card_num_mining_days=100)
+
+    added = fleet.add_new_cards(num_cards=3, cost=1, mines_per_day=1, target=2)
+
+    assert added == 0
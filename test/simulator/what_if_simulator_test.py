@@ -0,0 +1,72 @@
+from decimal import Decimal
+
+import pytest
+
+from source.SimulationConfig import SimulationConfig
+from source.licence.LicenceBuilder import LicenceBuilder, LicenceType
+from source.simulator.Simulator import Simulator
+from source.simulator.WhatIfSimulator import WhatIfSimulator
+from source.user.User import User
+
+
+def _user() -> User:
+    licence, _ = LicenceBuilder(licence_type=LicenceType.PRIME).set_num_cards(num_cards=14).build()
+    return User(licences={licence}, btc_amount=Decimal("0.5"))
+
+
+class _SwitchingSimulator(Simulator):
+    # buys the prefix's package until the switch day, then the branch's package
+
+    def __init__(self, prefix: Simulator, branch: Simulator, switch_day: int):
+        super().__init__()
+        self.prefix = prefix
+        self.branch = branch
+        self.switch_day = switch_day
+
+    def _simulate_day(self, user: User, day: int, days: int) -> (int, int, int):
+        simulator = self.prefix if day <= self.switch_day else self.branch
+        return simulator._simulate_day(user=user, day=day, days=days)
+
+
+def test_branches_match_full_runs():
+    prefix = Simulator()
+    branches = [
+        Simulator(), Simulator(package_type=LicenceType.PRIME, package_num_cards=20), Simulator(package_num_cards=0),
+    ]
+    days, fork_day = 1100, 500
+
+    results = WhatIfSimulator(prefix=prefix, branches=branches).simulate(user=_user(), days=days, fork_day=fork_day)
+
+    expected = [
+        _SwitchingSimulator(prefix=prefix, branch=branch, switch_day=fork_day).simulate(user=_user(), days=days)
+        for branch in branches
+    ]
+    assert results == expected
+    assert results[0] == Simulator().simulate(user=_user(), days=days)
+    assert len(set(results)) == 3
+
+
+def test_fork_is_independent():
+    user = _user()
+    Simulator().simulate(user=user, days=700, stop_day=200)
+    fork = user.fork()
+    num_cards = user.count_cards()
+    btc_amount = user.btc_amount
+
+    Simulator().simulate(user=fork, days=700, start_day=200)
+
+    assert user.count_cards() == num_cards
+    assert user.btc_amount == btc_amount
+    assert user.num_days_mined == 200
+    assert fork.num_days_mined == 700
+    assert not user.licences & fork.licences
+
+
+def test_branches_need_prefix_config():
+    with pytest.raises(ValueError):
+        WhatIfSimulator(prefix=Simulator(), branches=[Simulator(config=SimulationConfig(btc_price=Decimal("60000")))])
+
+
+def test_fork_day_within_horizon():
+    with pytest.raises(ValueError):
+        WhatIfSimulator(prefix=Simulator(), branches=[]).simulate(user=_user(), days=100, fork_day=101)
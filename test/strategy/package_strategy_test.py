@@ -0,0 +1,106 @@
+from decimal import Decimal
+
+import pytest
+
+from source.SimulationConfig import SimulationConfig
+from source.licence.LicenceBuilder import LicenceBuilder, LicenceType
+from source.simulator.Simulator import Simulator
+from source.strategy.PackageStrategy import PackageStrategy
+from source.strategy.Strategy import Strategy, DayState, PurchaseDecision
+from source.user.User import User
+from source.utils.NumericBackend import FixedPointBackend
+
+
+def _user(config: SimulationConfig) -> User:
+    licence, _ = LicenceBuilder(licence_type=LicenceType.PRIME, config=config).set_num_cards(num_cards=14).build()
+    return User(licences={licence}, config=config)
+
+
+class _BuyNothing(Strategy):
+
+    def decide(self, state: DayState) -> PurchaseDecision:
+        return PurchaseDecision(max_num_cards=0)
+
+
+def test_default_strategy_is_the_original_policy():
+    config = SimulationConfig()
+    expected = Simulator(package_type=LicenceType.PRIME, package_num_cards=5, config=config) \
+        .simulate(user=_user(config=config), days=1000)
+
+    strategy = PackageStrategy(package_type=LicenceType.PRIME, package_num_cards=5)
+    result = Simulator(config=config, strategy=strategy).simulate(user=_user(config=config), days=1000)
+
+    assert result == expected
+    assert Simulator(config=config).simulate(user=_user(config=config), days=1500) == Decimal("0.119565012688")
+
+
+def test_strategy_sees_the_day_after_mining():
+    config = SimulationConfig(numeric=FixedPointBackend())
+    states = []
+
+    class Recording(_BuyNothing):
+
+        def decide(self, state: DayState) -> PurchaseDecision:
+            states.append((state.day, state.days_left, state.btc_amount, state.num_licences, state.num_active_cards))
+            return super().decide(state)
+
+    user = _user(config=config)
+    Simulator(config=config, strategy=Recording()).simulate(user=user, days=3)
+
+    # the initial cards mine from day 2
+    assert states == [
+        (1, 2, 0, 1, 14),
+        (2, 1, 14 * config.card_mines_btc_per_day, 1, 14),
+        (3, 0, 28 * config.card_mines_btc_per_day, 1, 14),
+    ]
+    assert user.btc_amount == 28 * config.card_mines_btc_per_day
+
+
+def test_reserve_is_never_spent():
+    config = SimulationConfig()
+    reserve = Decimal("0.02")
+    simulator = Simulator(config=config, strategy=PackageStrategy(reserve_btc=reserve))
+    balances = [snapshot.btc_amount for snapshot in simulator.iter_days(user=_user(config=config), days=600)]
+
+    # once mined, the reserve stays
+    reached = next(day for day, balance in enumerate(balances) if balance >= reserve)
+    assert reached < 300
+    assert min(balances[reached:]) >= reserve
+
+
+def test_stop_days_end_purchases():
+    config = SimulationConfig()
+    strategy = PackageStrategy(stop_buying_days=500, stop_cards_days=200)
+    snapshots = list(Simulator(config=config, strategy=strategy).iter_days(user=_user(config=config), days=800))
+
+    assert max(snapshot.day for snapshot in snapshots if snapshot.num_licences_added) <= 300
+    assert max(snapshot.day for snapshot in snapshots if snapshot.num_cards_added) <= 600
+    assert any(snapshot.num_cards_added for snapshot in snapshots if snapshot.day > 300)
+
+
+def test_strategies_have_their_own_cache_keys():
+    assert PackageStrategy().cache_key() != PackageStrategy(stop_cards_days=100).cache_key()
+    assert PackageStrategy().cache_key() == PackageStrategy().cache_key()
+
+
+def test_grid():
+    strategies = PackageStrategy.grid(package_num_cards=[0, 10], reserve_btc=[Decimal("0"), Decimal("0.01")])
+
+    assert len(strategies) == 4
+    assert strategies[1] == PackageStrategy(package_num_cards=0, reserve_btc=Decimal("0.01"))
+    with pytest.raises(ValueError):
+        PackageStrategy.grid(horizon=[1])
+
+
+def test_rejects_negative_parameters():
+    with pytest.raises(ValueError):
+        PackageStrategy(package_num_cards=-1)
+    with pytest.raises(ValueError):
+        PackageStrategy(stop_buying_days=-1)
+    with pytest.raises(ValueError):
+        PackageStrategy(reserve_btc=Decimal("-0.1"))
+
+
+def test_strategy_must_decide():
+    with pytest.raises(TypeError):
+        Strategy()
@@ -0,0 +1,120 @@
+import csv
+import io
+from decimal import Decimal
+
+import pytest
+
+from source.SimulationConfig import SimulationConfig
+from source.licence.LicenceBuilder import LicenceBuilder, LicenceType
+from source.mining_unit.YieldSchedule import YieldSchedule
+from source.simulator.Simulator import Simulator
+from source.strategy.PackageStrategy import PackageStrategy
+from source.strategy.StrategyOptimizer import StrategyOptimizer, cash_multipliers, upper_bound
+from source.user.User import User
+
+_FAMILY = PackageStrategy.grid(
+    package_type=[LicenceType.PLATINUM, LicenceType.PRIME],
+    stop_buying_days=[200, 365],
+    stop_cards_days=[0, 150],
+    reserve_btc=[Decimal("0"), Decimal("0.05")],
+)
+
+
+def _user(config: SimulationConfig) -> User:
+    licence, _ = LicenceBuilder(licence_type=LicenceType.PRIME, config=config).set_num_cards(num_cards=14).build()
+    return User(licences={licence}, config=config)
+
+
+def _final_btc(config: SimulationConfig, strategy: PackageStrategy, days: int) -> Decimal:
+    return Simulator(config=config, strategy=strategy).simulate(user=_user(config=config), days=days)
+
+
+def test_finds_the_best_strategy_of_every_scenario():
+    configs = [SimulationConfig(), SimulationConfig(btc_price=Decimal("60000"))]
+
+    results = StrategyOptimizer(max_workers=1).optimize(strategies=_FAMILY, configs=configs, days=1100)
+
+    for config, result in zip(configs, results):
+        finals = [_final_btc(config=config, strategy=strategy, days=1100) for strategy in _FAMILY]
+        assert result.config == config
+        assert result.best.final_btc == max(finals)
+        assert result.best.strategy == _FAMILY[finals.index(max(finals))]
+        assert result.num_pruned > 0
+        for evaluation, final_btc in zip(result.evaluations, finals):
+            if evaluation.pruned:
+                # pruned strategies end below the best one, under their bound
+                assert final_btc < result.best.final_btc
+                assert float(final_btc) <= evaluation.upper_bound_btc
+            else:
+                assert evaluation.final_btc == final_btc
+        assert [evaluation.final_btc for evaluation in result.ranking()] == sorted(
+            (evaluation.final_btc for evaluation in result.evaluations if not evaluation.pruned), reverse=True,
+        )
+
+
+def test_worker_processes_find_the_same_strategy():
+    config = SimulationConfig(
+        yield_schedule=YieldSchedule.decaying(Decimal("0.0000245"), days=800, halving_days=(400,)),
+    )
+    strategies = _FAMILY[:6]
+
+    serial = StrategyOptimizer(max_workers=1, num_stages=4).optimize(
+        strategies=strategies, configs=[config], days=800,
+    )
+    parallel = StrategyOptimizer(max_workers=2, num_stages=4).optimize(
+        strategies=strategies, configs=[config], days=800,
+    )
+
+    assert parallel[0].best.strategy == serial[0].best.strategy
+    assert parallel[0].best.final_btc == serial[0].best.final_btc == max(
+        _final_btc(config=config, strategy=strategy, days=800) for strategy in strategies
+    )
+
+
+def test_upper_bound_holds_for_every_strategy():
+    config = SimulationConfig()
+    multipliers = cash_multipliers(config=config, days=900)
+    for strategy in _FAMILY[::3]:
+        user = _user(config=config)
+        simulator = Simulator(config=config, strategy=strategy)
+        simulator.simulate(user=user, days=900, stop_day=500)
+        bound = upper_bound(user=user, days=900, multipliers=multipliers)
+        # the bound leaves the user as it was
+        assert user.num_days_mined == 500
+
+        assert float(simulator.simulate(user=user, days=900, start_day=500)) <= bound
+    # not worked out past the limit
+    assert upper_bound(user=_user(config=config), days=900, multipliers=multipliers, limit=0.01) == float("inf")
+
+
+def test_cash_multipliers():
+    multipliers = cash_multipliers(config=SimulationConfig(), days=600)
+
+    # BTC kept to the end stays what it is, earlier it can grow, more so the earlier it is spent
+    assert multipliers[600] == multipliers[601] == 1
+    assert all(earlier >= later for earlier, later in zip(multipliers, multipliers[1:]))
+    assert multipliers[0] > 1
+    with pytest.raises(ValueError):
+        cash_multipliers(config=SimulationConfig(yield_schedule=YieldSchedule.of([Decimal("0.0001")] * 100)), days=600)
+
+
+def test_result_rows():
+    config = SimulationConfig()
+    result = StrategyOptimizer(max_workers=1).optimize(strategies=_FAMILY[:3], configs=[config], days=400)[0]
+
+    file = io.StringIO()
+    writer = csv.DictWriter(file, fieldnames=list(result.as_rows()[0]))
+    writer.writeheader()
+    writer.writerows(result.as_rows())
+    assert len(file.getvalue().splitlines()) == 4
+    assert result.invested_btc == LicenceBuilder(licence_type=LicenceType.PRIME, config=config) \
+        .set_num_cards(num_cards=14).package_cost
+
+
+def test_rejects_invalid_searches():
+    with pytest.raises(ValueError):
+        StrategyOptimizer(num_stages=0)
+    with pytest.raises(ValueError):
+        StrategyOptimizer(max_workers=1).optimize(strategies=[], configs=[SimulationConfig()], days=100)
+    with pytest.raises(ValueError):
+        StrategyOptimizer(max_workers=1).optimize(strategies=_FAMILY, configs=[SimulationConfig()], days=0)
@@ -0,0 +1,123 @@
+from decimal import Decimal
+from random import Random
+
+from source.licence.Licence import Licence
+from source.licence.LicenceState import Valid, Expired
+from source.mining_unit.MiningCard import MiningCard
+from source.mining_unit.MiningCardFleet import MiningCardFleet
+from source.user.LicenceCapacityIndex import LicenceCapacityIndex
+
+
+def test_best_has_largest_capacity():
+    licence_small = Licence(cost=Decimal("100"), max_num_cards=5)
+    licence_big = Licence(cost=Decimal("100"), max_num_cards=10)
+    index = LicenceCapacityIndex()
+    index.sync(licences={licence_small, licence_big}, day=0)
+
+    assert index.best(day=0) is licence_big
+
+
+def test_best_breaks_capacity_ties_by_days_left():
+    licence_short = Licence(cost=Decimal("100"), max_num_cards=5, state=Valid(days_left=200))
+    licence_long = Licence(cost=Decimal("100"), max_num_cards=5, state=Valid(days_left=300))
+    index = LicenceCapacityIndex()
+    index.sync(licences={licence_short, licence_long}, day=0)
+
+    assert index.best(day=0) is licence_long
+
+
+def test_best_skips_stale_capacity():
+    licence1 = Licence(cost=Decimal("100"), max_num_cards=5)
+    licence2 = Licence(cost=Decimal("100"), max_num_cards=4)
+    index = LicenceCapacityIndex()
+    index.sync(licences={licence1, licence2}, day=0)
+    # cards added without notifying the index
+    licence1.cards.add(MiningCard(), num_cards=3)
+
+    assert index.best(day=0) is licence2
+
+
+def test_best_skips_removed_and_full_licences():
+    licence_removed = Licence(cost=Decimal("100"), max_num_cards=10)
+    licence_full = Licence(cost=Decimal("100"), max_num_cards=1, cards={MiningCard()})
+    licence_expired = Licence(cost=Decimal("100"), max_num_cards=10, state=Expired())
+    index = LicenceCapacityIndex()
+    index.sync(licences={licence_removed, licence_full, licence_expired}, day=0)
+
+    index.remove(licences={licence_removed})
+
+    assert index.best(day=0) is None
+
+
+def test_distribute_matches_adding_cards_one_by_one():
+    random = Random(7)
+    capacities = [random.randint(1, 30) for _ in range(40)]
+    days_left = random.sample(range(171, 366), 40)
+    for num_cards in [0, 1, 17, 250, 10_000]:
+        licences = [
+            Licence(cost=Decimal("100"), max_num_cards=capacity, state=Valid(days_left=days))
+            for capacity, days in zip(capacities, days_left)
+        ]
+        index = LicenceCapacityIndex()
+        index.sync(licences=set(licences), day=0)
+        # reference: each card goes to the licence with the largest capacity, then most days left
+        expected = [0] * len(licences)
+        remaining = list(capacities)
+        for _ in range(num_cards):
+            best = max(
+                (position for position in range(len(licences)) if remaining[position] > 0),
+                key=lambda position: (remaining[position], days_left[position]),
+                default=None,
+            )
+            if best is None:
+                break
+            remaining[best] -= 1
+            expected[best] += 1
+
+        allocation = dict(index.distribute(num_cards=num_cards, day=0))
+
+        assert [allocation.get(licence, 0) for licence in licences] == expected
+
+
+def test_capacity_ties_go_to_the_licence_indexed_first():
+    licence1 = Licence(cost=Decimal("100"), max_num_cards=5)
+    licence2 = Licence(cost=Decimal("100"), max_num_cards=5)
+    index = LicenceCapacityIndex()
+    index.sync(licences={licence1}, day=0)
+    index.sync(licences={licence1, licence2}, day=0)
+    # both licences get a card and lose it again, the second licence's first entry looks current again
+    licence1.cards.add(MiningCard())
+    index.add(licence=licence1, day=0)
+    assert index.best(day=0) is licence2
+    licence2.cards.add(MiningCard())
+    index.add(licence=licence2, day=0)
+    for licence in [licence1, licence2]:
+        licence.cards = MiningCardFleet()
+        index.add(licence=licence, day=0)
+
+    assert index.best(day=0) is licence1
+
+
+def test_licence_whose_capacity_returns_is_distributed_once():
+    licence = Licence(cost=Decimal("100"), max_num_cards=5)
+    index = LicenceCapacityIndex()
+    index.add(licence=licence, day=0)
+    # cards are added and later leave the licence, the first entry's capacity matches again
+    licence.cards.add(MiningCard(), num_cards=2)
+    index.add(licence=licence, day=0)
+    licence.cards = MiningCardFleet()
+    index.add(licence=licence, day=0)
+
+    assert index.distribute(num_cards=10, day=0) == [(licence, 5)]
+
+
+def test_ordered_keeps_the_order_licences_were_indexed_in():
+    licences = [Licence(cost=Decimal("100"), max_num_cards=5) for _ in range(3)]
+    index = LicenceCapacityIndex()
+    for licence in licences:
+        index.add(licence=licence, day=0)
+    # re-indexing with an unchanged capacity keeps the licence's place
+    index.add(licence=licences[0], day=0)
+
+    assert index.best(day=0) is licences[0]
+    assert index.ordered(set(licences)) == licences
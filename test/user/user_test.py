@@ -116,6 +116,30 @@ def test_add_new_cards():
     assert user.btc_amount == CARD_COST / 2
 
 
+def test_add_new_cards_keeps_reserve_and_limit():
+    licence = Licence(cost=PRIME_LICENCE_COST, max_num_cards=5)
+    user = User(licences={licence}, btc_amount=CARD_COST * 4)
+
+    # the reserve leaves money for 3 cards, at most 2 are bought
+    assert user.add_new_cards(reserve=CARD_COST / 2, max_num_cards=2) == 2
+    assert user.btc_amount == CARD_COST * 2
+    # nothing above the reserve
+    assert user.add_new_cards(reserve=CARD_COST * 2) == 0
+    assert len(licence.cards) == 2
+
+
+def test_add_new_licence_with_cards_keeps_reserve_and_limit():
+    package_cost = PLATINUM_LICENCE_COST + 10 * CARD_COST
+    user = User(btc_amount=package_cost * 3)
+
+    assert user.add_new_licence_with_cards(licence_type=LicenceType.PLATINUM, num_cards=10, max_num_packages=1) == 1
+    assert user.add_new_licence_with_cards(
+        licence_type=LicenceType.PLATINUM, num_cards=10, reserve=package_cost / 2,
+    ) == 1
+    assert len(user.licences) == 2
+    assert user.btc_amount == package_cost
+
+
 def test_chooses_licence_with_most_remaining_capacity():
     licence_small = Licence(cost=Decimal("100"), max_num_cards=5, cards={MiningCard()})
     licence_big = Licence(cost=Decimal("100"), max_num_cards=10, cards={MiningCard(), MiningCard()})
@@ -139,3 +163,52 @@ def test_stops_when_no_licence_can_add_cards():
     user.add_new_cards()
 
     assert user.btc_amount == CARD_COST
+
+
+def test_add_new_cards_uses_capacity_freed_by_deactivated_cards():
+    licence_small = Licence(cost=Decimal("100"), max_num_cards=3)
+    licence_big = Licence(cost=Decimal("100"), max_num_cards=4)
+    licence_small.add_mining_card(MiningCard(), num_cards=2)
+    licence_big.add_mining_card(MiningCard(state=Active(mined_btc=Decimal("0"))), num_cards=2)
+    licence_big.add_mining_card(MiningCard(state=Active(mined_btc=CARD_COST * 2)), num_cards=2)
+    user = User(licences={licence_small, licence_big}, btc_amount=Decimal("0"))
+    user.add_new_cards()
+
+    # big licence's nearly done cards are deactivated and leave
+    user.mine_for_day()
+    user.btc_amount = CARD_COST
+    user.add_new_cards()
+
+    assert len(licence_small.cards) == 2
+    assert len(licence_big.cards) == 3
+
+
+def test_bought_licences_expire_after_a_year():
+    user = User(btc_amount=PLATINUM_LICENCE_COST)
+    user.add_new_licence_with_cards(licence_type=LicenceType.PLATINUM, num_cards=0)
+    licence = next(iter(user.licences))
+
+    for _ in range(364):
+        user.mine_for_day()
+    assert licence in user.licences
+    user.mine_for_day()
+    assert licence not in user.licences
+
+
+def test_daily_mining_rate_is_mined_on_the_next_day():
+    user = User(btc_amount=PRIME_LICENCE_COST + CARD_COST * 20)
+    user.add_new_licence_with_cards(licence_type=LicenceType.PRIME, num_cards=14)
+
+    for _ in range(365):
+        rate = user.daily_mining_rate
+        days_until_change = user.days_until_change
+        num_active_cards = user.num_active_cards
+        btc_amount = user.btc_amount
+        user.mine_for_day()
+        assert user.btc_amount - btc_amount == rate
+        if days_until_change > 1:
+            assert user.num_active_cards == num_active_cards
+        user.add_new_cards()
+    # the licence expired
+    assert user.days_until_change is None
+    assert user.daily_mining_rate == 0
@@ -0,0 +1,28 @@
+from source.utils.DayCalendar import DayCalendar
+
+
+def test_pop_returns_items_due_on_day():
+    calendar = DayCalendar()
+    calendar.schedule(3, "a")
+    calendar.schedule(5, "b")
+    calendar.schedule(3, "c")
+
+    assert calendar.pop(3) == ["a", "c"]
+    assert calendar.pop(3) == []
+    assert calendar.pop(4) == []
+    assert len(calendar) == 1
+
+
+def test_next_day_skips_popped_days():
+    calendar = DayCalendar()
+    assert calendar.next_day() is None
+    calendar.schedule(7, "a")
+    calendar.schedule(3, "b")
+    calendar.schedule(5, "c")
+
+    assert calendar.next_day() == 3
+    calendar.pop(3)
+    calendar.pop(5)
+    assert calendar.next_day() == 7
+    calendar.schedule(5, "d")
+    assert calendar.next_day() == 5
@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+import pytest
+
+from source.utils.NumericBackend import NumericBackend, DecimalBackend, FixedPointBackend
+from source.utils.Rounding import round_btc
+
+
+def test_decimal_backend_keeps_decimals():
+    backend = DecimalBackend()
+
+    assert backend.from_decimal(Decimal("0.0000245")) == Decimal("0.0000245")
+    assert backend.mining_target(cost=Decimal("1"), profit_threshold=Decimal("10")) == Decimal("1.1")
+
+
+def test_fixed_point_round_trip_is_exact():
+    backend = FixedPointBackend()
+    btc = round_btc(Decimal("378") / Decimal("91000"))
+
+    units = backend.from_decimal(btc)
+
+    assert isinstance(units, int)
+    assert backend.to_decimal(units) == btc
+
+
+def test_fixed_point_rejects_amount_between_quanta():
+    backend = FixedPointBackend()
+
+    with pytest.raises(ValueError, match="is not a multiple of"):
+        backend.from_decimal(Decimal("0.00000000001"))
+
+
+def test_fixed_point_mining_target_rounds_half_even():
+    backend = FixedPointBackend()
+
+    # 114% of 25 units is 28.5 units
+    assert backend.mining_target(cost=25, profit_threshold=Decimal("14")) == 28
+    # 114% of 75 units is 85.5 units
+    assert backend.mining_target(cost=75, profit_threshold=Decimal("14")) == 86
+
+
+def test_partial_backend_can_not_be_created():
+    class DecimalsOnly(NumericBackend):
+        zero = Decimal("0")
+
+        def from_decimal(self, value: Decimal) -> Decimal:
+            return value
+
+    with pytest.raises(TypeError):
+        DecimalsOnly()